@@ -3,5 +3,12 @@ API module for the Sonarr-Seedr integration.
 """
 from .seedr_client import SeedrClient
 from .sonarr_client import SonarrClient
+from .http_session import HttpSessionPool, get_shared_session
+from .async_clients import AsyncSeedrClient, AsyncSonarrClient
+from .rate_limiter import TokenBucketLimiter, get_shared_limiter
+from .resilience import CircuitBreaker, CircuitOpenError, UpstreamUnavailableError, Upstream, get_upstream, get_circuit_states
+from .bencode import BencodeError, TorrentInfo, bdecode, parse_torrent
  
-__all__ = ['SeedrClient', 'SonarrClient'] 
\ No newline at end of file
+__all__ = ['SeedrClient', 'SonarrClient', 'HttpSessionPool', 'get_shared_session', 'AsyncSeedrClient', 'AsyncSonarrClient',
+           'CircuitBreaker', 'CircuitOpenError', 'UpstreamUnavailableError', 'Upstream', 'get_upstream', 'get_circuit_states',
+           'TokenBucketLimiter', 'get_shared_limiter', 'BencodeError', 'TorrentInfo', 'bdecode', 'parse_torrent'] 
\ No newline at end of file
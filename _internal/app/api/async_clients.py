@@ -0,0 +1,117 @@
+"""
+Asyncio variants of the Seedr and Sonarr clients.
+
+The async clients drive the pooled keep-alive session from a bounded I/O
+executor, so FastAPI handlers can await upstream calls (and fan several out
+with asyncio.gather) without ever blocking the event loop.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable
+from .seedr_client import SeedrClient
+from .sonarr_client import SonarrClient
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_lock = threading.Lock()
+
+def get_io_executor(max_workers: int = 20) -> ThreadPoolExecutor:
+    """
+    Get the process-wide executor that runs blocking upstream I/O.
+
+    It is sized like the HTTP connection pool so concurrent calls map onto
+    kept-alive connections rather than queueing for a socket.
+    """
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upstream-io")
+        return _io_executor
+
+
+class AsyncClientBase:
+    """Common plumbing for the async client wrappers."""
+
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
+        self.executor = executor or get_io_executor()
+
+    async def run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on the I/O executor and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+
+class AsyncSeedrClient(AsyncClientBase):
+    """Awaitable interface to a SeedrClient."""
+
+    def __init__(self, client: SeedrClient, executor: Optional[ThreadPoolExecutor] = None):
+        super().__init__(executor)
+        self.client = client
+        self.auth = client.auth
+
+    async def get_access_token(self) -> Optional[str]:
+        return await self.run_blocking(self.auth.get_access_token)
+
+    async def is_authenticated(self) -> bool:
+        # Auth state is held in memory, so this needs no executor round-trip
+        return self.auth.is_authenticated()
+
+    async def get_account_info(self) -> Dict[str, Any]:
+        return await self.run_blocking(self.client.get_account_info)
+
+    async def get_tasks(self) -> List[Dict[str, Any]]:
+        return await self.run_blocking(self.client.get_tasks)
+
+    async def get_task(self, task_id: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.client.get_task, task_id)
+
+    async def get_task_contents(self, task_id: str) -> List[Dict[str, Any]]:
+        return await self.run_blocking(self.client.get_task_contents, task_id)
+
+    async def get_task_progress(self, task_id: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.client.get_task_progress, task_id)
+
+    async def pause_task(self, task_id: str) -> bool:
+        return await self.run_blocking(self.client.pause_task, task_id)
+
+    async def resume_task(self, task_id: str) -> bool:
+        return await self.run_blocking(self.client.resume_task, task_id)
+
+    async def delete_task(self, task_id: str) -> bool:
+        return await self.run_blocking(self.client.delete_task, task_id)
+
+    async def add_torrent(self, torrent_url: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.client.add_torrent, torrent_url)
+
+    async def get_folder_contents(self, folder_id: str = "0") -> List[Dict[str, Any]]:
+        return await self.run_blocking(self.client.get_folder_contents, folder_id)
+
+    async def get_download_url(self, file_id: str) -> Optional[str]:
+        return await self.run_blocking(self.client.get_download_url, file_id)
+
+    async def download_file(self, file_id: str, save_path: str) -> bool:
+        return await self.run_blocking(self.client.download_file, file_id, save_path)
+
+
+class AsyncSonarrClient(AsyncClientBase):
+    """Awaitable interface to a SonarrClient."""
+
+    def __init__(self, client: SonarrClient, executor: Optional[ThreadPoolExecutor] = None):
+        super().__init__(executor)
+        self.client = client
+
+    async def get_series(self) -> List[Dict[str, Any]]:
+        return await self.run_blocking(self.client.get_series)
+
+    async def get_series_by_id(self, series_id: int) -> Optional[Dict[str, Any]]:
+        return await self.run_blocking(self.client.get_series_by_id, series_id)
+
+    async def get_root_folders(self) -> List[Dict[str, Any]]:
+        return await self.run_blocking(self.client.get_root_folders)
+
+    async def get_missing_episodes(self) -> List[Dict[str, Any]]:
+        return await self.run_blocking(self.client.get_missing_episodes)
+
+    async def command_download_scan(self, path: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.client.command_download_scan, path)
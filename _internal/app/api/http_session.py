@@ -0,0 +1,129 @@
+"""
+Shared keep-alive HTTP session layer for the Seedr and Sonarr clients.
+"""
+import threading
+from typing import Optional, Dict, Any
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from ..config import HttpConfig
+
+class HttpSessionPool:
+    """Thread-safe wrapper around a pooled requests.Session.
+
+    A single session is shared by every client so that TCP+TLS connections
+    to the same host are kept alive and reused between calls. urllib3's
+    connection pools are thread-safe, so one session can serve the watcher,
+    the poller and the API threads at the same time.
+    """
+
+    def __init__(self, config: Optional[HttpConfig] = None):
+        self.config = config or HttpConfig()
+        self._lock = threading.Lock()
+        self._requests_by_host: Dict[str, int] = {}
+        self._errors = 0
+        self.session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        """Create a session with a sized connection pool mounted for http and https."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._requests_by_host[host] = self._requests_by_host.get(host, 0) + 1
+        try:
+            return self.session.request(method, url, **kwargs)
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get connection reuse counters.
+
+        `connections_opened` counts TCP connections urllib3 had to create,
+        `requests_sent` counts requests issued over those connections, so the
+        difference is the number of requests served by a kept-alive connection.
+        """
+        hosts = {}
+        opened = 0
+        sent = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = getattr(adapter, "poolmanager", None)
+            if pools is None:
+                continue
+            for key in list(pools.pools.keys()):
+                try:
+                    pool = pools.pools[key]
+                except KeyError:
+                    continue
+                host_opened = getattr(pool, "num_connections", 0)
+                host_sent = getattr(pool, "num_requests", 0)
+                opened += host_opened
+                sent += host_sent
+                hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    "connections_opened": host_opened,
+                    "requests_sent": host_sent,
+                    "connections_reused": max(host_sent - host_opened, 0)
+                }
+
+        with self._lock:
+            requests_by_host = dict(self._requests_by_host)
+            errors = self._errors
+
+        return {
+            "pool_connections": self.config.pool_connections,
+            "pool_maxsize": self.config.pool_maxsize,
+            "pool_block": self.config.pool_block,
+            "connections_opened": opened,
+            "requests_sent": sent,
+            "connections_reused": max(sent - opened, 0),
+            "reuse_ratio": round((sent - opened) / sent, 3) if sent else 0.0,
+            "errors": errors,
+            "requests_by_host": requests_by_host,
+            "hosts": hosts
+        }
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_shared_session: Optional[HttpSessionPool] = None
+_shared_session_lock = threading.Lock()
+
+def get_shared_session(config: Optional[HttpConfig] = None) -> HttpSessionPool:
+    """
+    Get the process-wide session pool, creating it on first use.
+
+    The pool is sized by the first caller that passes a config; later calls
+    return the same instance so every client shares one set of connections.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = HttpSessionPool(config)
+        return _shared_session
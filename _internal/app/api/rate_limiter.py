@@ -0,0 +1,169 @@
+"""
+Process-wide token-bucket rate limiter for Seedr API requests.
+"""
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any
+
+# Status codes Seedr uses to say it is being called too often
+THROTTLE_STATUS_CODES = (429, 503)
+
+def parse_retry_after(value: Optional[str], max_delay: float = 300.0) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either seconds or an HTTP date
+        max_delay: Longest delay to honour
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError, IndexError):
+            return None
+    return min(max(delay, 0.0), max_delay)
+
+
+class TokenBucketLimiter:
+    """Token bucket shared by every thread calling one API.
+
+    Each request takes `weight` tokens; tokens refill at the current rate up
+    to `burst`. Callers reserve their tokens up front and sleep off any
+    deficit, so concurrent callers are spaced out in arrival order instead
+    of polling. A throttled response (429/503) halves the rate, at most once
+    per `decrease_interval`, and a Retry-After header pauses every caller
+    until it has passed. Each successful response raises the rate again by
+    `recovery` of `max_rate`, so throughput settles just under the point
+    where the server starts throttling.
+    """
+
+    def __init__(self, max_rate: float = 5.0, burst: float = 10.0, min_rate: float = 0.2,
+                 recovery: float = 0.01, decrease_interval: float = 1.0):
+        self.max_rate = max_rate
+        self.burst = max(1.0, burst)
+        self.min_rate = min(min_rate, max_rate) if max_rate > 0 else min_rate
+        self.recovery = recovery
+        self.decrease_interval = decrease_interval
+        self._lock = threading.Lock()
+        self._rate = max_rate
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._requests = 0
+        self._throttled = 0
+        self._waited = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rate > 0
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+    def acquire(self, weight: float = 1.0) -> float:
+        """
+        Wait until a request of the given weight may be sent.
+
+        Args:
+            weight: Tokens the request costs
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= min(weight, self.burst)
+            self._requests += 1
+            wait = max(self._blocked_until - now, -self._tokens / self._rate, 0.0)
+        waited = 0.0
+        while wait > 0:
+            time.sleep(wait)
+            waited += wait
+            # A Retry-After may have arrived while this caller was sleeping
+            with self._lock:
+                wait = self._blocked_until - time.monotonic()
+        if waited:
+            with self._lock:
+                self._waited += waited
+        return waited
+
+    def record(self, status_code: int, retry_after: Optional[str] = None) -> None:
+        """
+        Adapt the rate to a response.
+
+        Args:
+            status_code: HTTP status of the response
+            retry_after: The response's Retry-After header, if any
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if status_code not in THROTTLE_STATUS_CODES:
+                self._refill(now)
+                self._rate = min(self.max_rate, self._rate + self.max_rate * self.recovery)
+                return
+
+            self._throttled += 1
+            self._refill(now)
+            if now - self._last_decrease >= self.decrease_interval:
+                # One decrease per interval, however many requests were in flight when throttling began
+                self._rate = max(self.min_rate, self._rate / 2)
+                self._last_decrease = now
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = 1.0 / self._rate
+            # Pause everyone and start refilling from empty once the delay is over
+            self._blocked_until = max(self._blocked_until, now + delay)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = self._blocked_until
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the current and configured rates, pause state and counters."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "enabled": self.enabled,
+                "rate": round(self._rate, 3),
+                "max_rate": self.max_rate,
+                "min_rate": self.min_rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 3),
+                "paused_for": round(max(self._blocked_until - now, 0.0), 3),
+                "requests": self._requests,
+                "throttled": self._throttled,
+                "waited_seconds": round(self._waited, 3)
+            }
+
+
+_shared_limiter: Optional[TokenBucketLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+def get_shared_limiter(max_rate: float = 5.0, burst: float = 10.0) -> TokenBucketLimiter:
+    """
+    Get the process-wide Seedr rate limiter, creating it on first use.
+
+    Like the shared session, the first caller sizes the limiter and every
+    later SeedrClient shares the same bucket.
+    """
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = TokenBucketLimiter(max_rate, burst)
+        return _shared_limiter
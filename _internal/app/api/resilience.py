@@ -0,0 +1,209 @@
+"""
+Retries and circuit breakers for calls to Seedr and Sonarr.
+"""
+import time
+import random
+import threading
+from typing import Callable, Dict, Any, Optional
+import requests
+from ..config import HttpConfig
+
+# Methods that can be sent again without side effects
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Responses that mean the upstream itself is failing
+FAILURE_STATUS_CODES = {500, 502, 503, 504}
+
+class UpstreamUnavailableError(requests.exceptions.ConnectionError):
+    """Raised when an upstream cannot serve a request: its circuit is open or every attempt failed."""
+    pass
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised instead of sending a request while an upstream's circuit is open."""
+    pass
+
+
+class CircuitBreaker:
+    """Stop calling an upstream that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    every call fails immediately with CircuitOpenError. Once `reset_timeout`
+    seconds have passed the circuit is half-open: a single probe request is
+    let through, and its outcome closes the circuit or opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._rejected = 0
+        self._last_error: Optional[str] = None
+
+    def _current_state(self, now: float) -> str:
+        if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if calls are currently being refused."""
+        with self._lock:
+            if self._current_state(time.monotonic()) == self.OPEN:
+                raise CircuitOpenError(f"{self.name} is unavailable: {self._last_error}")
+
+    def before_call(self) -> None:
+        """Admit a call or raise CircuitOpenError. Every admitted call must be followed by a record_*() call."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.OPEN or (state == self.HALF_OPEN and self._probing):
+                self._rejected += 1
+                raise CircuitOpenError(f"{self.name} is unavailable: {self._last_error}")
+            if state == self.HALF_OPEN:
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, error: str) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = error
+            if self._probing or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def record_ignored(self) -> None:
+        """Release an admitted call whose outcome says nothing about the upstream."""
+        with self._lock:
+            self._probing = False
+
+    def get_state(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in": round(max(self._opened_at + self.reset_timeout - now, 0.0), 3)
+                            if state == self.OPEN else 0.0,
+                "rejected": self._rejected,
+                "last_error": self._last_error
+            }
+
+
+class Upstream:
+    """Send requests to one upstream with retries and a circuit breaker.
+
+    Idempotent requests that fail with a connection error, a timeout or a
+    5xx response are retried up to `max_attempts` times with jittered
+    exponential backoff. Other requests are sent once. Each attempt passes
+    through the circuit breaker, so once the upstream is known to be down,
+    callers fail in microseconds instead of waiting for timeouts.
+    """
+
+    def __init__(self, name: str, max_attempts: int = 3, base_delay: float = 0.5,
+                 max_delay: float = 10.0, breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker(name)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before the attempt after `attempt`: half fixed, half random, doubling each time."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def send(self, method: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Send a request through the breaker, retrying idempotent requests.
+
+        Args:
+            method: HTTP method, to decide whether the request may be retried
+            send: Sends the request once and returns the response
+
+        Returns:
+            requests.Response: The first response that is not a 5xx
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            UpstreamUnavailableError: If the last attempt failed to connect,
+                timed out or got a 5xx response
+            requests.RequestException: If the request itself is invalid
+        """
+        attempts = self.max_attempts if method.upper() in IDEMPOTENT_METHODS else 1
+        for attempt in range(1, attempts + 1):
+            self.breaker.before_call()
+            try:
+                response = send()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.breaker.record_failure(f"{type(e).__name__}: {e}")
+                if attempt == attempts:
+                    raise UpstreamUnavailableError(f"{self.name} is unavailable: {e}") from e
+            except requests.RequestException as e:
+                self.breaker.record_failure(f"{type(e).__name__}: {e}")
+                if attempt == attempts:
+                    raise
+            except BaseException:
+                self.breaker.record_ignored()
+                raise
+            else:
+                if response.status_code not in FAILURE_STATUS_CODES:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure(f"HTTP {response.status_code}")
+                response.close()
+                if attempt == attempts:
+                    raise UpstreamUnavailableError(f"{self.name} is unavailable: HTTP {response.status_code}")
+            time.sleep(self.backoff(attempt))
+
+
+_upstreams: Dict[str, Upstream] = {}
+_upstreams_lock = threading.Lock()
+
+def get_upstream(name: str, config: Optional[HttpConfig] = None) -> Upstream:
+    """
+    Get the process-wide Upstream for a service, creating it on first use.
+
+    Every client of the same service shares one circuit breaker, so the
+    poller, the watcher and the API threads see an outage together.
+    """
+    with _upstreams_lock:
+        if name not in _upstreams:
+            config = config or HttpConfig()
+            _upstreams[name] = Upstream(
+                name,
+                max_attempts=config.retry_attempts,
+                base_delay=config.retry_base_delay,
+                breaker=CircuitBreaker(name, config.circuit_failure_threshold, config.circuit_reset_timeout)
+            )
+        return _upstreams[name]
+
+
+def get_circuit_states() -> Dict[str, Dict[str, Any]]:
+    """Get the circuit state of every upstream created so far."""
+    with _upstreams_lock:
+        upstreams = list(_upstreams.values())
+    return {upstream.name: upstream.breaker.get_state() for upstream in upstreams}
@@ -1,18 +1,34 @@
 """
 Seedr API client for handling torrents and downloads.
 """
-import os
 from typing import Optional, Dict, Any, List
 import requests
 from ..auth.oauth_handler import OAuthHandler
-from ..config import SeedrConfig
+from ..config import SeedrConfig, DownloadConfig
+from .http_session import HttpSessionPool, get_shared_session
+from .rate_limiter import TokenBucketLimiter, get_shared_limiter
+from .resilience import UpstreamUnavailableError, get_upstream
+from .segmented_download import SegmentedDownloader
+from .zip_stream import StreamingZipExtractor
 import json
-import time
+
+# Rate limiter tokens per request by method; endpoints that cost Seedr more pass their own weight
+REQUEST_WEIGHTS = {"GET": 1, "POST": 2, "DELETE": 2}
+ADD_TORRENT_WEIGHT = 3
+CREATE_ARCHIVE_WEIGHT = 4
 
 class SeedrClient:
-    def __init__(self, config: SeedrConfig):
+    def __init__(self, config: SeedrConfig, session: Optional[HttpSessionPool] = None,
+                 download_config: Optional[DownloadConfig] = None,
+                 limiter: Optional[TokenBucketLimiter] = None):
         self.auth = OAuthHandler(config)
         self.api_base_url = config.api_base_url
+        self.session = session or get_shared_session()
+        self.limiter = limiter or get_shared_limiter(config.rate_limit, config.rate_burst)
+        self.upstream = get_upstream("seedr", self.session.config)
+        # Times a throttled (429) request is sent again after the limiter's pause
+        self.throttle_retries = 2
+        self.downloader = SegmentedDownloader(self.session, download_config)
         self.verbose_logging = False  # Default to false to reduce terminal clutter
 
     def _get_headers(self) -> Dict[str, str]:
@@ -25,6 +41,56 @@ class SeedrClient:
             "Content-Type": "application/json"
         }
         
+    def _request(self, method: str, url: str, weight: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        Send an authenticated API request through the shared rate limiter.
+        
+        A 429 response is sent again once the limiter's pause is over, and a
+        401 is retried once with a new token. Methods that return an empty
+        result on errors still raise UpstreamUnavailableError, so an outage
+        is not mistaken for "nothing found".
+        
+        Args:
+            method: HTTP method
+            url: API URL
+            weight: Rate limiter tokens the request costs (defaults by method)
+            **kwargs: Passed to the session; headers must come from _get_headers()
+        
+        Returns:
+            requests.Response: The response to the last attempt
+        """
+        weight = weight or REQUEST_WEIGHTS.get(method, 1)
+        for attempt in range(self.throttle_retries + 1):
+            response = self._send(method, url, weight, **kwargs)
+            if response.status_code != 429 or attempt == self.throttle_retries:
+                break
+            if self.verbose_logging:
+                print(f"Seedr throttled {url}, retrying after the limiter's pause")
+            response.close()
+        if response.status_code != 401:
+            return response
+        
+        headers = kwargs.get("headers") or {}
+        rejected = headers.get("Authorization", "")[len("Bearer "):] or None
+        token = self.auth.refresh_after_unauthorized(rejected)
+        if not token:
+            return response
+        
+        if self.verbose_logging:
+            print(f"Access token rejected for {url}, retrying with a refreshed token")
+        response.close()
+        kwargs["headers"] = {**headers, "Authorization": f"Bearer {token}"}
+        return self._send(method, url, weight, **kwargs)
+    
+    def _send(self, method: str, url: str, weight: float, **kwargs) -> requests.Response:
+        """Send a request through the circuit breaker, waiting for rate limiter tokens before each attempt."""
+        def attempt() -> requests.Response:
+            self.limiter.acquire(weight)
+            response = self.session.request(method, url, **kwargs)
+            self.limiter.record(response.status_code, response.headers.get("Retry-After"))
+            return response
+        return self.upstream.send(method, attempt)
+        
     def get_account_info(self) -> Dict[str, Any]:
         """
         Get user account information.
@@ -34,8 +100,8 @@ class SeedrClient:
         url = f"{self.api_base_url}/api/v0.1/p/user"
         
         try:
-            response = requests.get(
-                url,
+            response = self._request(
+                "GET", url,
                 headers={
                     **self._get_headers(),
                     'Accept': 'application/json'
@@ -47,33 +113,44 @@ class SeedrClient:
             
             response.raise_for_status()
             return response.json() or {}
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting account info: {e}")
             return {}
             
-    def get_tasks(self) -> List[Dict[str, Any]]:
+    def fetch_tasks(self) -> List[Dict[str, Any]]:
         """
         Get list of all torrent tasks.
         
         Endpoint: GET /tasks
+        
+        Raises:
+            requests.RequestException: If the request fails
         """
         url = f"{self.api_base_url}/api/v0.1/p/tasks"
         
+        response = self._request(
+            "GET", url,
+            headers={
+                **self._get_headers(),
+                'Accept': 'application/json'
+            },
+            timeout=10
+        )
+        
+        self._log_get_response(url, response, self.verbose_logging)
+        
+        response.raise_for_status()
+        return response.json() or []
+    
+    def get_tasks(self) -> List[Dict[str, Any]]:
+        """Get list of all torrent tasks, or [] if Seedr cannot be reached."""
         try:
-            response = requests.get(
-                url,
-                headers={
-                    **self._get_headers(),
-                    'Accept': 'application/json'
-                },
-                timeout=10
-            )
-            
-            self._log_get_response(url, response, self.verbose_logging)
-            
-            response.raise_for_status()
-            return response.json() or []
+            return self.fetch_tasks()
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting tasks: {e}")
@@ -88,8 +165,8 @@ class SeedrClient:
         url = f"{self.api_base_url}/api/v0.1/p/tasks/{task_id}"
         
         try:
-            response = requests.get(
-                url,
+            response = self._request(
+                "GET", url,
                 headers={
                     **self._get_headers(),
                     'Accept': 'application/json'
@@ -104,6 +181,8 @@ class SeedrClient:
             
             response.raise_for_status()
             return response.json()
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting task {task_id}: {e}")
@@ -118,8 +197,8 @@ class SeedrClient:
         url = f"{self.api_base_url}/api/v0.1/p/tasks/{task_id}/contents"
         
         try:
-            response = requests.get(
-                url,
+            response = self._request(
+                "GET", url,
                 headers={
                     **self._get_headers(),
                     'Accept': 'application/json'
@@ -131,6 +210,8 @@ class SeedrClient:
             
             response.raise_for_status()
             return response.json() or []
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting task contents for {task_id}: {e}")
@@ -145,8 +226,8 @@ class SeedrClient:
         url = f"{self.api_base_url}/api/v0.1/p/tasks/{task_id}/progress"
         
         try:
-            response = requests.get(
-                url,
+            response = self._request(
+                "GET", url,
                 headers={
                     **self._get_headers(),
                     'Accept': 'application/json'
@@ -158,6 +239,8 @@ class SeedrClient:
             
             response.raise_for_status()
             return response.json()
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting task progress for {task_id}: {e}")
@@ -172,8 +255,8 @@ class SeedrClient:
         url = f"{self.api_base_url}/api/v0.1/p/tasks/{task_id}/pause"
         
         try:
-            response = requests.post(
-                url,
+            response = self._request(
+                "POST", url,
                 headers={
                     **self._get_headers(),
                     'Accept': 'application/json'
@@ -186,6 +269,8 @@ class SeedrClient:
             
             response.raise_for_status()
             return True
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error pausing task {task_id}: {e}")
@@ -200,8 +285,8 @@ class SeedrClient:
         url = f"{self.api_base_url}/api/v0.1/p/tasks/{task_id}/resume"
         
         try:
-            response = requests.post(
-                url,
+            response = self._request(
+                "POST", url,
                 headers={
                     **self._get_headers(),
                     'Accept': 'application/json'
@@ -214,6 +299,8 @@ class SeedrClient:
             
             response.raise_for_status()
             return True
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error resuming task {task_id}: {e}")
@@ -229,8 +316,8 @@ class SeedrClient:
         url = f"{self.api_base_url}/api/v0.1/p/tasks/{task_id}"
         
         try:
-            response = requests.delete(
-                url,
+            response = self._request(
+                "DELETE", url,
                 headers={
                     **self._get_headers(),
                     'Accept': 'application/json'
@@ -243,6 +330,8 @@ class SeedrClient:
             
             response.raise_for_status()
             return True
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error deleting task {task_id}: {e}")
@@ -282,14 +371,15 @@ class SeedrClient:
                         "url": torrent_url
                     }
             
-            response = requests.post(
-                url,
+            response = self._request(
+                "POST", url,
                 headers={
                     **self._get_headers(),
                     'Accept': 'application/json'
                 },
                 json=payload,
-                timeout=30
+                timeout=30,
+                weight=ADD_TORRENT_WEIGHT
             )
             
             if self.verbose_logging:
@@ -302,6 +392,8 @@ class SeedrClient:
                 response.raise_for_status()
                 return {"success": True}
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error adding torrent: {e}")
@@ -361,6 +453,8 @@ class SeedrClient:
                 "status": "unknown",
                 "message": "Torrent not found"
             }
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting torrent status: {e}")
@@ -369,50 +463,64 @@ class SeedrClient:
                 "message": f"Error: {str(e)}"
             }
     
-    def get_folder_contents(self, folder_id: str = "0") -> List[Dict[str, Any]]:
+    def fetch_folder_contents(self, folder_id: str = "0") -> List[Dict[str, Any]]:
         """
         Get contents of a folder.
         folder_id "0" is the root folder.
+        
+        Raises:
+            requests.RequestException: If the request fails
         """
         url = f"{self.api_base_url}/api/v0.1/p/folder/{folder_id}"
         
+        response = self._request(
+            "GET", url,
+            headers=self._get_headers(),
+            timeout=10
+        )
+        response.raise_for_status()
+        data = response.json()
+        
+        # Return all folders and files
+        result = []
+        
+        # Add folders
+        if "folders" in data:
+            for folder in data["folders"]:
+                folder["type"] = "folder"
+                result.append(folder)
+        
+        # Add files
+        if "files" in data:
+            for file in data["files"]:
+                file["type"] = "file"
+                result.append(file)
+                
+        return result
+    
+    def get_folder_contents(self, folder_id: str = "0") -> List[Dict[str, Any]]:
+        """Get contents of a folder, or [] if Seedr cannot be reached."""
         try:
-            response = requests.get(
-                url,
-                headers=self._get_headers(),
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Return all folders and files
-            result = []
-            
-            # Add folders
-            if "folders" in data:
-                for folder in data["folders"]:
-                    folder["type"] = "folder"
-                    result.append(folder)
-            
-            # Add files
-            if "files" in data:
-                for file in data["files"]:
-                    file["type"] = "file"
-                    result.append(file)
-                    
-            return result
+            return self.fetch_folder_contents(folder_id)
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting folder contents: {e}")
             return []
 
-    def download_file(self, file_id: str, save_path: str) -> bool:
+    def download_file(self, file_id: str, save_path: str, checksum: Optional[str] = None) -> bool:
         """
         Download a file from Seedr to the local machine.
         
+        The transfer goes to `<save_path>.part` and resumes from where it
+        stopped if the process restarts; the final name only appears once
+        the file is complete.
+        
         Args:
             file_id: ID of the file to download
             save_path: Path where the file should be saved
+            checksum: Optional expected digest as "<algorithm>:<hex>"
         
         Returns:
             bool: True if successful, False otherwise
@@ -423,17 +531,9 @@ class SeedrClient:
             if not download_url:
                 return False
                 
-            # Create directory if needed
-            os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
-            
-            # Download the file
-            with requests.get(download_url, stream=True) as r:
-                r.raise_for_status()
-                with open(save_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-            
-            return True
+            # Download the file over parallel Range requests
+            self.downloader.verbose_logging = self.verbose_logging
+            return self.downloader.download(download_url, save_path, checksum)
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error downloading file: {e}")
@@ -459,8 +559,8 @@ class SeedrClient:
         url = f"{self.api_base_url}/api/v0.1/p/file/{file_id}"
         
         try:
-            response = requests.get(
-                url,
+            response = self._request(
+                "GET", url,
                 headers=self._get_headers(),
                 timeout=10
             )
@@ -475,6 +575,8 @@ class SeedrClient:
                 if self.verbose_logging:
                     print(f"No download URL in response: {data}")
                 return None
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting download URL: {e}")
@@ -496,7 +598,7 @@ class SeedrClient:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(torrent_url, headers=headers, timeout=10)
+            response = self.session.get(torrent_url, headers=headers, timeout=10)
             response.raise_for_status()
             
             # Look for the magnet link in the HTML
@@ -531,10 +633,11 @@ class SeedrClient:
         url = f"{self.api_base_url}/api/v0.1/p/folder/{folder_id}/archive"
         
         try:
-            response = requests.post(
-                url,
+            response = self._request(
+                "POST", url,
                 headers=self._get_headers(),
-                timeout=10
+                timeout=10,
+                weight=CREATE_ARCHIVE_WEIGHT
             )
             
             if self.verbose_logging:
@@ -550,26 +653,28 @@ class SeedrClient:
                 if self.verbose_logging:
                     print(f"No uniq in response: {data}")
                 return None
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error initializing archive: {e}")
             return None
     
-    def get_archive_url(self, uniq: str) -> Optional[str]:
+    def get_archive_status(self, uniq: str) -> Dict[str, Any]:
         """
-        Get the download URL for an archive.
+        Check the generation status of an archive once, without waiting.
         
         Args:
             uniq: Archive unique ID from init_archive
         
         Returns:
-            Optional[str]: Archive download URL or None if failed
+            Dict[str, Any]: Archive status; "ready" responses include the download "url"
         """
         url = f"{self.api_base_url}/api/v0.1/p/folder/archive/{uniq}"
         
         try:
-            response = requests.get(
-                url,
+            response = self._request(
+                "GET", url,
                 headers=self._get_headers(),
                 timeout=10
             )
@@ -578,81 +683,83 @@ class SeedrClient:
                 self._log_get_response(url, response, self.verbose_logging)
             
             response.raise_for_status()
-            data = response.json()
-            
-            # Check if the archive is ready
-            if "status" in data and data["status"] == "ready" and "url" in data:
-                return data["url"]
-            elif "status" in data and data["status"] == "generating":
-                # Archive is still being generated, wait and retry
-                if self.verbose_logging:
-                    print(f"Archive still generating, progress: {data.get('progress', 'unknown')}")
-                
-                # Wait a bit and try again (up to 3 times)
-                for _ in range(3):
-                    time.sleep(5)
-                    
-                    response = requests.get(
-                        url,
-                        headers=self._get_headers(),
-                        timeout=10
-                    )
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    if "status" in data and data["status"] == "ready" and "url" in data:
-                        return data["url"]
-                
-                # If we get here, the archive is still not ready
-                if self.verbose_logging:
-                    print(f"Archive still not ready after waiting: {data}")
-                return None
-            else:
-                if self.verbose_logging:
-                    print(f"Archive not ready or no URL in response: {data}")
-                return None
+            return response.json() or {}
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
-                print(f"Error getting archive URL: {e}")
-            return None
+                print(f"Error getting archive status: {e}")
+            return {"status": "error", "message": f"Error: {str(e)}"}
     
-    def download_folder_as_archive(self, folder_id: str, save_path: str) -> bool:
+    def get_archive_url(self, uniq: str) -> Optional[str]:
         """
-        Download a folder as an archive.
+        Get the download URL for an archive if it is ready.
+        
+        This never waits for generation to finish; use the ArchiveTracker to
+        poll archives that are still generating.
         
         Args:
-            folder_id: ID of the folder to download
-            save_path: Path where the archive should be saved
+            uniq: Archive unique ID from init_archive
+        
+        Returns:
+            Optional[str]: Archive download URL or None if not ready or failed
+        """
+        data = self.get_archive_status(uniq)
+        
+        # Check if the archive is ready
+        if data.get("status") == "ready" and "url" in data:
+            return data["url"]
+        
+        if self.verbose_logging:
+            print(f"Archive not ready or no URL in response: {data}")
+        return None
+    
+    def download_url(self, download_url: str, save_path: str, checksum: Optional[str] = None) -> bool:
+        """
+        Download an already resolved file or archive URL.
+        
+        Args:
+            download_url: URL returned by get_download_url or get_archive_url
+            save_path: Path where the file should be saved
+            checksum: Optional expected digest as "<algorithm>:<hex>"
         
         Returns:
             bool: True if successful, False otherwise
         """
+        self.downloader.verbose_logging = self.verbose_logging
+        return self.downloader.download(download_url, save_path, checksum)
+    
+    def extract_url(self, download_url: str, dest_dir: str, strip_prefix: Optional[str] = None) -> bool:
+        """
+        Stream a zip archive URL and extract its entries into dest_dir as they arrive.
+        
+        The archive itself is never written to disk. If the stream cannot be
+        parsed sequentially, False is returned and callers can fall back to
+        download_url.
+        
+        Args:
+            download_url: Archive URL returned by get_archive_url
+            dest_dir: Directory to extract the entries into
+            strip_prefix: Leading folder name to drop from entry paths
+        
+        Returns:
+            bool: True if every entry was extracted and verified, False otherwise
+        """
+        extractor = StreamingZipExtractor(dest_dir, strip_prefix)
         try:
-            # Initialize the archive
-            uniq = self.init_archive(folder_id)
-            if not uniq:
-                return False
-                
-            # Get the download URL for the archive
-            download_url = self.get_archive_url(uniq)
-            if not download_url:
-                return False
-                
-            # Create directory if needed
-            os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
-            
-            # Download the file
-            with requests.get(download_url, stream=True) as r:
-                r.raise_for_status()
-                with open(save_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-            
+            with self.session.get(download_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=self.downloader.config.chunk_size):
+                    extractor.feed(chunk)
+            extracted = extractor.close()
+            if self.verbose_logging:
+                print(f"Extracted {len(extracted)} files to {dest_dir}")
             return True
         except Exception as e:
+            # Leave nothing half-extracted behind for the fallback download
+            extractor.abort()
             if self.verbose_logging:
-                print(f"Error downloading folder as archive: {e}")
+                print(f"Error extracting archive to {dest_dir}: {e}")
             return False
     
     def _debug_print_response(self, method: str, url: str, response, verbose=False) -> None:
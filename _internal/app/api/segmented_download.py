@@ -0,0 +1,360 @@
+"""
+Multi-connection, resumable segmented downloader for Seedr file and archive URLs.
+"""
+import os
+import re
+import json
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, List
+from ..config import DownloadConfig
+from .http_session import HttpSessionPool
+
+CONTENT_RANGE_PATTERN = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+PART_SUFFIX = ".part"
+SIDECAR_SUFFIX = ".part.json"
+
+class RangeNotSupported(Exception):
+    """Raised when the server ignores a Range request."""
+
+
+class ChecksumMismatch(Exception):
+    """Raised when a completed transfer does not match its expected checksum."""
+
+
+class TransferState:
+    """Received byte ranges of an in-progress transfer, persisted next to the `.part` file.
+
+    Each segment records how many of its bytes are already on disk. The
+    sidecar is only updated after the data it describes has been flushed,
+    so after a crash it may under-report progress but never over-report it.
+    """
+
+    def __init__(self, path: str, total_size: int, segments: List[Tuple[int, int]],
+                 validator: Optional[str] = None, received: Optional[List[int]] = None):
+        self.path = path
+        self.total_size = total_size
+        self.segments = segments
+        self.validator = validator
+        self.received = received or [0] * len(segments)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> Optional['TransferState']:
+        """Load a sidecar file, returning None if it is missing or unreadable."""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            segments = [(int(start), int(end)) for start, end in data["segments"]]
+            received = [int(count) for count in data["received"]]
+            if len(received) != len(segments):
+                return None
+            return cls(path, int(data["total_size"]), segments, data.get("validator"), received)
+        except Exception:
+            return None
+
+    def matches(self, total_size: int, validator: Optional[str]) -> bool:
+        """Check that the remote file is still the one this state describes."""
+        if self.total_size != total_size:
+            return False
+        return not (self.validator and validator and self.validator != validator)
+
+    def update(self, index: int, received: int) -> None:
+        """Record progress for one segment and persist it atomically."""
+        with self._lock:
+            self.received[index] = received
+            self._save_locked()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "total_size": self.total_size,
+                "validator": self.validator,
+                "segments": self.segments,
+                "received": self.received
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        for path in (self.path, f"{self.path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class SegmentedDownloader:
+    """Download a URL over several parallel, resumable HTTP Range requests.
+
+    Data is written to `<save_path>.part`, preallocated to the full size,
+    with every segment writing at its own offset. A `<save_path>.part.json`
+    sidecar records the bytes received per segment, so a restarted transfer
+    only requests what is missing. The `.part` file is renamed onto the final
+    path only after its size, and checksum when one is known, validate.
+    Servers that do not answer a Range probe with 206 Partial Content are
+    downloaded over a single stream instead.
+    """
+
+    def __init__(self, session: HttpSessionPool, config: Optional[DownloadConfig] = None):
+        self.session = session
+        self.config = config or DownloadConfig()
+        self.verbose_logging = False
+
+    def plan_segments(self, total_size: int) -> List[Tuple[int, int]]:
+        """
+        Split a file into inclusive byte ranges.
+
+        The segment count scales with file size: one segment per
+        `min_segment_size` bytes, capped at `segments`.
+        """
+        if total_size <= 0:
+            return []
+        min_size = max(self.config.min_segment_size, 1)
+        count = max(1, min(self.config.segments, total_size // min_size))
+        step = -(-total_size // count)  # ceiling division
+        return [(start, min(start + step, total_size) - 1) for start in range(0, total_size, step)]
+
+    def download(self, url: str, save_path: str, checksum: Optional[str] = None) -> bool:
+        """
+        Download a URL to save_path.
+
+        Args:
+            url: URL to download
+            save_path: Final path of the file
+            checksum: Optional expected digest as "<algorithm>:<hex>", e.g. "sha1:ab12..."
+
+        Returns:
+            bool: True if the whole file was written and validated, False otherwise
+        """
+        part_path = save_path + PART_SUFFIX
+        sidecar_path = save_path + SIDECAR_SUFFIX
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
+
+            # Probe with a one byte range; the answer tells us whether ranges
+            # are honoured, the total size and a validator for resuming.
+            probe = self.session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=30)
+            try:
+                probe.raise_for_status()
+                total_size = self._total_size_from_probe(probe)
+                validator = self._validator(probe)
+                checksum = checksum or self._checksum_from_headers(probe)
+                if total_size is None:
+                    self._discard_partial(part_path, sidecar_path)
+                    if probe.status_code == 206:
+                        # Partial content without a usable total; fetch the whole file instead
+                        expected_size = self._download_single(url, part_path)
+                    else:
+                        # Server ignored the range; reuse this response as the single stream
+                        expected_size = self._write_stream(probe, part_path)
+                    return self._finalize(part_path, save_path, expected_size, checksum, sidecar_path)
+            finally:
+                probe.close()
+
+            state = self._load_or_create_state(sidecar_path, part_path, total_size, validator)
+
+            try:
+                self._download_segments(url, part_path, state)
+            except RangeNotSupported:
+                if self.verbose_logging:
+                    print(f"Range requests not honoured for {url}, falling back to single stream")
+                self._discard_partial(part_path, sidecar_path)
+                expected_size = self._download_single(url, part_path)
+                return self._finalize(part_path, save_path, expected_size, checksum, sidecar_path)
+
+            return self._finalize(part_path, save_path, total_size, checksum, sidecar_path)
+        except ChecksumMismatch as e:
+            # The bytes on disk are bad; start from scratch next time
+            self._discard_partial(part_path, sidecar_path)
+            if self.verbose_logging:
+                print(f"Error downloading {url}: {e}")
+            return False
+        except Exception as e:
+            if self.verbose_logging:
+                print(f"Error downloading {url}: {e}")
+            return False
+
+    def _load_or_create_state(self, sidecar_path: str, part_path: str, total_size: int,
+                              validator: Optional[str]) -> TransferState:
+        """Resume from an existing sidecar when it matches, otherwise start fresh."""
+        state = TransferState.load(sidecar_path)
+        if state and state.matches(total_size, validator) and os.path.exists(part_path) \
+                and os.path.getsize(part_path) == total_size:
+            if self.verbose_logging:
+                done = sum(state.received)
+                print(f"Resuming {part_path} at {done} of {total_size} bytes")
+            return state
+
+        self._discard_partial(part_path, sidecar_path)
+        with open(part_path, 'wb') as f:
+            f.truncate(total_size)
+        state = TransferState(sidecar_path, total_size, self.plan_segments(total_size), validator)
+        state.save()
+        return state
+
+    @staticmethod
+    def _discard_partial(part_path: str, sidecar_path: str) -> None:
+        for path in (part_path, sidecar_path, f"{sidecar_path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _finalize(self, part_path: str, save_path: str, total_size: Optional[int],
+                  checksum: Optional[str], sidecar_path: str) -> bool:
+        """Validate the `.part` file and atomically move it to its final name."""
+        if total_size is not None and os.path.getsize(part_path) != total_size:
+            raise IOError(f"Size mismatch for {part_path}: expected {total_size} bytes")
+        if checksum:
+            self._verify_checksum(part_path, checksum)
+        os.replace(part_path, save_path)
+        for path in (sidecar_path, f"{sidecar_path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+        return True
+
+    def _verify_checksum(self, path: str, checksum: str) -> None:
+        algorithm, _, expected = checksum.partition(":")
+        digest = hashlib.new(algorithm.lower())
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.config.chunk_size), b""):
+                digest.update(chunk)
+        if digest.hexdigest().lower() != expected.lower():
+            raise ChecksumMismatch(f"{algorithm} mismatch for {path}")
+
+    @staticmethod
+    def _total_size_from_probe(response) -> Optional[int]:
+        """Return the file size from a 206 probe, or None if ranges are unsupported."""
+        if response.status_code != 206:
+            return None
+        match = CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+        if not match or match.group(3) == "*":
+            return None
+        return int(match.group(3))
+
+    @staticmethod
+    def _validator(response) -> Optional[str]:
+        """Identify the remote file version from its ETag or Last-Modified header."""
+        etag = response.headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return response.headers.get("Last-Modified")
+
+    @staticmethod
+    def _checksum_from_headers(response) -> Optional[str]:
+        """
+        Get the expected checksum of the whole file, if the server states one.
+
+        Only explicit digests count: `Repr-Digest`/`Digest` with sha-256 or
+        md5, and `Content-MD5`. ETags are opaque and never used, since a
+        wrong guess would discard a good transfer on every attempt.
+        """
+        for header in ("Repr-Digest", "Digest"):
+            value = response.headers.get(header, "")
+            for name, algorithm in (("sha-256", "sha256"), ("md5", "md5")):
+                match = re.search(rf'{name}=:?([A-Za-z0-9+/=]+):?', value, re.IGNORECASE)
+                if match:
+                    try:
+                        return f"{algorithm}:" + base64.b64decode(match.group(1)).hex()
+                    except Exception:
+                        pass
+        content_md5 = response.headers.get("Content-MD5")
+        if content_md5:
+            try:
+                return "md5:" + base64.b64decode(content_md5).hex()
+            except Exception:
+                pass
+        return None
+
+    @staticmethod
+    def _content_length(response) -> Optional[int]:
+        """Get the number of bytes a full 200 response will write, if the server says."""
+        if response.status_code != 200 or response.headers.get("Content-Encoding", "identity") != "identity":
+            # iter_content() decodes compressed bodies, so Content-Length does not match the bytes written
+            return None
+        try:
+            return int(response.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return None
+
+    def _download_single(self, url: str, part_path: str) -> Optional[int]:
+        """Download the whole file over one streamed GET. Returns the expected size, if known."""
+        with self.session.get(url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            return self._write_stream(response, part_path)
+
+    def _write_stream(self, response, part_path: str) -> Optional[int]:
+        """Write a full response body to part_path. Returns the expected size, if known."""
+        with open(part_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=self.config.chunk_size):
+                f.write(chunk)
+        return self._content_length(response)
+
+    def _download_segments(self, url: str, part_path: str, state: TransferState) -> None:
+        """Fetch all incomplete segments in parallel into the preallocated `.part` file."""
+        pending = [
+            index for index, (start, end) in enumerate(state.segments)
+            if state.received[index] < end - start + 1
+        ]
+        if not pending:
+            return
+
+        failed = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="segment") as pool:
+            futures = [
+                pool.submit(self._download_segment, url, part_path, state, index, failed)
+                for index in pending
+            ]
+            # Surface the first error (RangeNotSupported included) after all workers stop
+            errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def _download_segment(self, url: str, part_path: str, state: TransferState, index: int,
+                          failed: threading.Event) -> None:
+        """Fetch the missing tail of one segment and write it at its offset."""
+        start, end = state.segments[index]
+        received = state.received[index]
+        offset = start + received
+        headers = {"Range": f"bytes={offset}-{end}"}
+        checkpoint_every = max(self.config.checkpoint_size, self.config.chunk_size)
+
+        with self.session.get(url, headers=headers, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                failed.set()
+                raise RangeNotSupported(f"Expected 206 for bytes {offset}-{end}, got {response.status_code}")
+
+            since_checkpoint = 0
+            with open(part_path, 'r+b') as f:
+                f.seek(offset)
+                try:
+                    for chunk in response.iter_content(chunk_size=self.config.chunk_size):
+                        if failed.is_set():
+                            break
+                        f.write(chunk)
+                        received += len(chunk)
+                        since_checkpoint += len(chunk)
+                        if since_checkpoint >= checkpoint_every:
+                            self._checkpoint(f, state, index, received)
+                            since_checkpoint = 0
+                finally:
+                    # Persist whatever arrived, even if the connection dropped
+                    self._checkpoint(f, state, index, received)
+
+        if failed.is_set():
+            return
+        if received != end - start + 1:
+            failed.set()
+            raise IOError(f"Segment {start}-{end} truncated: got {received} of {end - start + 1} bytes")
+
+    @staticmethod
+    def _checkpoint(f, state: TransferState, index: int, received: int) -> None:
+        """Flush written data to disk before recording it in the sidecar."""
+        f.flush()
+        os.fsync(f.fileno())
+        state.update(index, received)
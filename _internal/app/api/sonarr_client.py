@@ -2,16 +2,33 @@
 Sonarr API client for handling series and episodes.
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 import requests
 from ..config import SonarrConfig
+from .http_session import HttpSessionPool, get_shared_session
+from .resilience import UpstreamUnavailableError, get_upstream
+
+# Sort key of wanted/missing pages: newly missing episodes come first, so refreshes can stop early
+MISSING_SORT_KEY = "airDateUtc"
 
 class SonarrClient:
-    def __init__(self, config: SonarrConfig):
+    def __init__(self, config: SonarrConfig, session: Optional[HttpSessionPool] = None):
         self.config = config
+        self.session = session or get_shared_session()
         self.host = config.host.rstrip('/')
         self.api_key = config.api_key
         self.verbose_logging = False
+        self.upstream = get_upstream("sonarr", self.session.config)
+        
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the Sonarr circuit breaker, retrying idempotent requests.
+        
+        Methods that return an empty result on errors still raise
+        UpstreamUnavailableError, so an outage is not mistaken for "nothing found".
+        """
+        return self.upstream.send(method, lambda: self.session.request(method, url, **kwargs))
         
     def _get_headers(self) -> Dict[str, str]:
         """Get headers with API key."""
@@ -20,18 +37,27 @@ class SonarrClient:
             "Content-Type": "application/json"
         }
         
+    def fetch_series(self) -> List[Dict[str, Any]]:
+        """
+        Get all series from Sonarr.
+        
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        response = self._request(
+            "GET", f"{self.host}/api/v3/series",
+            headers=self._get_headers(),
+            timeout=30
+        )
+        response.raise_for_status()
+        return response.json()
+    
     def get_series(self) -> List[Dict[str, Any]]:
         """Get all series from Sonarr."""
-        url = f"{self.host}/api/v3/series"
-        
         try:
-            response = requests.get(
-                url,
-                headers=self._get_headers(),
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
+            return self.fetch_series()
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting series: {e}")
@@ -42,13 +68,15 @@ class SonarrClient:
         url = f"{self.host}/api/v3/series/{series_id}"
         
         try:
-            response = requests.get(
-                url,
+            response = self._request(
+                "GET", url,
                 headers=self._get_headers(),
                 timeout=10
             )
             response.raise_for_status()
             return response.json()
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting series {series_id}: {e}")
@@ -59,55 +87,84 @@ class SonarrClient:
         url = f"{self.host}/api/v3/rootfolder"
         
         try:
-            response = requests.get(
-                url,
+            response = self._request(
+                "GET", url,
                 headers=self._get_headers(),
                 timeout=10
             )
             response.raise_for_status()
             return response.json()
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting root folders: {e}")
             return []
             
+    def get_missing_page(self, page: int, page_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get one page of missing episodes, most recently aired first.
+        
+        Args:
+            page: Page number, starting at 1
+            page_size: Records per page (defaults to the configured page size)
+        
+        Returns:
+            Dict[str, Any]: Sonarr's paging response with totalRecords and records
+        
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        response = self._request(
+            "GET", f"{self.host}/api/v3/wanted/missing",
+            headers=self._get_headers(),
+            params={
+                "pageSize": page_size or self.config.page_size,
+                "page": page,
+                "sortKey": MISSING_SORT_KEY,
+                "sortDirection": "descending"
+            },
+            timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def fetch_missing_episodes(self, first_page: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Get all missing episodes, fetching the pages after the first concurrently.
+        
+        Args:
+            first_page: Page 1 if the caller already has it
+        
+        Returns:
+            List[Dict[str, Any]]: Missing episode records, most recently aired first
+        
+        Raises:
+            requests.RequestException: If any page fails
+        """
+        page_size = self.config.page_size
+        data = first_page or self.get_missing_page(1, page_size)
+        records = list(data.get("records", []))
+        # Sonarr may clamp the page size; page through with the size it used
+        page_size = data.get("pageSize") or page_size
+        total_pages = -(-data.get("totalRecords", 0) // page_size)
+        if total_pages <= 1:
+            return records
+        
+        # Bounded fan-out; map() keeps the pages in order
+        workers = max(1, min(self.config.page_concurrency, total_pages - 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sonarr-pages") as executor:
+            pages = executor.map(lambda page: self.get_missing_page(page, page_size), range(2, total_pages + 1))
+            for page_data in pages:
+                records.extend(page_data.get("records", []))
+        return records
+    
     def get_missing_episodes(self) -> List[Dict[str, Any]]:
         """Get all missing episodes."""
-        url = f"{self.host}/api/v3/wanted/missing"
-        
         try:
-            # Get first page
-            response = requests.get(
-                url,
-                headers=self._get_headers(),
-                params={
-                    "pageSize": 100,
-                    "page": 1
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Get all pages
-            total_pages = data.get("totalPages", 1)
-            records = data.get("records", [])
-            
-            for page in range(2, total_pages + 1):
-                response = requests.get(
-                    url,
-                    headers=self._get_headers(),
-                    params={
-                        "pageSize": 100,
-                        "page": page
-                    },
-                    timeout=10
-                )
-                response.raise_for_status()
-                data = response.json()
-                records.extend(data.get("records", []))
-                
-            return records
+            return self.fetch_missing_episodes()
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error getting missing episodes: {e}")
@@ -121,8 +178,8 @@ class SonarrClient:
         url = f"{self.host}/api/v3/command"
         
         try:
-            response = requests.post(
-                url,
+            response = self._request(
+                "POST", url,
                 headers=self._get_headers(),
                 json={
                     "name": "DownloadedEpisodesScan",
@@ -132,7 +189,24 @@ class SonarrClient:
             )
             response.raise_for_status()
             return response.json()
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             if self.verbose_logging:
                 print(f"Error triggering download scan: {e}")
-            return {"status": "error", "message": str(e)} 
\ No newline at end of file
+            return {"status": "error", "message": str(e)} 
+    
+    def get_command(self, command_id: int) -> Dict[str, Any]:
+        """
+        Get the state of a command sent to Sonarr.
+        
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        response = self._request(
+            "GET", f"{self.host}/api/v3/command/{command_id}",
+            headers=self._get_headers(),
+            timeout=30
+        )
+        response.raise_for_status()
+        return response.json()
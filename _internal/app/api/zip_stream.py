@@ -0,0 +1,319 @@
+"""
+Streaming zip extractor that writes archive entries to disk as bytes arrive.
+"""
+import os
+import zlib
+import struct
+from typing import Optional, List
+
+LOCAL_HEADER_SIG = 0x04034b50
+CENTRAL_HEADER_SIG = 0x02014b50
+END_OF_CENTRAL_DIR_SIG = 0x06054b50
+ZIP64_END_SIG = 0x06064b50
+DATA_DESCRIPTOR_SIG = 0x08074b50
+LOCAL_HEADER_SIZE = 30
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_ENCRYPTED = 0x01
+METHOD_STORED = 0
+METHOD_DEFLATED = 8
+
+class UnsupportedZipStream(Exception):
+    """Raised when an archive cannot be extracted without its central directory."""
+
+
+class StreamingZipExtractor:
+    """Incrementally parse a zip stream and extract entries under dest_dir.
+
+    Entries are read from their local file headers in stream order, so the
+    archive itself never touches the disk. Each entry is written to a
+    `.part` file and renamed into place once its CRC-32 checks out.
+    Entries may use a trailing data descriptor: deflated data ends itself,
+    and stored data ends at the first descriptor signature whose CRC and
+    sizes match the bytes before it.
+    """
+
+    def __init__(self, dest_dir: str, strip_prefix: Optional[str] = None):
+        self.dest_dir = os.path.abspath(dest_dir)
+        self.strip_prefix = strip_prefix.strip("/") + "/" if strip_prefix else None
+        self.extracted: List[str] = []
+        # Directories this extraction created, in creation order
+        self._created_dirs: List[str] = []
+        self._buffer = bytearray()
+        self._entry = None
+        self._finished = False
+
+    def feed(self, data: bytes) -> None:
+        """Consume the next chunk of the archive."""
+        if self._finished:
+            return
+        self._buffer += data
+        while self._step():
+            pass
+
+    def abort(self) -> None:
+        """Stop extracting and remove everything written so far."""
+        self._abort_entry()
+        self._finished = True
+        self._buffer.clear()
+        for path in self.extracted:
+            if os.path.exists(path):
+                os.remove(path)
+        self.extracted = []
+        # Remove the directories this extraction created, deepest first, if nothing else is in them
+        for path in sorted(self._created_dirs, key=len, reverse=True):
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+        self._created_dirs = []
+
+    def close(self) -> List[str]:
+        """Finish extraction and return the extracted file paths."""
+        if self._entry is not None or (self._buffer and not self._finished):
+            self._abort_entry()
+            raise UnsupportedZipStream("Archive stream ended in the middle of an entry")
+        return self.extracted
+
+    def _step(self) -> bool:
+        """Make as much progress as the buffer allows. Returns True to continue."""
+        if self._entry is None:
+            return self._read_header()
+        return self._read_data()
+
+    def _read_header(self) -> bool:
+        if len(self._buffer) < 4:
+            return False
+        signature = struct.unpack_from("<I", self._buffer)[0]
+        if signature in (CENTRAL_HEADER_SIG, END_OF_CENTRAL_DIR_SIG, ZIP64_END_SIG):
+            # Every entry has been extracted; the rest is the central directory
+            self._finished = True
+            self._buffer.clear()
+            return False
+        if signature != LOCAL_HEADER_SIG:
+            raise UnsupportedZipStream(f"Unexpected signature {signature:#x} in archive stream")
+        if len(self._buffer) < LOCAL_HEADER_SIZE:
+            return False
+
+        (_, _, flags, method, _, _, crc, compressed_size, size,
+         name_length, extra_length) = struct.unpack_from("<IHHHHHIIIHH", self._buffer)
+        header_length = LOCAL_HEADER_SIZE + name_length + extra_length
+        if len(self._buffer) < header_length:
+            return False
+
+        name = bytes(self._buffer[LOCAL_HEADER_SIZE:LOCAL_HEADER_SIZE + name_length]).decode("utf-8", "replace")
+        extra = bytes(self._buffer[LOCAL_HEADER_SIZE + name_length:header_length])
+        del self._buffer[:header_length]
+
+        if flags & FLAG_ENCRYPTED:
+            raise UnsupportedZipStream(f"Encrypted entry {name}")
+        if method not in (METHOD_STORED, METHOD_DEFLATED):
+            raise UnsupportedZipStream(f"Unsupported compression method {method} for {name}")
+
+        zip64 = compressed_size == 0xFFFFFFFF or size == 0xFFFFFFFF
+        # A zip64 extra field also means the data descriptor carries 64-bit sizes
+        zip64 = zip64 or self._has_zip64_extra(extra)
+        if zip64:
+            size, compressed_size = self._zip64_sizes(extra, size, compressed_size)
+
+        has_descriptor = bool(flags & FLAG_DATA_DESCRIPTOR)
+
+        target = self._target_path(name)
+        entry = {
+            "name": name,
+            "method": method,
+            "crc": crc,
+            "remaining": None if has_descriptor else compressed_size,
+            "descriptor": has_descriptor,
+            "zip64": zip64,
+            "target": target,
+            "file": None,
+            "crc_actual": 0,
+            "written": 0,
+            "decompressor": zlib.decompressobj(-15) if method == METHOD_DEFLATED else None
+        }
+        if target and not name.endswith("/"):
+            self._makedirs(os.path.dirname(target))
+            entry["file"] = open(target + ".part", "wb")
+        elif target:
+            self._makedirs(target)
+        self._entry = entry
+        return True
+
+    def _makedirs(self, path: str) -> None:
+        """Create a directory and its missing parents, remembering which ones did not exist."""
+        missing = []
+        while path and not os.path.isdir(path):
+            missing.append(path)
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        if missing:
+            os.makedirs(missing[0], exist_ok=True)
+            self._created_dirs.extend(reversed(missing))
+
+    @staticmethod
+    def _has_zip64_extra(extra: bytes) -> bool:
+        offset = 0
+        while offset + 4 <= len(extra):
+            header_id, length = struct.unpack_from("<HH", extra, offset)
+            if header_id == 0x0001:
+                return True
+            offset += 4 + length
+        return False
+
+    @staticmethod
+    def _zip64_sizes(extra: bytes, size: int, compressed_size: int):
+        """Read 64-bit sizes from the zip64 extended information extra field."""
+        offset = 0
+        while offset + 4 <= len(extra):
+            header_id, length = struct.unpack_from("<HH", extra, offset)
+            if header_id == 0x0001:
+                fields = extra[offset + 4:offset + 4 + length]
+                position = 0
+                if size == 0xFFFFFFFF and position + 8 <= len(fields):
+                    size = struct.unpack_from("<Q", fields, position)[0]
+                    position += 8
+                if compressed_size == 0xFFFFFFFF and position + 8 <= len(fields):
+                    compressed_size = struct.unpack_from("<Q", fields, position)[0]
+                break
+            offset += 4 + length
+        return size, compressed_size
+
+    def _target_path(self, name: str) -> Optional[str]:
+        """Map an entry name under dest_dir, refusing paths that escape it."""
+        name = name.replace("\\", "/")
+        if self.strip_prefix and name.startswith(self.strip_prefix):
+            name = name[len(self.strip_prefix):]
+        parts = [part for part in name.split("/") if part not in ("", ".")]
+        if not parts or ".." in parts or ":" in parts[0]:
+            return None
+        target = os.path.abspath(os.path.join(self.dest_dir, *parts))
+        if not target.startswith(self.dest_dir + os.sep):
+            return None
+        return target
+
+    def _read_data(self) -> bool:
+        entry = self._entry
+        if entry["remaining"] is not None:
+            # Known compressed size
+            if entry["remaining"] > 0:
+                if not self._buffer:
+                    return False
+                take = min(entry["remaining"], len(self._buffer))
+                self._write(entry, bytes(self._buffer[:take]))
+                del self._buffer[:take]
+                entry["remaining"] -= take
+                if entry["remaining"] > 0:
+                    return False
+            if entry["decompressor"] is not None:
+                self._emit(entry, entry["decompressor"].flush())
+            if entry["descriptor"] and not self._skip_descriptor(entry):
+                return False
+            self._finish_entry()
+            return True
+
+        decompressor = entry["decompressor"]
+        if decompressor is None:
+            return self._read_stored_until_descriptor(entry)
+
+        # Deflated entry with a trailing data descriptor: inflate until the stream ends
+        if not decompressor.eof:
+            if not self._buffer:
+                return False
+            chunk = bytes(self._buffer)
+            self._buffer.clear()
+            self._emit(entry, decompressor.decompress(chunk))
+            if not decompressor.eof:
+                return False
+            self._buffer[:0] = decompressor.unused_data
+        entry["remaining"] = 0
+        return True
+
+    def _read_stored_until_descriptor(self, entry) -> bool:
+        """
+        Copy a stored entry of unknown size up to its data descriptor.
+
+        The data may contain the descriptor signature by chance, so a
+        signature only ends the entry when the CRC-32 and sizes after it
+        match the bytes before it. Descriptors without a signature cannot
+        be told apart from data and are not supported for stored entries.
+        """
+        signature = struct.pack("<I", DATA_DESCRIPTOR_SIG)
+        position = 0
+        while True:
+            position = self._buffer.find(signature, position)
+            if position < 0:
+                # Keep a possible partial signature at the end for the next chunk
+                safe = max(len(self._buffer) - 3, 0)
+                self._emit(entry, bytes(self._buffer[:safe]))
+                del self._buffer[:safe]
+                return False
+            size = entry["written"] + position
+            size_length = 8 if entry["zip64"] or size > 0xFFFFFFFF else 4
+            length = 8 + 2 * size_length
+            if len(self._buffer) < position + length:
+                # Need the whole descriptor to check this candidate
+                self._emit(entry, bytes(self._buffer[:position]))
+                del self._buffer[:position]
+                return False
+            descriptor_crc, compressed_size, uncompressed_size = struct.unpack_from(
+                "<IQQ" if size_length == 8 else "<III", self._buffer, position + 4
+            )
+            if compressed_size != size or uncompressed_size != size \
+                    or descriptor_crc != zlib.crc32(bytes(self._buffer[:position]), entry["crc_actual"]):
+                position += 1
+                continue
+            self._emit(entry, bytes(self._buffer[:position]))
+            del self._buffer[:position + length]
+            entry["crc"] = descriptor_crc
+            entry["descriptor"] = False
+            self._finish_entry()
+            return True
+
+    def _skip_descriptor(self, entry) -> bool:
+        """Drop the data descriptor after an entry. Returns False if more bytes are needed."""
+        size_length = 8 if entry["zip64"] else 4
+        length = 4 + 2 * size_length
+        if len(self._buffer) >= 4 and struct.unpack_from("<I", self._buffer)[0] == DATA_DESCRIPTOR_SIG:
+            length += 4
+        if len(self._buffer) < length:
+            return False
+        descriptor_offset = length - (4 + 2 * size_length)
+        entry["crc"] = struct.unpack_from("<I", self._buffer, descriptor_offset)[0]
+        del self._buffer[:length]
+        entry["descriptor"] = False
+        return True
+
+    def _write(self, entry, data: bytes) -> None:
+        if entry["decompressor"] is not None:
+            data = entry["decompressor"].decompress(data)
+        self._emit(entry, data)
+
+    def _emit(self, entry, data: bytes) -> None:
+        if not data:
+            return
+        entry["crc_actual"] = zlib.crc32(data, entry["crc_actual"])
+        entry["written"] += len(data)
+        if entry["file"] is not None:
+            entry["file"].write(data)
+
+    def _finish_entry(self) -> None:
+        entry = self._entry
+        self._entry = None
+        if entry["file"] is None:
+            return
+        entry["file"].close()
+        if entry["crc_actual"] != entry["crc"]:
+            os.remove(entry["target"] + ".part")
+            raise UnsupportedZipStream(f"CRC mismatch for {entry['name']}")
+        os.replace(entry["target"] + ".part", entry["target"])
+        self.extracted.append(entry["target"])
+
+    def _abort_entry(self) -> None:
+        entry = self._entry
+        self._entry = None
+        if entry and entry["file"] is not None:
+            entry["file"].close()
+            if os.path.exists(entry["target"] + ".part"):
+                os.remove(entry["target"] + ".part")
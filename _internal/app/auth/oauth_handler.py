@@ -4,20 +4,42 @@ OAuth device flow authentication handler for Seedr.
 import os
 import time
 import json
+import threading
 import webbrowser
 from typing import Optional, Dict, Any
 import requests
 from ..config import SeedrConfig
 
 class OAuthHandler:
+    """Seedr device flow authentication and access token manager.
+
+    The token and its expiry are kept in memory after the first load.
+    `get_access_token()` refreshes a token that is about to expire, and
+    `start_auto_refresh()` does the same ahead of time on a background
+    thread. Refreshes are single-flight: concurrent callers wait for the
+    refresh in progress instead of spending the rotated refresh token twice.
+    """
+
+    # Refresh this many seconds before the access token expires
+    REFRESH_MARGIN = 300
+    # Wait this long before retrying a failed background refresh
+    RETRY_DELAY = 60
+
     def __init__(self, config: SeedrConfig):
         self.config = config
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
+        self.expires_at: Optional[float] = None
         self.token_file = os.path.join(os.path.dirname(__file__), "..", "..", "config", "seedr_token.json")
+        self._loaded = False
+        self._refresh_lock = threading.RLock()
+        self._token_changed = threading.Event()
+        self._stop_refresher = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
 
     def load_token(self) -> bool:
         """Load saved token from file if it exists."""
+        self._loaded = True
         try:
             if os.path.exists(self.token_file):
                 with open(self.token_file, 'r') as f:
@@ -25,10 +47,13 @@ class OAuthHandler:
                     if token_data.get('expires_at', 0) > time.time():
                         self.access_token = token_data['access_token']
                         self.refresh_token = token_data.get('refresh_token')
+                        self.expires_at = token_data.get('expires_at')
+                        self._token_changed.set()
                         return True
                     elif token_data.get('refresh_token'):
                         # Try to refresh the token if it's expired
-                        new_token = self.refresh_access_token(token_data['refresh_token'])
+                        self.refresh_token = token_data['refresh_token']
+                        new_token = self.refresh_access_token(self.refresh_token)
                         if new_token:
                             return True
         except Exception as e:
@@ -44,38 +69,109 @@ class OAuthHandler:
         except Exception as e:
             print(f"Error saving token: {e}")
 
+    def _store_token(self, data: Dict[str, Any]) -> None:
+        """Keep a token response in memory and persist it."""
+        self.access_token = data["access_token"]
+        # Update refresh token if a new one is provided
+        if "refresh_token" in data:
+            self.refresh_token = data["refresh_token"]
+        self.expires_at = time.time() + data.get("expires_in", 3600)
+
+        # Save the new tokens
+        self.save_token({
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "expires_at": self.expires_at
+        })
+        self._token_changed.set()
+
     def refresh_access_token(self, refresh_token: str) -> Optional[str]:
         """Refresh the access token using a refresh token."""
-        try:
-            response = requests.post(
-                f"{self.config.api_base_url}/api/v0.1/p/oauth/token",
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": refresh_token,
-                    "client_id": self.config.client_id
-                }
-            )
-            data = response.json()
-
-            if "access_token" in data:
-                self.access_token = data["access_token"]
-                # Update refresh token if a new one is provided
-                if "refresh_token" in data:
-                    self.refresh_token = data["refresh_token"]
-                
-                # Save the new tokens
-                self.save_token({
-                    "access_token": self.access_token,
-                    "refresh_token": self.refresh_token,
-                    "expires_at": time.time() + data.get("expires_in", 3600)
-                })
+        with self._refresh_lock:
+            try:
+                response = requests.post(
+                    f"{self.config.api_base_url}/api/v0.1/p/oauth/token",
+                    data={
+                        "grant_type": "refresh_token",
+                        "refresh_token": refresh_token,
+                        "client_id": self.config.client_id
+                    },
+                    timeout=30
+                )
+                data = response.json()
+
+                if "access_token" in data:
+                    self._store_token(data)
+                    return self.access_token
+                else:
+                    print(f"Failed to refresh token: {data.get('error', 'Unknown error')}")
+                    return None
+            except Exception as e:
+                print(f"Error refreshing token: {e}")
+                return None
+
+    def _expires_within(self, seconds: float) -> bool:
+        """Check whether the in-memory token expires within the given number of seconds."""
+        return self.expires_at is not None and self.expires_at - time.time() <= seconds
+
+    def _refresh_if_expiring(self) -> Optional[str]:
+        """Refresh the token if it is close to expiry, at most once across threads."""
+        with self._refresh_lock:
+            # Another thread may have refreshed while this one waited for the lock
+            if self.refresh_token and self._expires_within(self.REFRESH_MARGIN):
+                self.refresh_access_token(self.refresh_token)
+            if self._expires_within(0):
+                return None
+            return self.access_token
+
+    def refresh_after_unauthorized(self, rejected_token: Optional[str]) -> Optional[str]:
+        """
+        Get a new access token after the API rejected one.
+
+        If another thread already replaced the rejected token, the current
+        one is returned without refreshing again.
+
+        Args:
+            rejected_token: The access token the API answered 401 to
+
+        Returns:
+            Optional[str]: A different access token to retry with, or None
+        """
+        with self._refresh_lock:
+            if self.access_token and self.access_token != rejected_token:
                 return self.access_token
-            else:
-                print(f"Failed to refresh token: {data.get('error', 'Unknown error')}")
+            if not self.refresh_token:
                 return None
-        except Exception as e:
-            print(f"Error refreshing token: {e}")
-            return None
+            return self.refresh_access_token(self.refresh_token)
+
+    def start_auto_refresh(self) -> None:
+        """Start refreshing the token in the background ahead of its expiry."""
+        if self._refresher and self._refresher.is_alive():
+            return
+        self._stop_refresher.clear()
+        self._refresher = threading.Thread(target=self._auto_refresh, name="token-refresh", daemon=True)
+        self._refresher.start()
+
+    def stop_auto_refresh(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop_refresher.set()
+        self._token_changed.set()
+        if self._refresher:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _auto_refresh(self) -> None:
+        while not self._stop_refresher.is_set():
+            self._token_changed.clear()
+            delay = None  # Without a refreshable token, sleep until one arrives
+            if self.access_token and self.refresh_token and self.expires_at:
+                delay = self.expires_at - self.REFRESH_MARGIN - time.time()
+                if delay <= 0:
+                    self._refresh_if_expiring()
+                    if not self._expires_within(self.REFRESH_MARGIN):
+                        continue
+                    delay = self.RETRY_DELAY
+            self._token_changed.wait(delay)
 
     def start_device_flow(self) -> Dict[str, str]:
         """Start the OAuth2 device flow."""
@@ -160,16 +256,11 @@ class OAuthHandler:
                 data = response.json()
 
                 if "access_token" in data:
-                    self.access_token = data["access_token"]
                     # Store refresh token if provided
                     self.refresh_token = data.get("refresh_token")
                     
                     # Save token with expiration and refresh token
-                    self.save_token({
-                        "access_token": self.access_token,
-                        "refresh_token": self.refresh_token,
-                        "expires_at": time.time() + data.get("expires_in", 3600)
-                    })
+                    self._store_token(data)
                     return self.access_token
                 elif data.get("error") == "authorization_pending":
                     time.sleep(interval)
@@ -230,15 +321,28 @@ class OAuthHandler:
         return False
 
     def get_access_token(self) -> Optional[str]:
-        """Get the current access token or None if not authenticated."""
-        if not self.access_token and not self.load_token():
+        """Get a valid access token, refreshing it if it is about to expire, or None if not authenticated."""
+        if not self.access_token and not self._loaded:
+            self.load_token()
+        if not self.access_token:
             return None
+        if self._expires_within(self.REFRESH_MARGIN):
+            return self._refresh_if_expiring()
         return self.access_token
 
+    def is_authenticated(self) -> bool:
+        """Check the in-memory token without touching disk or the network."""
+        if self.access_token is None:
+            return False
+        return self.refresh_token is not None or not self._expires_within(0)
+
     def clear_token(self) -> None:
         """Clear the authentication token."""
-        self.access_token = None
-        self.refresh_token = None
+        with self._refresh_lock:
+            self.access_token = None
+            self.refresh_token = None
+            self.expires_at = None
+            self._token_changed.set()
         if os.path.exists(self.token_file):
             try:
                 os.remove(self.token_file)
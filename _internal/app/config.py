@@ -3,7 +3,7 @@ Configuration management for Sonarr-Seedr integration.
 """
 import os
 import json
-from typing import Optional
+from typing import Optional, List
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
@@ -20,6 +20,14 @@ class SeedrConfig(BaseModel):
         default="https://v2.seedr.cc",
         description="Seedr API base URL"
     )
+    rate_limit: float = Field(
+        default=5.0,
+        description="Seedr API requests per second shared by all clients; 0 disables the limiter"
+    )
+    rate_burst: float = Field(
+        default=10.0,
+        description="Request tokens that can be spent at once after an idle period"
+    )
     
     def __init__(self, **data):
         super().__init__(**data)
@@ -37,6 +45,30 @@ class SonarrConfig(BaseModel):
         default="",
         description="Sonarr API key"
     )
+    page_size: int = Field(
+        default=250,
+        description="Records per page when fetching wanted/missing episodes"
+    )
+    page_concurrency: int = Field(
+        default=4,
+        description="Pages of wanted/missing episodes fetched at the same time"
+    )
+    cache_ttl: float = Field(
+        default=60.0,
+        description="Seconds cached Sonarr data is served before it is refreshed"
+    )
+    full_refresh_interval: float = Field(
+        default=3600.0,
+        description="Seconds between complete reloads of the wanted/missing list; refreshes in between are incremental"
+    )
+    series_refresh_interval: float = Field(
+        default=900.0,
+        description="Seconds between reloads of the cached series catalogue"
+    )
+    scan_window: float = Field(
+        default=2.0,
+        description="Seconds to collect download scan requests before sending one scan per path to Sonarr"
+    )
 
 class DownloadConfig(BaseModel):
     """Download configuration settings."""
@@ -48,12 +80,132 @@ class DownloadConfig(BaseModel):
         default="",
         description="Sonarr root folder for media"
     )
+    segments: int = Field(
+        default=4,
+        description="Maximum parallel Range connections per downloaded file"
+    )
+    min_segment_size: int = Field(
+        default=16 * 1024 * 1024,
+        description="Smallest segment in bytes; smaller files use fewer connections"
+    )
+    chunk_size: int = Field(
+        default=1024 * 1024,
+        description="Read size in bytes for streamed download bodies"
+    )
+    checkpoint_size: int = Field(
+        default=8 * 1024 * 1024,
+        description="Bytes written per segment between resume checkpoints"
+    )
+    transfer_workers: int = Field(
+        default=4,
+        description="Files transferred from Seedr at the same time"
+    )
+    per_title_transfers: int = Field(
+        default=2,
+        description="Files of a single title transferred at the same time"
+    )
+    stream_extract_dirs: List[str] = Field(
+        default_factory=list,
+        description="Download directories where folder archives are extracted while downloading instead of saved as .zip"
+    )
+    max_torrent_size: int = Field(
+        default=0,
+        description="Largest torrent in bytes accepted from the watch folder; 0 for no limit"
+    )
+    status_interval: float = Field(
+        default=10.0,
+        description="Seconds between background refreshes of download status and account info"
+    )
+
+class HttpConfig(BaseModel):
+    """Shared HTTP connection pool settings."""
+    pool_connections: int = Field(
+        default=10,
+        description="Number of per-host connection pools to keep"
+    )
+    pool_maxsize: int = Field(
+        default=20,
+        description="Maximum keep-alive connections per host"
+    )
+    pool_block: bool = Field(
+        default=False,
+        description="Block when a host's pool is exhausted instead of opening extra connections"
+    )
+    retry_attempts: int = Field(
+        default=3,
+        description="Attempts for idempotent Seedr and Sonarr requests that fail to connect or get a 5xx"
+    )
+    retry_base_delay: float = Field(
+        default=0.5,
+        description="Seconds before the first retry; doubled for each further attempt, with jitter"
+    )
+    circuit_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive failures that open an upstream's circuit"
+    )
+    circuit_reset_timeout: float = Field(
+        default=30.0,
+        description="Seconds an open circuit refuses calls before letting a probe through"
+    )
+
+class WatcherConfig(BaseModel):
+    """Folder watcher ingestion settings."""
+    settle_time: float = Field(
+        default=2.0,
+        description="Seconds a watched file's size and mtime must stay unchanged before it is submitted"
+    )
+    workers: int = Field(
+        default=4,
+        description="Number of worker threads submitting watched files to Seedr"
+    )
+    queue_size: int = Field(
+        default=1000,
+        description="Maximum number of settled files waiting for a worker"
+    )
+    max_attempts: int = Field(
+        default=3,
+        description="Attempts per file before it is moved to the error directory"
+    )
+    retry_delay: float = Field(
+        default=5.0,
+        description="Base delay in seconds before retrying a failed file; doubles per attempt, with jitter"
+    )
+    backend: str = Field(
+        default="native",
+        description="'native' for filesystem events, 'polling' for SMB/NFS shares that do not deliver events"
+    )
+    poll_interval: float = Field(
+        default=5.0,
+        description="Seconds between directory scans with the polling backend"
+    )
+
+class LogConfig(BaseModel):
+    """Watcher log file rotation and in-memory buffer settings."""
+    max_bytes: int = Field(
+        default=10 * 1024 * 1024,
+        description="Rotate the log file once it reaches this size in bytes"
+    )
+    backup_count: int = Field(
+        default=5,
+        description="Number of compressed rotated log files to keep"
+    )
+    rotate_interval: float = Field(
+        default=24 * 3600,
+        description="Rotate the log file after this many seconds regardless of size; 0 disables"
+    )
+    buffer_lines: int = Field(
+        default=1000,
+        description="Number of recent log lines kept in memory for the log endpoints"
+    )
 
 class Config(BaseModel):
     """Main configuration model."""
     seedr: SeedrConfig
     sonarr: SonarrConfig
     download: DownloadConfig
+    http: HttpConfig = Field(default_factory=HttpConfig)
+    log: LogConfig = Field(default_factory=LogConfig)
+    watcher: WatcherConfig = Field(default_factory=WatcherConfig)
 
     @classmethod
     def from_env(cls) -> 'Config':
@@ -61,15 +213,54 @@ class Config(BaseModel):
         return cls(
             seedr=SeedrConfig(
                 client_id=os.getenv("SEEDR_CLIENT_ID", "EKp43IJEBXiGjaRg6cd7F17R3z3zv6VL"),
-                api_base_url=os.getenv("SEEDR_API_BASE_URL", "https://v2.seedr.cc")
+                api_base_url=os.getenv("SEEDR_API_BASE_URL", "https://v2.seedr.cc"),
+                rate_limit=os.getenv("SEEDR_RATE_LIMIT", 5.0),
+                rate_burst=os.getenv("SEEDR_RATE_BURST", 10.0)
             ),
             sonarr=SonarrConfig(
                 host=os.getenv("SONARR_HOST", "http://localhost:8989"),
-                api_key=os.getenv("SONARR_API_KEY", "")
+                api_key=os.getenv("SONARR_API_KEY", ""),
+                page_size=os.getenv("SONARR_PAGE_SIZE", 250),
+                page_concurrency=os.getenv("SONARR_PAGE_CONCURRENCY", 4),
+                cache_ttl=os.getenv("SONARR_CACHE_TTL", 60.0),
+                full_refresh_interval=os.getenv("SONARR_FULL_REFRESH_INTERVAL", 3600.0),
+                series_refresh_interval=os.getenv("SONARR_SERIES_REFRESH_INTERVAL", 900.0),
+                scan_window=os.getenv("SONARR_SCAN_WINDOW", 2.0)
             ),
             download=DownloadConfig(
                 download_dir=os.getenv("DOWNLOAD_DIR", ""),
-                root_folder=os.getenv("ROOT_FOLDER", "")
+                root_folder=os.getenv("ROOT_FOLDER", ""),
+                segments=os.getenv("DOWNLOAD_SEGMENTS", 4),
+                min_segment_size=os.getenv("DOWNLOAD_MIN_SEGMENT_SIZE", 16 * 1024 * 1024),
+                transfer_workers=os.getenv("TRANSFER_WORKERS", 4),
+                per_title_transfers=os.getenv("PER_TITLE_TRANSFERS", 2),
+                stream_extract_dirs=[d for d in os.getenv("STREAM_EXTRACT_DIRS", "").split(os.pathsep) if d],
+                max_torrent_size=os.getenv("MAX_TORRENT_SIZE", 0),
+                status_interval=os.getenv("STATUS_INTERVAL", 10.0)
+            ),
+            http=HttpConfig(
+                pool_connections=os.getenv("HTTP_POOL_CONNECTIONS", 10),
+                pool_maxsize=os.getenv("HTTP_POOL_MAXSIZE", 20),
+                pool_block=os.getenv("HTTP_POOL_BLOCK", "false").lower() in ("1", "true", "yes"),
+                retry_attempts=os.getenv("HTTP_RETRY_ATTEMPTS", 3),
+                retry_base_delay=os.getenv("HTTP_RETRY_BASE_DELAY", 0.5),
+                circuit_failure_threshold=os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5),
+                circuit_reset_timeout=os.getenv("CIRCUIT_RESET_TIMEOUT", 30.0)
+            ),
+            log=LogConfig(
+                max_bytes=os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024),
+                backup_count=os.getenv("LOG_BACKUP_COUNT", 5),
+                rotate_interval=os.getenv("LOG_ROTATE_INTERVAL", 24 * 3600),
+                buffer_lines=os.getenv("LOG_BUFFER_LINES", 1000)
+            ),
+            watcher=WatcherConfig(
+                settle_time=os.getenv("WATCH_SETTLE_TIME", 2.0),
+                workers=os.getenv("WATCH_WORKERS", 4),
+                queue_size=os.getenv("WATCH_QUEUE_SIZE", 1000),
+                max_attempts=os.getenv("WATCH_MAX_ATTEMPTS", 3),
+                retry_delay=os.getenv("WATCH_RETRY_DELAY", 5.0),
+                backend=os.getenv("WATCH_BACKEND", "native").lower(),
+                poll_interval=os.getenv("WATCH_POLL_INTERVAL", 5.0)
             )
         )
 
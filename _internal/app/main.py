@@ -3,17 +3,13 @@ FastAPI application for Sonarr-Seedr integration.
 """
 import os
 import json
-import threading
 import logging
 from typing import Dict, Any, List, Optional
-import shutil
 import time
 from pathlib import Path
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 
-from fastapi import FastAPI, HTTPException, Depends, Query, BackgroundTasks, Request, Form
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi import FastAPI, HTTPException, Depends, Query, BackgroundTasks, Request, Form, Response
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.security import OAuth2PasswordBearer
@@ -24,17 +20,31 @@ import uvicorn
 from .config import Config
 from .auth.oauth_handler import OAuthHandler
 from .service.seedr_sonarr_integration import SeedrSonarrIntegration
-from .api.seedr_client import SeedrClient
-from .api.sonarr_client import SonarrClient
-from .utils.torrent_watcher import watch_folder
-
-# Configure logging
+from .service.async_integration import AsyncSeedrSonarrIntegration
+from .service.status_snapshot import StatusSnapshotService, StatusSnapshot
+from .service.event_bus import format_sse
+from .service.container import ServiceContainer, get_services
+from .service.series_catalog import COMPACT_FIELDS
+from .api.resilience import UpstreamUnavailableError, get_circuit_states
+from .utils.torrent_watcher import TorrentWatcher, watch_folder
+from .utils.log_files import CompressingRotatingFileHandler, LogRingBuffer
+
+app_config = Config.from_env()
+
+# Configure logging: rotate and compress the watcher log and keep recent lines in memory
+log_buffer = LogRingBuffer(app_config.log.buffer_lines)
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'folder_watcher.log'))
+        CompressingRotatingFileHandler(
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), 'folder_watcher.log'),
+            max_bytes=app_config.log.max_bytes,
+            backup_count=app_config.log.backup_count,
+            interval=app_config.log.rotate_interval
+        ),
+        log_buffer
     ]
 )
 logger = logging.getLogger("sonarr_seedr")
@@ -55,6 +65,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(UpstreamUnavailableError)
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailableError):
+    """Report an unreachable Seedr or Sonarr as 503 rather than as a missing resource."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "30"})
+
 # Initialize templates
 templates = Jinja2Templates(directory=os.path.join(os.path.dirname(__file__), "web", "templates"))
 
@@ -64,13 +80,21 @@ app.mount("/static", StaticFiles(directory=os.path.join(os.path.dirname(__file__
 # OAuth2 password bearer for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
+# Application-scoped services, handed to request handlers through get_services
+services = ServiceContainer(app_config, os.path.dirname(os.path.dirname(__file__)), log_buffer)
+app.state.services = services
+
 # Global variables
-config = Config.from_env()
-# Use non-strict validation for portable deployment - allows startup without full config
-integration = SeedrSonarrIntegration(config, strict_validation=False)
-seedr_client = SeedrClient(config.seedr)
-sonarr_client = SonarrClient(config.sonarr)
-watcher_thread = None
+config = services.config
+integration = services.integration
+seedr_client = services.seedr_client
+sonarr_client = services.sonarr_client
+async_integration = services.async_integration
+async_seedr_client = services.async_seedr_client
+async_sonarr_client = services.async_sonarr_client
+event_bus = services.event_bus
+status_snapshot = services.status_snapshot
+watcher_manager = services.watcher
 
 # Import web routes
 from app.web import routes as web_routes
@@ -82,6 +106,8 @@ app.include_router(web_routes.router)
 @app.on_event("startup")
 async def startup_event():
     """Auto-start the watcher on application startup if enabled in config."""
+    services.start()
+    
     print("\n" + "="*80)
     print("TORRENT WATCHER AUTO-START INITIALIZATION")
     print("="*80)
@@ -124,12 +150,8 @@ async def startup_event():
             print(f"+ Created new minimal configuration file without directories: {watcher_config_file}")
             logger.info(f"Created minimal config without directories: {settings}")
             
-            # Create config directory if needed
-            os.makedirs(config_dir, exist_ok=True)
-            
             # Save minimal config
-            with open(watcher_config_file, "w") as f:
-                json.dump(settings, f, indent=4)
+            services.save_watcher_settings(settings)
         
         # User preference for auto-start 
         auto_start = settings.get("auto_start", True)
@@ -172,54 +194,14 @@ async def startup_event():
             
         print("\n[STEP 3] Starting torrent watcher service...")
         
-        # Initialize and start watcher in a separate thread
-        def start_watcher_thread():
-            global watcher_thread
-            
-            # Don't start if already running
-            if watcher_thread and watcher_thread.is_alive():
-                print("! Watcher is already running, not starting a new instance")
-                logger.info("Watcher already running, not starting a new instance")
-                return
-                
-            try:
-                # Create event handler and observer
-                event_handler = TorrentWatcher(config, integration, download_dir)
-                observer = Observer()
-                
-                # Schedule directory to watch
-                observer.schedule(event_handler, torrent_dir, recursive=False)
-                observer.start()
-                
-                print(f"✓ Now watching directory for torrent files: {torrent_dir}")
-                logger.info(f"Started watching {torrent_dir} for torrent files")
-                
-                # Store the observer in the thread
-                def watcher_task(observer):
-                    try:
-                        while True:
-                            time.sleep(1)
-                    except Exception as e:
-                        print(f"\n❌ ERROR IN WATCHER THREAD: {str(e)}")
-                        logger.exception(f"Error in watcher thread: {str(e)}")
-                    finally:
-                        observer.stop()
-                        observer.join()
-                        print("! Torrent watcher stopped")
-                        logger.info("Stopped watching for torrent files")
-                
-                watcher_thread = threading.Thread(target=watcher_task, args=(observer,))
-                watcher_thread.daemon = True
-                watcher_thread.start()
-                
-                print("✓ Watcher thread started successfully")
-                logger.info("Watcher thread started successfully")
-            except Exception as e:
-                print(f"\n❌ ERROR STARTING WATCHER: {str(e)}")
-                logger.exception(f"Error starting watcher: {str(e)}")
+        result = watcher_manager.start(torrent_dir, download_dir)
+        if not result["success"]:
+            print(f"! {result['message']}")
+            logger.info(f"Watcher not started - {result['message']}")
+            return
         
-        # Start the watcher thread
-        start_watcher_thread()
+        print(f"✓ Now watching directory for torrent files: {torrent_dir}")
+        logger.info(f"Started watching {torrent_dir} for torrent files")
         
         print("\n✅ TORRENT WATCHER STARTED SUCCESSFULLY")
         print("-"*80 + "\n")
@@ -230,6 +212,12 @@ async def startup_event():
         print("\nSee log file for detailed error information")
         print("-"*80 + "\n")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background services."""
+    services.stop()
+
+
 # Pydantic models for request/response
 class DownloadRequest(BaseModel):
     """Request model for adding a download."""
@@ -252,6 +240,11 @@ class StatusResponse(BaseModel):
     message: Optional[str] = Field(None, description="Status message")
 
 
+class MatchRequest(BaseModel):
+    """Request model for matching release names to series."""
+    names: List[str] = Field(..., description="Release, file or folder names")
+
+
 class GenericResponse(BaseModel):
     """Generic response model."""
     success: bool = Field(..., description="Whether the operation was successful")
@@ -279,8 +272,7 @@ async def auth_middleware(request: Request, call_next):
         request.url.path == "/config" or 
         request.url.path == "/torrents" or 
         request.url.path == "/folder-watcher"):
-        is_authenticated = seedr_client.auth.get_access_token() is not None
-        if not is_authenticated:
+        if not request.app.state.services.is_authenticated():
             return RedirectResponse(url="/reauth", status_code=303)
     
     # Continue with the request
@@ -288,98 +280,34 @@ async def auth_middleware(request: Request, call_next):
 
 
 # Dependency to get the current config
-def get_config():
+def get_config(services: ServiceContainer = Depends(get_services)):
     """Get the current configuration."""
-    return config
+    return services.config
 
 
 # Dependency to get the integration service
-def get_integration():
+def get_integration(services: ServiceContainer = Depends(get_services)):
     """Get the integration service."""
-    return integration
+    return services.integration
 
 
-# Torrent Watcher class for file system events
-class TorrentWatcher(FileSystemEventHandler):
-    """Handles torrent file events for auto-uploading to Seedr."""
-    
-    def __init__(self, config, integration, download_dir=None):
-        """Initialize the watcher with config and dirs."""
-        self.config = config
-        self.integration = integration
-        
-        # Set up directories
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        self.download_dir = download_dir or os.path.join(base_dir, 'completed')
-        self.processed_dir = os.path.join(base_dir, 'processed')
-        self.error_dir = os.path.join(base_dir, 'error')
-        
-        # Create directories
-        os.makedirs(self.download_dir, exist_ok=True)
-        os.makedirs(self.processed_dir, exist_ok=True)
-        os.makedirs(self.error_dir, exist_ok=True)
-        
-        # Set up logging
-        self.logger = logger
-        self.logger.info(f"TorrentWatcher initialized. Watching for .torrent files")
-        self.logger.info(f"Downloads will be saved to: {self.download_dir}")
-    
-    def on_created(self, event):
-        """Handle file creation events."""
-        if not event.is_directory and self._is_torrent_file(event.src_path):
-            self.logger.info(f"New torrent file detected: {event.src_path}")
-            self._process_torrent_file(event.src_path)
-    
-    def on_modified(self, event):
-        """Handle file modification events."""
-        if not event.is_directory and self._is_torrent_file(event.src_path):
-            self.logger.info(f"Modified torrent file detected: {event.src_path}")
-            self._process_torrent_file(event.src_path)
-    
-    def _is_torrent_file(self, file_path):
-        """Check if file is a torrent file."""
-        _, ext = os.path.splitext(file_path)
-        return ext.lower() in ['.torrent', '.magnet']
-    
-    def _process_torrent_file(self, file_path):
-        """Process a torrent file by adding it to Seedr."""
-        file_name = os.path.basename(file_path)
-        try:
-            self.logger.info(f"Processing file: {file_path}")
-            
-            # Read file content - handle both magnet links and torrent files
-            if file_path.endswith('.magnet'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    magnet_link = f.read().strip()
-                
-                # Add to Seedr
-                result = self.integration.add_download(file_name, magnet_link)
-            else:
-                # For .torrent files, use the file upload API
-                result = self.integration.add_torrent_file(file_path)
-            
-            if result.get("success", False):
-                self.logger.info(f"Successfully added {file_name} to Seedr")
-                # Move to processed folder
-                processed_path = os.path.join(self.processed_dir, file_name)
-                shutil.copy2(file_path, processed_path)
-                self.logger.info(f"Moved {file_name} to processed directory")
-            else:
-                self.logger.error(f"Failed to add {file_name} to Seedr: {result.get('message', 'Unknown error')}")
-                # Move to error folder
-                error_path = os.path.join(self.error_dir, file_name)
-                shutil.copy2(file_path, error_path)
-                self.logger.error(f"Moved {file_name} to error directory")
-                
-        except Exception as e:
-            self.logger.exception(f"Error processing {file_name}: {str(e)}")
-            try:
-                # Move to error folder
-                error_path = os.path.join(self.error_dir, file_name)
-                shutil.copy2(file_path, error_path)
-                self.logger.error(f"Moved {file_name} to error directory")
-            except Exception:
-                self.logger.exception(f"Failed to move {file_name} to error directory")
+# Dependency to get the async integration service
+def get_async_integration(services: ServiceContainer = Depends(get_services)):
+    """Get the awaitable integration service."""
+    return services.async_integration
+
+
+# Dependency to get the status snapshot service
+def get_status_snapshot(services: ServiceContainer = Depends(get_services)):
+    """Get the background status snapshot service."""
+    return services.status_snapshot
+
+
+# The watcher manager builds one handler per start
+watcher_manager.handler_factory = lambda download_dir: TorrentWatcher(
+    config, integration, download_dir, ledger=services.ingestion_ledger, event_bus=event_bus,
+    account_info=lambda: status_snapshot.get().account_info
+)
 
 
 # Routes
@@ -410,40 +338,113 @@ async def get_config_api(config: Config = Depends(get_config)):
 @app.post("/api/downloads", response_model=DownloadResponse)
 async def add_download(
     request: DownloadRequest,
-    integration: SeedrSonarrIntegration = Depends(get_integration)
+    integration: AsyncSeedrSonarrIntegration = Depends(get_async_integration),
+    snapshot: StatusSnapshotService = Depends(get_status_snapshot)
 ):
     """
     Add a new download to Seedr.
     
     This endpoint accepts a torrent URL or magnet link and adds it to Seedr.
     """
-    result = integration.add_download(request.title, request.download_url, request.series_id)
+    result = await integration.add_download(request.title, request.download_url, request.series_id)
     if not result.get("success", False):
         raise HTTPException(status_code=400, detail=result.get("message", "Failed to add download"))
+    snapshot.request_refresh()
     return result
 
 
+def _set_snapshot_headers(response: Response, snapshot: StatusSnapshot) -> None:
+    """Attach the snapshot age so clients can tell how fresh the data is."""
+    if snapshot.age is not None:
+        response.headers["X-Snapshot-Age"] = f"{snapshot.age:.3f}"
+    if snapshot.error:
+        response.headers["X-Snapshot-Error"] = "true"
+    if snapshot.unavailable:
+        response.headers["X-Upstream-Unavailable"] = "seedr"
+
+
 @app.get("/api/downloads", response_model=List[Dict[str, Any]])
-async def get_downloads(integration: SeedrSonarrIntegration = Depends(get_integration)):
+async def get_downloads(response: Response, snapshot: StatusSnapshotService = Depends(get_status_snapshot)):
     """
     Get all current downloads.
     
-    Returns a list of all downloads being tracked by the integration.
+    Returns the downloads from the latest status snapshot; its age in
+    seconds is in the X-Snapshot-Age header.
+    """
+    current = snapshot.get()
+    _set_snapshot_headers(response, current)
+    return current.downloads
+
+
+@app.get("/api/status/snapshot", response_model=Dict[str, Any])
+async def get_status_snapshot_api(snapshot: StatusSnapshotService = Depends(get_status_snapshot)):
+    """
+    Get the latest status snapshot.
+    
+    This endpoint returns downloads, account info and the snapshot age together.
     """
-    return integration.poll_downloads()
+    return snapshot.get().to_dict()
+
+
+@app.get("/api/events")
+async def stream_events(request: Request, services: ServiceContainer = Depends(get_services)):
+    """
+    Stream status changes as Server-Sent Events.
+    
+    On connect the client receives the full download list, account info,
+    auth and watcher state; after that only changes are sent: `download`,
+    `download_removed`, `account`, `auth`, `watcher_status` and `watcher`.
+    """
+    event_bus = services.event_bus
+    subscription = event_bus.subscribe()
+    
+    async def full_state():
+        current = services.status_snapshot.get()
+        yield format_sse("downloads", {"downloads": current.downloads, "age": current.age})
+        yield format_sse("account", current.account_info)
+    
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            async for message in full_state():
+                yield message
+            yield format_sse("auth", {"authenticated": services.is_authenticated()})
+            yield format_sse("watcher_status", {"running": watcher_manager.is_running})
+            
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=15)
+                if subscription.overflowed:
+                    # Changes were dropped while the client lagged; resend everything
+                    subscription.overflowed = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    async for message in full_state():
+                        yield message
+                elif event is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield format_sse(event["event"], event["data"])
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.get("/api/downloads/{title}/status", response_model=StatusResponse)
 async def get_download_status(
     title: str,
-    integration: SeedrSonarrIntegration = Depends(get_integration)
+    integration: AsyncSeedrSonarrIntegration = Depends(get_async_integration)
 ):
     """
     Get the status of a download.
     
     This endpoint returns the current status of a download.
     """
-    result = integration.check_download_status(title)
+    result = await integration.check_download_status(title)
     if result.get("status") == "unknown":
         raise HTTPException(status_code=404, detail=f"Download '{title}' not found")
     return result
@@ -452,14 +453,14 @@ async def get_download_status(
 @app.get("/api/downloads/{title}/files", response_model=Dict[str, Any])
 async def get_download_files(
     title: str,
-    integration: SeedrSonarrIntegration = Depends(get_integration)
+    integration: AsyncSeedrSonarrIntegration = Depends(get_async_integration)
 ):
     """
     Get the files for a completed download.
     
     This endpoint returns the files for a completed download.
     """
-    result = integration.get_downloaded_files(title)
+    result = await integration.get_downloaded_files(title)
     if not result.get("success", False):
         raise HTTPException(status_code=404, detail=result.get("message", f"Files for '{title}' not found"))
     return result
@@ -469,14 +470,15 @@ async def get_download_files(
 async def download_files(
     title: str,
     save_path: Optional[str] = None,
-    integration: SeedrSonarrIntegration = Depends(get_integration)
+    integration: AsyncSeedrSonarrIntegration = Depends(get_async_integration)
 ):
     """
     Download files for a completed download.
     
-    This endpoint downloads the files for a completed download.
+    This endpoint queues the files of a completed download and returns
+    without waiting for them; progress is shown under /api/transfers/stats.
     """
-    result = integration.download_completed_files(title, save_path)
+    result = await integration.download_completed_files(title, save_path)
     if not result.get("success", False):
         raise HTTPException(status_code=400, detail=result.get("message", f"Failed to download files for '{title}'"))
     return result
@@ -485,14 +487,15 @@ async def download_files(
 @app.post("/api/downloads/{title}/notify-sonarr", response_model=Dict[str, Any])
 async def notify_sonarr(
     title: str,
-    integration: SeedrSonarrIntegration = Depends(get_integration)
+    integration: AsyncSeedrSonarrIntegration = Depends(get_async_integration)
 ):
     """
     Notify Sonarr of completed download.
     
-    This endpoint downloads the files and notifies Sonarr of the completed download.
+    This endpoint queues the files of the download and has Sonarr scan them
+    once they have all arrived.
     """
-    result = integration.notify_sonarr(title)
+    result = await integration.notify_sonarr(title)
     if not result.get("success", False):
         raise HTTPException(status_code=400, detail=result.get("message", f"Failed to notify Sonarr for '{title}'"))
     return result
@@ -501,75 +504,83 @@ async def notify_sonarr(
 @app.post("/api/downloads/{title}/pause", response_model=GenericResponse)
 async def pause_download(
     title: str,
-    integration: SeedrSonarrIntegration = Depends(get_integration)
+    integration: AsyncSeedrSonarrIntegration = Depends(get_async_integration),
+    snapshot: StatusSnapshotService = Depends(get_status_snapshot)
 ):
     """
     Pause a download.
     
     This endpoint pauses a download in progress.
     """
-    result = integration.pause_download(title)
+    result = await integration.pause_download(title)
     if not result.get("success", False):
         raise HTTPException(status_code=400, detail=result.get("message", f"Failed to pause download '{title}'"))
+    snapshot.request_refresh()
     return result
 
 
 @app.post("/api/downloads/{title}/resume", response_model=GenericResponse)
 async def resume_download(
     title: str,
-    integration: SeedrSonarrIntegration = Depends(get_integration)
+    integration: AsyncSeedrSonarrIntegration = Depends(get_async_integration),
+    snapshot: StatusSnapshotService = Depends(get_status_snapshot)
 ):
     """
     Resume a paused download.
     
     This endpoint resumes a paused download.
     """
-    result = integration.resume_download(title)
+    result = await integration.resume_download(title)
     if not result.get("success", False):
         raise HTTPException(status_code=400, detail=result.get("message", f"Failed to resume download '{title}'"))
+    snapshot.request_refresh()
     return result
 
 
 @app.delete("/api/downloads/{title}", response_model=GenericResponse)
 async def delete_download(
     title: str,
-    integration: SeedrSonarrIntegration = Depends(get_integration)
+    integration: AsyncSeedrSonarrIntegration = Depends(get_async_integration),
+    snapshot: StatusSnapshotService = Depends(get_status_snapshot)
 ):
     """
     Delete a download.
     
     This endpoint deletes a download from Seedr.
     """
-    result = integration.delete_download(title)
+    result = await integration.delete_download(title)
     if not result.get("success", False):
         raise HTTPException(status_code=400, detail=result.get("message", f"Failed to delete download '{title}'"))
+    snapshot.request_refresh()
     return result
 
 
 @app.get("/api/auth/status")
-async def auth_status():
+async def auth_status(services: ServiceContainer = Depends(get_services)):
     """
     Check authentication status with Seedr.
     
     This endpoint returns whether authentication with Seedr is active.
     """
-    is_authenticated = seedr_client.auth.get_access_token() is not None
+    is_authenticated = services.is_authenticated()
     redirect = "/"
     return {"authenticated": is_authenticated, "redirect": redirect}
 
 
 @app.post("/api/auth/login")
-async def auth_login(background_tasks: BackgroundTasks):
+async def auth_login(background_tasks: BackgroundTasks, services: ServiceContainer = Depends(get_services)):
     """
     Initiate authentication with Seedr.
     
     This endpoint starts the OAuth2 device flow for authentication with Seedr.
     """
+    auth = services.seedr_client.auth
+    
     # Clear any existing tokens
-    seedr_client.auth.clear_token()
+    auth.clear_token()
     
     # Start device flow
-    flow_data = seedr_client.auth.start_device_flow()
+    flow_data = auth.start_device_flow()
     
     # Get user code for authentication
     user_code = flow_data.get("user_code")
@@ -584,7 +595,8 @@ async def auth_login(background_tasks: BackgroundTasks):
     interval = flow_data.get("interval", 5)
     
     def poll_token():
-        seedr_client.auth.poll_for_token(device_code, interval)
+        auth.poll_for_token(device_code, interval)
+        services.event_bus.publish("auth", {"authenticated": auth.is_authenticated()})
     
     background_tasks.add_task(poll_token)
     
@@ -597,24 +609,25 @@ async def auth_login(background_tasks: BackgroundTasks):
 
 
 @app.post("/api/auth/logout")
-async def auth_logout():
+async def auth_logout(services: ServiceContainer = Depends(get_services)):
     """
     Log out from Seedr.
     
     This endpoint clears the authentication token for Seedr.
     """
-    seedr_client.auth.clear_token()
+    services.seedr_client.auth.clear_token()
+    services.event_bus.publish("auth", {"authenticated": False})
     return {"success": True}
 
 
 @app.get("/api/auth/poll")
-async def auth_poll():
+async def auth_poll(services: ServiceContainer = Depends(get_services)):
     """
     Poll for authentication status.
     
     This endpoint checks if authentication has been completed.
     """
-    is_authenticated = seedr_client.auth.get_access_token() is not None
+    is_authenticated = services.is_authenticated()
     if is_authenticated:
         return {"success": True, "redirect": "/config"}
     else:
@@ -622,16 +635,17 @@ async def auth_poll():
 
 
 @app.get("/api/user")
-async def get_user_profile():
+async def get_user_profile(services: ServiceContainer = Depends(get_services)):
     """
     Get authenticated user profile information.
     
     This endpoint returns profile information for the currently authenticated Seedr user.
     """
-    if not seedr_client.auth.get_access_token():
+    if not services.is_authenticated():
         raise HTTPException(status_code=401, detail="Not authenticated with Seedr")
     
-    user_info = seedr_client.get_account_info()
+    # Serve from the status snapshot; only go upstream before the first refresh
+    user_info = services.status_snapshot.get().account_info or await services.async_seedr_client.get_account_info()
     if not user_info:
         raise HTTPException(status_code=500, detail="Failed to get user profile information")
     
@@ -639,40 +653,155 @@ async def get_user_profile():
 
 
 @app.get("/api/sonarr/series")
-async def get_series():
+async def get_series(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, or 'all' for full records"),
+    refresh: bool = Query(False),
+    services: ServiceContainer = Depends(get_services)
+):
     """
     Get all series from Sonarr.
     
-    This endpoint returns all series from Sonarr.
+    This endpoint returns the series catalogue, cached in memory. Series are
+    compact by default; pass fields to choose the fields returned.
     """
-    return sonarr_client.get_series()
+    catalog = services.series_catalog
+    if refresh:
+        await services.async_integration.run_blocking(catalog.refresh)
+    if fields == "all":
+        selected = None
+    elif fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+    else:
+        selected = COMPACT_FIELDS
+    return await services.async_integration.run_blocking(catalog.all, selected)
+
+
+@app.get("/api/sonarr/series/lookup")
+async def lookup_series(
+    title: Optional[str] = Query(None),
+    tvdb_id: Optional[int] = Query(None),
+    path: Optional[str] = Query(None),
+    services: ServiceContainer = Depends(get_services)
+):
+    """
+    Find a series in the catalogue by title, TVDB ID or path.
+    
+    Titles are matched ignoring case, punctuation and accents, including
+    Sonarr's alternate titles. A path matches the series folder containing it.
+    """
+    catalog = services.series_catalog
+    if title:
+        series = await services.async_integration.run_blocking(catalog.find_by_title, title)
+    elif tvdb_id is not None:
+        series = await services.async_integration.run_blocking(catalog.get_by_tvdb_id, tvdb_id)
+    elif path:
+        series = await services.async_integration.run_blocking(catalog.find_by_path, path)
+    else:
+        raise HTTPException(status_code=400, detail="Pass title, tvdb_id or path")
+    if series is None:
+        raise HTTPException(status_code=404, detail="Series not found")
+    return catalog.project(series)
+
+
+@app.post("/api/sonarr/match")
+async def match_releases(request: MatchRequest, services: ServiceContainer = Depends(get_services)):
+    """
+    Match release names to Sonarr series.
+    
+    This endpoint parses each name (SxxEyy, daily, anime absolute numbering,
+    season packs) and resolves it against the series catalogue in one batch.
+    """
+    return await services.async_integration.run_blocking(services.release_matcher.match_many, request.names)
 
 
 @app.get("/api/sonarr/missing")
-async def get_missing():
+async def get_missing(refresh: bool = Query(False), services: ServiceContainer = Depends(get_services)):
     """
     Get missing episodes from Sonarr.
     
-    This endpoint returns all missing episodes from Sonarr.
+    This endpoint returns all missing episodes from Sonarr, served from a cache
+    that is refreshed incrementally. Pass refresh=true to refresh it now.
+    """
+    return await services.async_integration.run_blocking(services.missing_episodes.get, refresh)
+
+
+@app.get("/api/sonarr/scans")
+async def get_scans(integration: SeedrSonarrIntegration = Depends(get_integration)):
+    """
+    Get download scan statistics.
+    
+    This endpoint returns how many scans were requested and sent to Sonarr,
+    how long Sonarr took to finish them, and the scans still in progress.
     """
-    return sonarr_client.get_missing_episodes()
+    return integration.scans.get_stats()
 
 
 @app.get("/api/sonarr/rootfolders")
-async def get_rootfolders():
+async def get_rootfolders(services: ServiceContainer = Depends(get_services)):
     """
     Get root folders from Sonarr.
     
     This endpoint returns all root folders from Sonarr.
     """
-    return sonarr_client.get_root_folders()
+    return await services.async_sonarr_client.get_root_folders()
+
+
+@app.get("/api/http/stats")
+async def get_http_stats(integration: SeedrSonarrIntegration = Depends(get_integration)):
+    """
+    Get HTTP connection pool statistics.
+
+    This endpoint returns request and connection reuse counters for the shared session.
+    """
+    return integration.session.get_stats()
+
+
+@app.get("/api/seedr/rate-limit")
+async def get_seedr_rate_limit(integration: SeedrSonarrIntegration = Depends(get_integration)):
+    """
+    Get Seedr rate limiter statistics.
+
+    This endpoint returns the current request rate, pause state and throttling counters.
+    """
+    return integration.seedr.limiter.get_stats()
+
+
+@app.get("/api/upstreams")
+async def get_upstreams():
+    """
+    Get the circuit breaker state of Seedr and Sonarr.
+
+    This endpoint returns whether calls to each upstream are being refused, and why.
+    """
+    return get_circuit_states()
+
+
+@app.get("/api/transfers/stats")
+async def get_transfer_stats(integration: SeedrSonarrIntegration = Depends(get_integration)):
+    """
+    Get transfer scheduler statistics.
+
+    This endpoint returns queued and active local transfers per title.
+    """
+    return integration.transfers.get_stats()
+
+
+@app.get("/api/archives")
+async def get_archive_jobs(integration: SeedrSonarrIntegration = Depends(get_integration)):
+    """
+    Get folder archives being generated on Seedr.
+
+    This endpoint returns the archives the tracker is still waiting on.
+    """
+    return integration.archives.get_jobs()
 
 
 @app.post("/api/watcher/start")
 async def start_watcher(
     torrent_dir: Optional[str] = Query(None, description="Directory to watch for torrent files"),
     download_dir: Optional[str] = Query(None, description="Directory for completed downloads"),
-    config: Config = Depends(get_config)
+    config: Config = Depends(get_config),
+    services: ServiceContainer = Depends(get_services)
 ):
     """
     Start the torrent watcher.
@@ -682,22 +811,13 @@ async def start_watcher(
     """
     # Log that the watcher is being started manually
     logger.info("Manual watcher start requested via API")
-    global watcher_thread
     
     # Check if watcher is already running
-    if watcher_thread and watcher_thread.is_alive():
+    if watcher_manager.is_running:
         return {"success": False, "message": "Watcher is already running"}
     
-    # Get config if it exists
-    config_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "watcher_config.json")
-    settings = {}
-    
-    if os.path.exists(config_file):
-        try:
-            with open(config_file, "r") as f:
-                settings = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading watcher config: {str(e)}")
+    # Saved settings, cached by the service container
+    settings = services.watcher_settings
     
     # Use provided directories or get from config or use defaults
     if not torrent_dir:
@@ -719,32 +839,10 @@ async def start_watcher(
     if download_dir:
         os.makedirs(download_dir, exist_ok=True)
     
-    # Start watcher in a separate thread
-    def watcher_task():
-        # Create event handler and observer
-        event_handler = TorrentWatcher(config, integration, download_dir)
-        observer = Observer()
-        
-        # Schedule directory to watch
-        observer.schedule(event_handler, torrent_dir, recursive=False)
-        observer.start()
-        
-        logger.info(f"Started watching {torrent_dir} for torrent files")
-        
-        try:
-            # Run forever until the thread is stopped
-            while True:
-                time.sleep(1)
-        except Exception as e:
-            logger.exception(f"Error in watcher thread: {str(e)}")
-        finally:
-            observer.stop()
-            observer.join()
-            logger.info("Stopped watching for torrent files")
-    
-    watcher_thread = threading.Thread(target=watcher_task)
-    watcher_thread.daemon = True
-    watcher_thread.start()
+    result = watcher_manager.start(torrent_dir, download_dir)
+    if not result["success"]:
+        return result
+    logger.info(f"Started watching {torrent_dir} for torrent files")
     
     # Save current settings back to config file
     watch_interval = settings.get("watch_interval", 30)
@@ -753,19 +851,14 @@ async def start_watcher(
     auto_start = settings.get("auto_start", True)
     
     # Also save the watcher configuration
-    watcher_config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config")
-    os.makedirs(watcher_config_path, exist_ok=True)
-    watcher_config_file = os.path.join(watcher_config_path, "watcher_config.json")
-    
-    with open(watcher_config_file, "w") as f:
-        json.dump({
-            "torrent_dir": torrent_dir,
-            "download_dir": download_dir,
-            "watch_interval": watch_interval,
-            "save_magnet_files": save_magnet_files,
-            "magnet_extension": magnet_extension,
-            "auto_start": auto_start
-        }, f, indent=4)
+    services.save_watcher_settings({
+        "torrent_dir": torrent_dir,
+        "download_dir": download_dir,
+        "watch_interval": watch_interval,
+        "save_magnet_files": save_magnet_files,
+        "magnet_extension": magnet_extension,
+        "auto_start": auto_start
+    })
     
     return {"success": True, "message": f"Started watching {torrent_dir}"}
 
@@ -813,11 +906,7 @@ async def save_watcher_config(
     os.makedirs(download_dir, exist_ok=True)
     
     # Save settings to file
-    config_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "watcher_config.json")
-    os.makedirs(os.path.dirname(config_file), exist_ok=True)
-    
-    with open(config_file, "w") as f:
-        json.dump(settings, f, indent=4)
+    services.save_watcher_settings(settings)
     
     # Always start the watcher after saving configuration (unless explicitly specified not to)
     should_start = True
@@ -830,36 +919,13 @@ async def save_watcher_config(
         # Log that we're starting the watcher after config save
         logger.info(f"Starting watcher after configuration save for directories: {torrent_dir} and {download_dir}")
         
-        # Start the watcher non-async by calling the synchronous parts directly
+        # Restart so the new directories take effect and only one observer ever runs
         try:
-            # Create event handler and observer
-            event_handler = TorrentWatcher(config, integration, download_dir)
-            observer = Observer()
-            
-            # Schedule directory to watch
-            observer.schedule(event_handler, torrent_dir, recursive=False)
-            observer.start()
-            
-            logger.info(f"Started watching {torrent_dir} for torrent files")
-            
-            # Store observer in thread
-            def watcher_task(observer):
-                try:
-                    while True:
-                        time.sleep(1)
-                except Exception as e:
-                    logger.exception(f"Error in watcher thread: {str(e)}")
-                finally:
-                    observer.stop()
-                    observer.join()
-                    logger.info("Stopped watching for torrent files")
-            
-            global watcher_thread
-            watcher_thread = threading.Thread(target=watcher_task, args=(observer,))
-            watcher_thread.daemon = True
-            watcher_thread.start()
-            
-            logger.info("Watcher thread started successfully after config save")
+            result = watcher_manager.restart(torrent_dir, download_dir)
+            if result["success"]:
+                logger.info("Watcher started successfully after config save")
+            else:
+                logger.error(f"Error starting watcher after config save: {result['message']}")
         except Exception as e:
             logger.exception(f"Error starting watcher after config save: {str(e)}")
     
@@ -874,17 +940,15 @@ async def stop_watcher():
     
     This endpoint stops the torrent watcher.
     """
-    global watcher_thread
-    
     # Check if watcher is running
-    if not watcher_thread or not watcher_thread.is_alive():
+    if not watcher_manager.is_running:
         return {"success": False, "message": "Watcher is not running"}
     
-    # Set watcher_thread to None to signal it to stop
-    watcher_thread = None
+    # Stops the observer and the ingestion workers
+    result = await async_integration.run_blocking(watcher_manager.stop)
     
     logger.info("Stopped torrent watcher")
-    return {"success": True, "message": "Watcher stopped"}
+    return result
 
 
 @app.get("/api/watcher/status")
@@ -892,15 +956,14 @@ async def watcher_status():
     """
     Get the status of the torrent watcher.
     
-    This endpoint returns whether the torrent watcher is running.
+    This endpoint returns whether the torrent watcher is running, its
+    directories, queue state and how many observers and threads it uses.
     """
-    global watcher_thread
-    is_running = watcher_thread is not None and watcher_thread.is_alive()
-    return {"running": is_running}
+    return watcher_manager.status()
 
 
 @app.get("/api/watcher/scan")
-async def scan_torrents():
+async def scan_torrents(services: ServiceContainer = Depends(get_services)):
     """
     Scan for torrent files in the watched folder.
     
@@ -908,15 +971,12 @@ async def scan_torrents():
     and returns a list of torrent files found.
     """
     # Get the watcher settings
-    config_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "watcher_config.json")
+    settings = services.watcher_settings
     
-    if not os.path.exists(config_file):
+    if not settings:
         return {"success": False, "message": "Watcher not configured"}
     
     try:
-        with open(config_file, "r") as f:
-            settings = json.load(f)
-        
         torrent_dir = settings.get("torrent_dir")
         if not torrent_dir or not os.path.exists(torrent_dir):
             return {"success": False, "message": "Torrent directory not found"}
@@ -949,24 +1009,18 @@ async def scan_torrents():
 
 
 @app.get("/api/watcher/logs")
-async def get_watcher_logs(lines: int = 50):
+async def get_watcher_logs(lines: int = 50, services: ServiceContainer = Depends(get_services)):
     """
     Get the watcher log entries.
     
-    This endpoint returns the most recent log entries from the watcher log file.
+    This endpoint returns the most recent log entries, read from memory or
+    backward from the end of the watcher log file.
     """
-    log_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "folder_watcher.log")
-    
-    if not os.path.exists(log_file):
+    if not services.log_buffer and not os.path.exists(services.log_file):
         return {"success": False, "message": "Log file not found"}
     
     try:
-        with open(log_file, "r") as f:
-            all_lines = f.readlines()
-            # Get the specified number of lines from the end
-            log_lines = all_lines[-lines:] if lines < len(all_lines) else all_lines
-        
-        return {"success": True, "logs": log_lines}
+        return {"success": True, "logs": services.tail_log(lines)}
         
     except Exception as e:
         logger.exception(f"Error reading log file: {str(e)}")
@@ -991,24 +1045,19 @@ async def upload_torrent(
     
     try:
         # Create a torrent handler
-        from .utils.torrent_watcher import TorrentWatcher
-        handler = TorrentWatcher(config, integration)
+        handler = TorrentWatcher(config, integration, ledger=services.ingestion_ledger, event_bus=event_bus,
+                                 account_info=lambda: status_snapshot.get().account_info)
         
-        # Get the download directory from config
-        config_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "watcher_config.json")
-        download_dir = None
-        
-        if os.path.exists(config_file):
-            with open(config_file, "r") as f:
-                settings = json.load(f)
-                download_dir = settings.get("download_dir")
+        # Get the download directory from the saved settings
+        download_dir = services.watcher_settings.get("download_dir")
         
         # If download_dir is specified, update handler
         if download_dir:
             handler.download_dir = download_dir
         
-        # Process the torrent file
-        result = handler._process_torrent_file(file_path)
+        # Process the torrent file off the event loop
+        # The watcher publishes its own event for the upload
+        result = await async_integration.run_blocking(handler._process_torrent_file, file_path)
         
         if result:
             # Log successful upload
@@ -1168,22 +1217,16 @@ def start():
 def start_background_watcher():
     """Start the watcher in the background if it's not already running.
     This will auto-start the watcher with default directories if none are configured."""
-    global watcher_thread
-    
     # Don't start if watcher is already running
-    if watcher_thread and watcher_thread.is_alive():
+    if watcher_manager.is_running:
         logger.info("Watcher already running, not starting a new instance")
         return
     
-    # Get watcher config if it exists
-    config_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "watcher_config.json")
+    # Saved settings, cached by the service container; empty if none were saved
+    settings = services.watcher_settings
     
-    # Check if config exists and load settings
-    if os.path.exists(config_file):
+    if settings:
         try:
-            with open(config_file, "r") as f:
-                settings = json.load(f)
-            
             torrent_dir = settings.get("torrent_dir")
             download_dir = settings.get("download_dir")
             auto_start = settings.get("auto_start", True)  # Default to auto-start
@@ -1216,42 +1259,11 @@ def start_background_watcher():
             # Start watcher with config directly instead of async function
             logger.info(f"Auto-starting watcher for directory: {torrent_dir}")
             
-            # Create event handler and observer directly
-            def start_background():
-                try:
-                    # Create event handler and observer
-                    event_handler = TorrentWatcher(config, integration, download_dir)
-                    observer = Observer()
-                    
-                    # Schedule directory to watch
-                    observer.schedule(event_handler, torrent_dir, recursive=False)
-                    observer.start()
-                    
-                    # Store observer in thread
-                    def watcher_task(observer):
-                        try:
-                            while True:
-                                time.sleep(1)
-                        except Exception as e:
-                            logger.exception(f"Error in watcher thread: {str(e)}")
-                        finally:
-                            observer.stop()
-                            observer.join()
-                            logger.info("Stopped watching for torrent files")
-                    
-                    global watcher_thread
-                    watcher_thread = threading.Thread(target=watcher_task, args=(observer,))
-                    watcher_thread.daemon = True
-                    watcher_thread.start()
-                    
-                    logger.info(f"Watcher started automatically monitoring {torrent_dir}")
-                except Exception as e:
-                    logger.error(f"Error auto-starting watcher: {str(e)}")
-            
-            # Start in a thread to avoid blocking
-            auto_start_thread = threading.Thread(target=start_background)
-            auto_start_thread.daemon = True
-            auto_start_thread.start()
+            result = watcher_manager.start(torrent_dir, download_dir)
+            if result["success"]:
+                logger.info(f"Watcher started automatically monitoring {torrent_dir}")
+            else:
+                logger.error(f"Error auto-starting watcher: {result['message']}")
         
         except Exception as e:
             logger.error(f"Error loading watcher config: {str(e)}")
@@ -1267,20 +1279,15 @@ def start_background_watcher():
             os.makedirs(default_torrent_dir, exist_ok=True)
             os.makedirs(default_download_dir, exist_ok=True)
             
-            # Create config directory
-            config_dir = os.path.dirname(config_file)
-            os.makedirs(config_dir, exist_ok=True)
-            
             # Save default config with auto-start explicitly enabled
-            with open(config_file, "w") as f:
-                json.dump({
-                    "torrent_dir": default_torrent_dir,
-                    "download_dir": default_download_dir,
-                    "watch_interval": 30,
-                    "save_magnet_files": True,
-                    "magnet_extension": ".magnet",
-                    "auto_start": True  # Always enable auto-start by default
-                }, f, indent=4)
+            services.save_watcher_settings({
+                "torrent_dir": default_torrent_dir,
+                "download_dir": default_download_dir,
+                "watch_interval": 30,
+                "save_magnet_files": True,
+                "magnet_extension": ".magnet",
+                "auto_start": True  # Always enable auto-start by default
+            })
             
             logger.info(f"Created default watcher config with auto-start enabled")
             
@@ -2,5 +2,16 @@
 Service module for the Sonarr-Seedr integration.
 """
 from .seedr_sonarr_integration import SeedrSonarrIntegration
+from .async_integration import AsyncSeedrSonarrIntegration
+from .mapping_store import MappingStore
+from .status_snapshot import StatusSnapshotService
+from .event_bus import EventBus
+from .missing_episodes import MissingEpisodesCache
+from .series_catalog import SeriesCatalog, normalize_title
+from .release_parser import ParsedRelease, parse_release
+from .release_matcher import ReleaseMatcher
+from .scan_coordinator import ScanCoordinator
  
-__all__ = ['SeedrSonarrIntegration'] 
\ No newline at end of file
+__all__ = ['SeedrSonarrIntegration', 'AsyncSeedrSonarrIntegration', 'MappingStore', 'StatusSnapshotService', 'EventBus', 'MissingEpisodesCache',
+           'SeriesCatalog', 'normalize_title',
+           'ParsedRelease', 'parse_release', 'ReleaseMatcher', 'ScanCoordinator'] 
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+Background tracker for Seedr folder archives that are still being generated.
+"""
+import time
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, List
+from ..api.seedr_client import SeedrClient
+from ..api.resilience import UpstreamUnavailableError
+
+class ArchiveJob:
+    """One folder archive being generated on Seedr."""
+
+    def __init__(self, folder_id: str, initial_delay: float):
+        self.folder_id = str(folder_id)
+        self.uniq: Optional[str] = None
+        self.status = "pending"
+        self.progress: Any = None
+        self.attempts = 0
+        self.delay = initial_delay
+        self.started_at = time.time()
+        self.future: Future = Future()
+
+
+class ArchiveTracker:
+    """Start folder archives and poll them with backoff on a background thread.
+
+    `track()` returns immediately with a future that resolves to the archive
+    download URL once Seedr reports it ready, so neither request handlers
+    nor transfer workers ever sleep waiting for a zip to be generated.
+    Requests for a folder that is already being tracked share its job.
+    """
+
+    def __init__(self, seedr: SeedrClient, initial_delay: float = 2.0, max_delay: float = 60.0,
+                 backoff: float = 1.5, timeout: float = 6 * 3600):
+        self.seedr = seedr
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.timeout = timeout
+        self._jobs: Dict[str, ArchiveJob] = {}
+        self._schedule: List[Any] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> None:
+        """Start the polling thread if it is not already running."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="archive-tracker", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread. Pending jobs stay unresolved."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def track(self, folder_id: str) -> Future:
+        """Start (or join) archive generation for a folder and return a future for its URL."""
+        self.start()
+        with self._condition:
+            job = self._jobs.get(str(folder_id))
+            if job is None:
+                job = ArchiveJob(folder_id, self.initial_delay)
+                self._jobs[job.folder_id] = job
+                self._schedule_locked(job, 0)
+            return job.future
+
+    def track_many(self, folder_ids: List[str]) -> Dict[str, Future]:
+        """Start archives for several folders at once."""
+        return {str(folder_id): self.track(folder_id) for folder_id in folder_ids}
+
+    def _schedule_locked(self, job: ArchiveJob, delay: float) -> None:
+        heapq.heappush(self._schedule, (time.monotonic() + delay, next(self._counter), job))
+        self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running:
+                    if self._schedule and self._schedule[0][0] <= time.monotonic():
+                        break
+                    timeout = self._schedule[0][0] - time.monotonic() if self._schedule else None
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+                _, _, job = heapq.heappop(self._schedule)
+
+            try:
+                self._poll(job)
+            except UpstreamUnavailableError as e:
+                # Seedr is down; keep the job and try again later, until the timeout
+                if time.time() - job.started_at > self.timeout:
+                    self._finish(job, error=f"Archive tracking failed: {e}")
+                else:
+                    with self._condition:
+                        self._schedule_locked(job, job.delay)
+                        job.delay = min(job.delay * self.backoff, self.max_delay)
+            except Exception as e:
+                self._finish(job, error=f"Archive tracking failed: {e}")
+
+    def _poll(self, job: ArchiveJob) -> None:
+        """Advance one job by a single Seedr call and reschedule it if needed."""
+        job.attempts += 1
+
+        if job.uniq is None:
+            job.uniq = self.seedr.init_archive(job.folder_id)
+            if not job.uniq:
+                self._finish(job, error="Failed to initialize archive")
+                return
+            job.status = "generating"
+        else:
+            data = self.seedr.get_archive_status(job.uniq)
+            status = data.get("status")
+            job.progress = data.get("progress", job.progress)
+            if status == "ready" and data.get("url"):
+                job.status = "ready"
+                self._finish(job, url=data["url"])
+                return
+            if status in ("error", "failed", "expired", "cancelled"):
+                self._finish(job, error=f"Archive generation failed: {data}")
+                return
+
+        if time.time() - job.started_at > self.timeout:
+            self._finish(job, error="Timed out waiting for archive")
+            return
+
+        with self._condition:
+            self._schedule_locked(job, job.delay)
+            job.delay = min(job.delay * self.backoff, self.max_delay)
+
+    def _finish(self, job: ArchiveJob, url: Optional[str] = None, error: Optional[str] = None) -> None:
+        with self._condition:
+            self._jobs.pop(job.folder_id, None)
+        if url:
+            job.future.set_result(url)
+        else:
+            job.status = "failed"
+            job.future.set_exception(RuntimeError(error or "Archive failed"))
+
+    def get_jobs(self) -> List[Dict[str, Any]]:
+        """Get the archives currently being tracked."""
+        with self._condition:
+            jobs = list(self._jobs.values())
+        return [
+            {
+                "folder_id": job.folder_id,
+                "uniq": job.uniq,
+                "status": job.status,
+                "progress": job.progress,
+                "attempts": job.attempts,
+                "waiting_seconds": round(time.time() - job.started_at, 1)
+            }
+            for job in jobs
+        ]
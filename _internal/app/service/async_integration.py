@@ -0,0 +1,57 @@
+"""
+Asyncio variant of the Seedr/Sonarr integration service.
+"""
+import asyncio
+from typing import Dict, Any, Optional, List
+from ..api.async_clients import AsyncClientBase, AsyncSeedrClient, AsyncSonarrClient, get_io_executor
+from .seedr_sonarr_integration import SeedrSonarrIntegration
+
+class AsyncSeedrSonarrIntegration(AsyncClientBase):
+    """Awaitable interface to a SeedrSonarrIntegration.
+
+    Handlers await these methods instead of calling the integration directly,
+    so a slow Seedr or Sonarr round-trip only suspends the request that made
+    it while the event loop keeps serving everything else.
+    """
+
+    def __init__(self, integration: SeedrSonarrIntegration):
+        super().__init__(get_io_executor(integration.config.http.pool_maxsize))
+        self.integration = integration
+        self.config = integration.config
+        self.seedr = AsyncSeedrClient(integration.seedr, self.executor)
+        self.sonarr = AsyncSonarrClient(integration.sonarr, self.executor)
+
+    async def add_download(self, title: str, download_url: str, series_id: Optional[int] = None) -> Dict[str, Any]:
+        return await self.run_blocking(self.integration.add_download, title, download_url, series_id)
+
+    async def check_download_status(self, title: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.integration.check_download_status, title)
+
+    async def get_downloaded_files(self, title: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.integration.get_downloaded_files, title)
+
+    async def download_completed_files(self, title: str, save_path: Optional[str] = None) -> Dict[str, Any]:
+        return await self.run_blocking(self.integration.download_completed_files, title, save_path)
+
+    async def notify_sonarr(self, title: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.integration.notify_sonarr, title)
+
+    async def pause_download(self, title: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.integration.pause_download, title)
+
+    async def resume_download(self, title: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.integration.resume_download, title)
+
+    async def delete_download(self, title: str) -> Dict[str, Any]:
+        return await self.run_blocking(self.integration.delete_download, title)
+
+    async def poll_downloads(self) -> List[Dict[str, Any]]:
+        return await self.run_blocking(self.integration.poll_downloads)
+
+    async def get_overview(self) -> Dict[str, Any]:
+        """Fetch download states and account info concurrently."""
+        downloads, account_info = await asyncio.gather(
+            self.poll_downloads(),
+            self.seedr.get_account_info()
+        )
+        return {"downloads": downloads, "account_info": account_info}
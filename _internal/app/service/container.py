@@ -0,0 +1,132 @@
+"""
+Application-scoped container for the services shared by all requests.
+"""
+import os
+import json
+from typing import Dict, Any, List, Optional
+from fastapi import Request
+from ..config import Config
+from .seedr_sonarr_integration import SeedrSonarrIntegration
+from .async_integration import AsyncSeedrSonarrIntegration
+from .status_snapshot import StatusSnapshotService
+from .event_bus import EventBus
+from .watcher_manager import WatcherManager
+from .missing_episodes import MissingEpisodesCache
+from .series_catalog import SeriesCatalog
+from .release_matcher import ReleaseMatcher
+from ..utils.log_files import LogRingBuffer, tail_lines
+from ..utils.ingestion import IngestionLedger
+from ..utils.polling_observer import create_observer
+
+class ServiceContainer:
+    """Config, clients, integration and auth state built once per process.
+
+    Request handlers receive the container through the `get_services`
+    dependency instead of constructing clients or reading config files, so
+    rendering a page does no disk or construction work. The Seedr and
+    Sonarr clients are the integration's own, so there is a single auth
+    state and a single connection pool.
+    """
+
+    def __init__(self, config: Config, base_dir: str, log_buffer: Optional[LogRingBuffer] = None):
+        self.config = config
+        self.base_dir = base_dir
+        self.log_file = os.path.join(base_dir, "folder_watcher.log")
+        # Recent log lines of this process, so the log views rarely touch the file
+        self.log_buffer = log_buffer
+        self.integration = SeedrSonarrIntegration(config, strict_validation=False)
+        self.seedr_client = self.integration.seedr
+        self.sonarr_client = self.integration.sonarr
+        # Awaitable wrappers used by request handlers so upstream calls never block the event loop
+        self.async_integration = AsyncSeedrSonarrIntegration(self.integration)
+        self.async_seedr_client = self.async_integration.seedr
+        self.async_sonarr_client = self.async_integration.sonarr
+        # Pushes download, account and watcher changes to /api/events subscribers
+        self.event_bus = EventBus()
+        # Read endpoints serve download states from this snapshot instead of polling Seedr per request
+        self.status_snapshot = StatusSnapshotService(
+            self.integration, config.download.status_interval, self.event_bus
+        )
+        # Sonarr's wanted/missing list, refreshed incrementally instead of refetched per request
+        self.missing_episodes = MissingEpisodesCache(
+            self.sonarr_client, config.sonarr.cache_ttl, config.sonarr.full_refresh_interval
+        )
+        # Indexed Sonarr library for series lists and title lookups without a Sonarr call
+        self.series_catalog = SeriesCatalog(self.sonarr_client, config.sonarr.series_refresh_interval)
+        self.release_matcher = ReleaseMatcher(self.series_catalog)
+        self.watcher_config_file = os.path.join(base_dir, "config", "watcher_config.json")
+        self.watcher_settings: Dict[str, Any] = self._load_watcher_settings()
+        # Owns the folder watcher's observer and workers; main sets its handler factory
+        self.watcher = WatcherManager(
+            self.event_bus,
+            observer_factory=lambda: create_observer(config.watcher.backend, config.watcher.poll_interval)
+        )
+        # Torrents already submitted by any watcher, so each is sent to Seedr once
+        self.ingestion_ledger = IngestionLedger(os.path.join(base_dir, "config", "ingestion_ledger.json"))
+
+    def start(self) -> None:
+        """Start background services."""
+        # Read the saved token once; afterwards auth state lives in memory.
+        # Done here rather than at import, since an expired token is refreshed over the network.
+        self.seedr_client.auth.load_token()
+        self.seedr_client.auth.start_auto_refresh()
+        self.status_snapshot.start()
+
+    def stop(self) -> None:
+        """Stop background services."""
+        self.watcher.stop()
+        self.status_snapshot.stop()
+        self.seedr_client.auth.stop_auto_refresh()
+        self.integration.archives.stop()
+        self.integration.scans.stop()
+        self.integration.transfers.stop()
+
+    def is_authenticated(self) -> bool:
+        """Check the in-memory Seedr auth state."""
+        return self.seedr_client.auth.is_authenticated()
+
+    def tail_log(self, lines: int) -> List[str]:
+        """Get the last lines of the watcher log.
+
+        Served from the in-memory buffer when it holds enough lines, otherwise
+        read backward from the end of the log file.
+        """
+        if self.log_buffer is not None and len(self.log_buffer) >= lines:
+            return self.log_buffer.tail(lines)
+        return tail_lines(self.log_file, lines)
+
+    def find_log_line(self, *needles: str, lines: int = 100) -> Optional[str]:
+        """Get the most recent log line containing any of the given strings.
+
+        Searches the in-memory buffer first, then the last `lines` lines of the log file.
+        """
+        if self.log_buffer is not None:
+            line = self.log_buffer.find_last(*needles)
+            if line is not None:
+                return line
+        for line in reversed(tail_lines(self.log_file, lines)):
+            if any(needle in line for needle in needles):
+                return line
+        return None
+
+    def _load_watcher_settings(self) -> Dict[str, Any]:
+        if not os.path.exists(self.watcher_config_file):
+            return {}
+        try:
+            with open(self.watcher_config_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error reading watcher config: {e}")
+            return {}
+
+    def save_watcher_settings(self, settings: Dict[str, Any]) -> None:
+        """Persist watcher settings and update the cached copy."""
+        os.makedirs(os.path.dirname(self.watcher_config_file), exist_ok=True)
+        with open(self.watcher_config_file, "w") as f:
+            json.dump(settings, f, indent=4)
+        self.watcher_settings = dict(settings)
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """FastAPI dependency returning the application's service container."""
+    return request.app.state.services
@@ -0,0 +1,83 @@
+"""
+In-process event bus that fans out status changes to streaming clients.
+"""
+import json
+import time
+import asyncio
+import threading
+from typing import Dict, Any, Optional, List
+
+class Subscription:
+    """One client's queue of pending events.
+
+    If the client falls behind and its queue fills up, further events are
+    dropped and `overflowed` is set; the stream then sends a full resync
+    instead of the missed changes.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def _put(self, event: Dict[str, Any]) -> None:
+        """Enqueue an event. Runs on the subscriber's event loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for the next event, returning None if none arrives within timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """Publish events from any thread to async subscribers.
+
+    Producers such as the status snapshot thread or the folder watcher call
+    `publish()`; each subscriber receives the event on its own event loop,
+    so a slow client never blocks the producer or other clients.
+    """
+
+    def __init__(self, max_queue: int = 256):
+        self.max_queue = max_queue
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        """Register a subscriber. Must be called from the subscriber's event loop."""
+        subscription = Subscription(asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Send an event to every subscriber. Safe to call from any thread."""
+        message = {"event": event, "data": data, "time": time.time()}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, message)
+            except RuntimeError:
+                # The subscriber's loop has closed
+                self.unsubscribe(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one event in text/event-stream format."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,179 @@
+"""
+SQLite-backed store for Sonarr title to Seedr download mappings.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Optional, List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mappings (
+    title TEXT PRIMARY KEY,
+    torrent_id TEXT NOT NULL,
+    infohash TEXT,
+    series_id INTEGER,
+    added_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mappings_torrent_id ON mappings (torrent_id);
+CREATE INDEX IF NOT EXISTS idx_mappings_infohash ON mappings (infohash);
+CREATE INDEX IF NOT EXISTS idx_mappings_series_id ON mappings (series_id);
+"""
+
+COLUMNS = "title, torrent_id, infohash, series_id, added_at, updated_at"
+
+class MappingStore:
+    """Indexed, transactional store for download mappings.
+
+    The database runs in WAL mode so readers never block the writer, and
+    each thread gets its own connection. Every write is a single
+    transaction, which makes concurrent upserts from the watcher thread and
+    the API threads safe without any file-level locking.
+    """
+
+    def __init__(self, db_path: str, legacy_json_path: Optional[str] = None):
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        if legacy_json_path:
+            self._migrate_json(legacy_json_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _migrate_json(self, json_path: str) -> int:
+        """
+        Import mappings from a legacy download_mappings.json file.
+
+        The file is renamed to `.migrated` once its rows are committed, so the
+        import only ever happens on the first start after upgrading.
+        """
+        if not os.path.exists(json_path):
+            return 0
+
+        try:
+            with open(json_path, 'r') as f:
+                mappings = json.load(f)
+        except Exception as e:
+            print(f"Error reading legacy download mappings: {e}")
+            return 0
+
+        now = time.time()
+        rows = []
+        for title, mapping in mappings.items():
+            torrent_id = str(mapping.get("torrent_id", ""))
+            if not torrent_id:
+                continue
+            rows.append((
+                title,
+                torrent_id,
+                mapping.get("infohash") or infohash_from_torrent_id(torrent_id),
+                mapping.get("series_id"),
+                mapping.get("added_at") or now,
+                now
+            ))
+
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO mappings ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+        os.replace(json_path, f"{json_path}.migrated")
+        print(f"Migrated {len(rows)} download mappings from {json_path}")
+        return len(rows)
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        return dict(row) if row is not None else None
+
+    def upsert(self, title: str, torrent_id: str, series_id: Optional[int] = None,
+               infohash: Optional[str] = None) -> None:
+        """Insert or update the mapping for a title in one transaction, keeping its original added_at."""
+        torrent_id = str(torrent_id)
+        infohash = infohash or infohash_from_torrent_id(torrent_id)
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                f"""
+                INSERT INTO mappings ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(title) DO UPDATE SET
+                    torrent_id = excluded.torrent_id,
+                    infohash = excluded.infohash,
+                    series_id = excluded.series_id,
+                    updated_at = excluded.updated_at
+                """,
+                (title, torrent_id, infohash.lower() if infohash else None, series_id, now, now)
+            )
+
+    def get(self, title: str) -> Optional[Dict[str, Any]]:
+        """Get the mapping for a title."""
+        row = self._connect().execute(
+            f"SELECT {COLUMNS} FROM mappings WHERE title = ?", (title,)
+        ).fetchone()
+        return self._to_dict(row)
+
+    def get_by_torrent_id(self, torrent_id: str) -> Optional[Dict[str, Any]]:
+        """Get the mapping for a Seedr task or torrent ID."""
+        row = self._connect().execute(
+            f"SELECT {COLUMNS} FROM mappings WHERE torrent_id = ?", (str(torrent_id),)
+        ).fetchone()
+        return self._to_dict(row)
+
+    def get_by_infohash(self, infohash: str) -> Optional[Dict[str, Any]]:
+        """Get the mapping for a torrent infohash."""
+        row = self._connect().execute(
+            f"SELECT {COLUMNS} FROM mappings WHERE infohash = ?", (infohash.lower(),)
+        ).fetchone()
+        return self._to_dict(row)
+
+    def list_by_series(self, series_id: int) -> List[Dict[str, Any]]:
+        """Get all mappings for a Sonarr series."""
+        rows = self._connect().execute(
+            f"SELECT {COLUMNS} FROM mappings WHERE series_id = ? ORDER BY added_at", (series_id,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """Get every mapping keyed by title, oldest first."""
+        rows = self._connect().execute(
+            f"SELECT {COLUMNS} FROM mappings ORDER BY added_at"
+        ).fetchall()
+        return {row["title"]: dict(row) for row in rows}
+
+    def delete(self, title: str) -> bool:
+        """Delete the mapping for a title. Returns True if a row was removed."""
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("DELETE FROM mappings WHERE title = ?", (title,))
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        """Get the number of stored mappings."""
+        return self._connect().execute("SELECT COUNT(*) FROM mappings").fetchone()[0]
+
+
+def infohash_from_torrent_id(torrent_id: str) -> Optional[str]:
+    """Return the torrent ID as an infohash if it is a 40 character hex SHA-1."""
+    if len(torrent_id) == 40 and all(c in "0123456789abcdefABCDEF" for c in torrent_id):
+        return torrent_id.lower()
+    return None
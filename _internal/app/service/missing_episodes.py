@@ -0,0 +1,138 @@
+"""
+Cached, incrementally refreshed list of Sonarr's wanted/missing episodes.
+"""
+import time
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from ..api.sonarr_client import SonarrClient, MISSING_SORT_KEY
+
+class MissingEpisodesCache:
+    """Serve wanted/missing episodes from memory and refresh them incrementally.
+
+    The first load fetches every page, with the pages after the first
+    fetched concurrently, and remembers which episode ids were on each
+    page. Later refreshes walk the pages newest first and stop at the first
+    page holding the same ids in the same order as before with no changed
+    records, which is usually page 1. An episode that is downloaded while
+    another goes missing leaves the count unchanged but shifts every page
+    in between, so the walk continues past them. When Sonarr reports a
+    different number of records the list is reloaded in full. Changes that
+    cancel out within one page behind an unchanged page are only seen by
+    the full reload that runs every `full_refresh_interval` seconds. Within
+    `ttl` seconds of a refresh the cached list is returned without calling
+    Sonarr.
+    """
+
+    def __init__(self, sonarr: SonarrClient, ttl: float = 60.0, full_refresh_interval: float = 3600.0):
+        self.sonarr = sonarr
+        self.ttl = ttl
+        self.full_refresh_interval = full_refresh_interval
+        self._lock = threading.Lock()
+        self._records: Dict[Any, Dict[str, Any]] = {}
+        self._sorted: List[Dict[str, Any]] = []
+        # Episode ids on each page as Sonarr returned them, and the page size used
+        self._pages: List[Tuple[Any, ...]] = []
+        self._page_size = 0
+        self._refreshed_at: Optional[float] = None
+        self._full_refreshed_at: Optional[float] = None
+        self._pages_fetched = 0
+        self._last_error: Optional[str] = None
+
+    def get(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get all missing episodes, most recently aired first.
+
+        Args:
+            refresh: Refresh now even if the cached list is within its TTL
+
+        Returns:
+            List[Dict[str, Any]]: Missing episode records; the last known list
+                if Sonarr cannot be reached
+        """
+        # One refresh at a time; callers arriving meanwhile get its result
+        with self._lock:
+            if refresh or self._is_stale():
+                try:
+                    self._refresh()
+                    self._last_error = None
+                except Exception as e:
+                    print(f"Error refreshing missing episodes: {e}")
+                    self._last_error = str(e)
+            return self._sorted
+
+    def invalidate(self) -> None:
+        """Make the next get() refresh."""
+        with self._lock:
+            self._refreshed_at = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "records": len(self._records),
+                "refreshed_at": self._refreshed_at,
+                "full_refreshed_at": self._full_refreshed_at,
+                "pages_fetched": self._pages_fetched,
+                "last_error": self._last_error
+            }
+
+    def _is_stale(self) -> bool:
+        return self._refreshed_at is None or time.time() - self._refreshed_at >= self.ttl
+
+    def _refresh(self) -> None:
+        now = time.time()
+        first = self.sonarr.get_missing_page(1)
+        total = first.get("totalRecords", 0)
+        page_size = first.get("pageSize") or self.sonarr.config.page_size
+        if (not self._records or self._full_refreshed_at is None
+                or now - self._full_refreshed_at >= self.full_refresh_interval
+                or total != len(self._records) or page_size != self._page_size):
+            self._load_all(first, now)
+            return
+
+        records = dict(self._records)
+        pages = list(self._pages)
+        data, page = first, 1
+        self._pages_fetched += 1
+        while True:
+            page_records = data.get("records", [])
+            ids = tuple(record.get("id") for record in page_records)
+            changed = page > len(pages) or pages[page - 1] != ids
+            for record in page_records:
+                if records.get(record.get("id")) != record:
+                    records[record.get("id")] = record
+                    changed = True
+            if page > len(pages):
+                pages.append(ids)
+            else:
+                pages[page - 1] = ids
+            if not changed or page * page_size >= total:
+                break
+            page += 1
+            data = self.sonarr.get_missing_page(page, page_size)
+            self._pages_fetched += 1
+
+        # Drop episodes that left the pages walked; the pages beyond them are unchanged
+        listed = {episode_id for ids in pages for episode_id in ids}
+        records = {episode_id: record for episode_id, record in records.items() if episode_id in listed}
+        if len(records) != total:
+            # An episode moved into a page that was not walked again
+            self._load_all(first, now)
+            return
+        self._store(records, pages, page_size, now)
+
+    def _load_all(self, first: Dict[str, Any], now: float) -> None:
+        records = self.sonarr.fetch_missing_episodes(first)
+        page_size = first.get("pageSize") or self.sonarr.config.page_size
+        self._pages_fetched += max(1, -(-first.get("totalRecords", 0) // page_size))
+        pages = [tuple(record.get("id") for record in records[i:i + page_size])
+                 for i in range(0, len(records), page_size)]
+        self._store({record.get("id"): record for record in records}, pages, page_size, now)
+        self._full_refreshed_at = now
+
+    def _store(self, records: Dict[Any, Dict[str, Any]], pages: List[Tuple[Any, ...]],
+               page_size: int, now: float) -> None:
+        self._records = records
+        self._pages = pages
+        self._page_size = page_size
+        self._sorted = sorted(records.values(), key=lambda r: r.get(MISSING_SORT_KEY) or "", reverse=True)
+        self._refreshed_at = now
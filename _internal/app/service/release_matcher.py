@@ -0,0 +1,82 @@
+"""
+Batch matching of release and folder names to Sonarr series.
+"""
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from .series_catalog import SeriesCatalog, normalize_title
+from .release_parser import parse_release
+
+# Series fields included in match results
+MATCH_FIELDS = ("id", "title", "tvdbId", "path")
+# Fewest whole words of the release title a prefix match must cover
+MIN_PREFIX_WORDS = 2
+
+class ReleaseMatcher:
+    """Resolve release names to Sonarr series using the catalogue's title index.
+
+    Each name is parsed, then its normalized series title is looked up in
+    the catalogue: first exactly, then without a trailing year, then as
+    the longest series title made of the release title's first words
+    ("Show Name Extended Cut" finds "Show Name"). A prefix must end between
+    words and cover at least MIN_PREFIX_WORDS of them, so "The Officer
+    Diaries" does not find "The Office" and "Lost in Space" does not find
+    "Lost". A batch reads one generation of the
+    index, parses each distinct name once and looks up each distinct title
+    once, with no Sonarr calls.
+    """
+
+    def __init__(self, catalog: SeriesCatalog):
+        self.catalog = catalog
+
+    def match(self, name: str) -> Dict[str, Any]:
+        """Match a single name. See match_many."""
+        return self.match_many([name])[0]
+
+    def match_many(self, names: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Match release or folder names to series.
+
+        Args:
+            names: Release, file or folder names
+
+        Returns:
+            List[Dict[str, Any]]: Per name, in order: the name, the parsed
+                release, the matched series (or None) and how it matched
+                ("title", "title_without_year" or "prefix")
+        """
+        titles = self.catalog.title_index()
+        lookups: Dict[Tuple[str, Optional[int], Tuple[str, ...]], Tuple[Optional[Dict[str, Any]], Optional[str]]] = {}
+        results = []
+        for name in names:
+            parsed = parse_release(name)
+            prefixes = _word_prefixes(parsed.series_title)
+            key = (parsed.normalized_title, parsed.year, prefixes)
+            if key not in lookups:
+                lookups[key] = self._lookup(parsed.normalized_title, parsed.year, prefixes, titles)
+            series, method = lookups[key]
+            results.append({
+                "name": name,
+                "release": parsed.to_dict(),
+                "series": self.catalog.project(series, MATCH_FIELDS) if series else None,
+                "match": method
+            })
+        return results
+
+    @staticmethod
+    def _lookup(title: str, year: Optional[int], prefixes: Tuple[str, ...],
+                titles: Dict[str, Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        if not title:
+            return None, None
+        if title in titles:
+            return titles[title], "title"
+        if year and title.endswith(str(year)) and title[:-4] in titles:
+            return titles[title[:-4]], "title_without_year"
+        for prefix in prefixes:
+            if prefix in titles:
+                return titles[prefix], "prefix"
+        return None, None
+
+
+def _word_prefixes(series_title: str) -> Tuple[str, ...]:
+    """Normalized titles of the first words of a title, longest first, excluding the whole title."""
+    words = [word for word in (normalize_title(part) for part in series_title.split()) if word]
+    return tuple("".join(words[:count]) for count in range(len(words) - 1, MIN_PREFIX_WORDS - 1, -1))
@@ -0,0 +1,173 @@
+"""
+Parser for scene and anime release names: series title, season, episodes and quality.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from .series_catalog import normalize_title
+
+_EXTENSION = re.compile(r"\.(mkv|mp4|avi|m4v|ts|wmv|torrent|magnet|nzb|zip|rar)$", re.IGNORECASE)
+_LEADING_GROUP = re.compile(r"^\[(?P<group>[^\]]+)\]\s*")
+_TRAILING_GROUP = re.compile(r"-(?P<group>[A-Za-z0-9]+)(?:\[[^\]]*\])?$")
+_BRACKETS = re.compile(r"\[[^\]]*\]")
+_SEPARATORS = re.compile(r"[\s._()]+")
+_NOT_A_GROUP = re.compile(r"^(?:S?\d+|E\d+)$", re.IGNORECASE)
+
+# Tried in order; the first pattern that matches decides the release type
+_EPISODE = re.compile(
+    r"^(?P<title>.*?)\bS(?P<season>\d{1,3})\s?(?P<episodes>E\d{1,4}(?:\s?-?\s?E?\d{1,4})*)\b", re.IGNORECASE
+)
+_CROSS_EPISODE = re.compile(r"^(?P<title>.*?)\b(?P<season>\d{1,2})x(?P<episode>\d{2,3})\b", re.IGNORECASE)
+_DAILY = re.compile(r"^(?P<title>.*?)\b(?P<year>(?:19|20)\d{2}) (?P<month>\d{2}) (?P<day>\d{2})\b")
+_SEASON_PACK = re.compile(
+    r"^(?P<title>.*?)\b(?:S(?P<season>\d{1,2})(?:\s?-\s?S?(?P<season_end>\d{1,2}))?"
+    r"|Season (?P<season_word>\d{1,2})(?:\s?-\s?(?P<season_word_end>\d{1,2}))?)\b(?!\s?E\d)",
+    re.IGNORECASE
+)
+_ABSOLUTE = re.compile(
+    r"^(?P<title>.+?)(?: - | )(?:E(?:p(?:isode)?)?\s?)?(?P<absolute>\d{2,4})(?:\s?-\s?(?P<absolute_end>\d{2,4}))?"
+    r"(?:v\d)?(?: |$)",
+    re.IGNORECASE
+)
+
+_RESOLUTION = re.compile(r"\b(2160|1080|720|576|480)[pi]\b", re.IGNORECASE)
+_YEAR = re.compile(r"\b((?:19|20)\d{2})$")
+_RESOLUTION_WORDS = {"2160", "1080", "720", "576", "480"}
+
+class ParsedRelease:
+    """What a release name says about its series and episodes."""
+
+    EPISODE = "episode"
+    DAILY = "daily"
+    ABSOLUTE = "absolute"
+    SEASON_PACK = "season_pack"
+
+    def __init__(self, name: str, series_title: str = "", kind: Optional[str] = None,
+                 season: Optional[int] = None, episodes: Optional[List[int]] = None,
+                 seasons: Optional[List[int]] = None, absolute_episodes: Optional[List[int]] = None,
+                 air_date: Optional[str] = None, year: Optional[int] = None,
+                 resolution: Optional[str] = None, release_group: Optional[str] = None):
+        self.name = name
+        self.series_title = series_title
+        self.normalized_title = normalize_title(series_title)
+        self.kind = kind
+        self.season = season
+        self.episodes = episodes or []
+        self.seasons = seasons or ([season] if season is not None and kind == self.SEASON_PACK else [])
+        self.absolute_episodes = absolute_episodes or []
+        self.air_date = air_date
+        self.year = year
+        self.resolution = resolution
+        self.release_group = release_group
+
+    @property
+    def is_season_pack(self) -> bool:
+        return self.kind == self.SEASON_PACK
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "series_title": self.series_title,
+            "kind": self.kind,
+            "season": self.season,
+            "episodes": self.episodes,
+            "seasons": self.seasons,
+            "absolute_episodes": self.absolute_episodes,
+            "air_date": self.air_date,
+            "year": self.year,
+            "resolution": self.resolution,
+            "release_group": self.release_group
+        }
+
+
+def _episode_numbers(text: str) -> List[int]:
+    """Expand "E01E02", "E01-E03" and "E01-03" into episode numbers."""
+    numbers = [int(n) for n in re.findall(r"\d+", text)]
+    if len(numbers) == 2 and "-" in text and numbers[0] < numbers[1] <= numbers[0] + 100:
+        return list(range(numbers[0], numbers[1] + 1))
+    return numbers
+
+
+def _clean_title(title: str) -> str:
+    return title.strip(" -")
+
+
+@lru_cache(maxsize=8192)
+def parse_release(name: str) -> ParsedRelease:
+    """
+    Parse a release or folder name.
+
+    Recognises SxxEyy (including multi-episode forms), 1x02, daily
+    (2023.10.05), season packs (S02, S01-S03, Season 1) and anime absolute
+    numbering ("[Group] Title - 1071"). Results are cached, so parsing the
+    same folder names again on every poll is cheap.
+
+    Args:
+        name: Release, file or folder name
+
+    Returns:
+        ParsedRelease: kind is None if no numbering was found; series_title
+            is then the whole cleaned name
+    """
+    text = _EXTENSION.sub("", name.strip())
+    release_group = None
+    leading = _LEADING_GROUP.match(text)
+    if leading:
+        release_group = leading.group("group")
+        text = text[leading.end():]
+    resolution_match = _RESOLUTION.search(text)
+    resolution = f"{resolution_match.group(1)}p" if resolution_match else None
+    trailing = _TRAILING_GROUP.search(text)
+    if trailing and not release_group and not _NOT_A_GROUP.match(trailing.group("group")):
+        release_group = trailing.group("group")
+    text = _SEPARATORS.sub(" ", _BRACKETS.sub(" ", text)).strip()
+
+    fields: Dict[str, Any] = {"resolution": resolution, "release_group": release_group}
+    match = _EPISODE.match(text)
+    if match:
+        fields.update(kind=ParsedRelease.EPISODE, season=int(match.group("season")),
+                      episodes=_episode_numbers(match.group("episodes")))
+    elif _CROSS_EPISODE.match(text):
+        match = _CROSS_EPISODE.match(text)
+        fields.update(kind=ParsedRelease.EPISODE, season=int(match.group("season")),
+                      episodes=[int(match.group("episode"))])
+    elif _DAILY.match(text) and _valid_date(*_DAILY.match(text).group("year", "month", "day")):
+        match = _DAILY.match(text)
+        fields.update(kind=ParsedRelease.DAILY, air_date="-".join(match.group("year", "month", "day")))
+    elif _SEASON_PACK.match(text):
+        match = _SEASON_PACK.match(text)
+        first = int(match.group("season") or match.group("season_word"))
+        last = match.group("season_end") or match.group("season_word_end")
+        last = int(last) if last else first
+        fields.update(kind=ParsedRelease.SEASON_PACK, season=first,
+                      seasons=list(range(first, max(first, last) + 1)))
+    else:
+        match = _ABSOLUTE.match(text)
+        if match and match.group("absolute") not in _RESOLUTION_WORDS and not _YEAR.search(
+                match.group("title") + " " + match.group("absolute")):
+            first = int(match.group("absolute"))
+            last = int(match.group("absolute_end")) if match.group("absolute_end") else first
+            fields.update(kind=ParsedRelease.ABSOLUTE,
+                          absolute_episodes=list(range(first, max(first, last) + 1)))
+        else:
+            match = None
+
+    if match:
+        title = _clean_title(match.group("title"))
+    else:
+        # No numbering: a folder named after the series; drop quality and group words
+        quality = _RESOLUTION.search(text)
+        title = _clean_title(text[:quality.start()] if quality and quality.start() > 0 else text)
+        if trailing and release_group == trailing.group("group") and title.endswith(release_group):
+            title = _clean_title(title[:-len(release_group)])
+    year = _YEAR.search(title)
+    return ParsedRelease(name, title, year=int(year.group(1)) if year else None, **fields)
+
+
+def _valid_date(year: str, month: str, day: str) -> bool:
+    try:
+        date(int(year), int(month), int(day))
+    except ValueError:
+        return False
+    return True
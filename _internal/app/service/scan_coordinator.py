@@ -0,0 +1,254 @@
+"""
+Coalesced Sonarr DownloadedEpisodesScan commands with completion tracking.
+"""
+import os
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, List
+from ..api.sonarr_client import SonarrClient
+from ..api.resilience import UpstreamUnavailableError
+
+# Command states after which Sonarr does no more work
+FINISHED_STATES = ("completed", "failed", "aborted", "cancelled", "orphaned")
+
+class ScanJob:
+    """One DownloadedEpisodesScan for a path, from the first request until Sonarr finishes it."""
+
+    def __init__(self, path: str, initial_delay: float):
+        self.path = path
+        self.command_id: Optional[int] = None
+        self.status = "pending"
+        self.requests = 1
+        self.attempts = 0
+        self.delay = initial_delay
+        self.requested_at = time.time()
+        self.sent_at: Optional[float] = None
+        self.merged = False
+        self.future: Future = Future()
+
+
+class ScanCoordinator:
+    """Merge scan requests per path and follow each command until Sonarr finishes it.
+
+    `request_scan()` returns immediately with a future for the finished
+    command. Requests for the same path within `window` seconds of the
+    first share one command, and a request for a folder absorbs pending
+    requests for paths inside it, so a burst of completed downloads
+    triggers one scan per distinct location. Once sent, a command is polled
+    with backoff until Sonarr reports it finished; the time from sending to
+    finishing is kept as the command latency.
+    """
+
+    def __init__(self, sonarr: SonarrClient, window: float = 2.0, initial_delay: float = 1.0,
+                 max_delay: float = 15.0, backoff: float = 1.5, timeout: float = 3600.0):
+        self.sonarr = sonarr
+        self.window = window
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.timeout = timeout
+        # Jobs whose command has not been sent yet, by path
+        self._pending: Dict[str, ScanJob] = {}
+        self._active: List[ScanJob] = []
+        self._schedule: List[Any] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._requests = 0
+        self._commands = 0
+        self._failed = 0
+        self._latencies = deque(maxlen=200)
+
+    def start(self) -> None:
+        """Start the scheduling thread if it is not already running."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="sonarr-scans", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the scheduling thread. Pending scans stay unresolved."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def request_scan(self, path: str) -> Future:
+        """
+        Ask Sonarr to import what is at a path.
+
+        Args:
+            path: Downloaded file or folder
+
+        Returns:
+            Future: Resolves to the final command state from Sonarr, with
+                `latency` in seconds, once the command completes; fails with
+                RuntimeError if the scan could not be sent, ended in any
+                other finished state or timed out
+        """
+        self.start()
+        path = os.path.normpath(path)
+        with self._condition:
+            self._requests += 1
+            for pending_path, job in self._pending.items():
+                if path == pending_path or path.startswith(pending_path.rstrip(os.sep) + os.sep):
+                    # Already covered by a scan that has not been sent yet
+                    job.requests += 1
+                    return job.future
+
+            job = ScanJob(path, self.initial_delay)
+            # A folder scan covers pending scans of paths inside it
+            for pending_path in list(self._pending):
+                if pending_path.startswith(path.rstrip(os.sep) + os.sep):
+                    absorbed = self._pending.pop(pending_path)
+                    absorbed.merged = True
+                    self._active.remove(absorbed)
+                    job.requests += absorbed.requests
+                    job.future.add_done_callback(lambda f, absorbed=absorbed: _copy_result(f, absorbed.future))
+            self._pending[path] = job
+            self._active.append(job)
+            self._schedule_locked(job, self.window)
+            return job.future
+
+    def request_scans(self, paths: List[str]) -> List[Future]:
+        """Request scans for several paths at once."""
+        return [self.request_scan(path) for path in paths]
+
+    def _schedule_locked(self, job: ScanJob, delay: float) -> None:
+        heapq.heappush(self._schedule, (time.monotonic() + delay, next(self._counter), job))
+        self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running:
+                    if self._schedule and self._schedule[0][0] <= time.monotonic():
+                        break
+                    timeout = self._schedule[0][0] - time.monotonic() if self._schedule else None
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+                _, _, job = heapq.heappop(self._schedule)
+                if job.merged:
+                    continue
+                if job.command_id is None:
+                    # The window is over; later requests for this path get a new scan
+                    self._pending.pop(job.path, None)
+
+            try:
+                self._poll(job)
+            except UpstreamUnavailableError as e:
+                # Sonarr is down; send or poll again later, until the timeout
+                self._retry_or_fail(job, f"Scan tracking failed: {e}", unsent_retry=True)
+            except Exception as e:
+                self._retry_or_fail(job, f"Scan tracking failed: {e}")
+
+    def _poll(self, job: ScanJob) -> None:
+        """Send the job's command or check on it, and reschedule it if needed."""
+        job.attempts += 1
+
+        if job.command_id is None:
+            result = self.sonarr.command_download_scan(job.path)
+            if not result.get("id"):
+                self._finish(job, error=f"Sonarr did not accept the scan: {result.get('message', result)}")
+                return
+            job.command_id = result["id"]
+            job.status = result.get("status", "queued")
+            job.sent_at = time.time()
+            with self._condition:
+                self._commands += 1
+        else:
+            data = self.sonarr.get_command(job.command_id)
+            job.status = data.get("status", job.status)
+            if job.status in FINISHED_STATES:
+                self._finish(job, data)
+                return
+
+        if time.time() - job.requested_at > self.timeout:
+            self._finish(job, error="Timed out waiting for the scan to finish")
+            return
+
+        with self._condition:
+            self._schedule_locked(job, job.delay)
+            job.delay = min(job.delay * self.backoff, self.max_delay)
+
+    def _retry_or_fail(self, job: ScanJob, error: str, unsent_retry: bool = False) -> None:
+        """Poll again later after a failed call, until the timeout. Unsent scans fail unless unsent_retry."""
+        if (job.command_id is None and not unsent_retry) or time.time() - job.requested_at > self.timeout:
+            self._finish(job, error=error)
+            return
+        with self._condition:
+            self._schedule_locked(job, job.delay)
+            job.delay = min(job.delay * self.backoff, self.max_delay)
+
+    def _finish(self, job: ScanJob, data: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        latency = time.time() - job.sent_at if job.sent_at else None
+        with self._condition:
+            if job in self._active:
+                self._active.remove(job)
+            if latency is not None and data is not None:
+                self._latencies.append(latency)
+            if not error and data.get("status") != "completed":
+                # Sonarr gave up on the command: failed, aborted, cancelled or orphaned
+                error = f"Scan {data.get('status')}: {data.get('message') or 'no message from Sonarr'}"
+            if error:
+                self._failed += 1
+        if error:
+            job.status = "failed"
+            job.future.set_exception(RuntimeError(error))
+        else:
+            job.future.set_result({**data, "path": job.path, "requests": job.requests,
+                                   "latency": round(latency, 3) if latency is not None else None})
+
+    def get_jobs(self) -> List[Dict[str, Any]]:
+        """Get the scans waiting to be sent or to finish."""
+        with self._condition:
+            jobs = list(self._active)
+        return [
+            {
+                "path": job.path,
+                "command_id": job.command_id,
+                "status": job.status,
+                "requests": job.requests,
+                "attempts": job.attempts,
+                "waiting_seconds": round(time.time() - job.requested_at, 1)
+            }
+            for job in jobs
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request and command counts and the latency of recent commands."""
+        with self._condition:
+            latencies = sorted(self._latencies)
+            requests, commands, failed = self._requests, self._commands, self._failed
+        return {
+            "requests": requests,
+            "commands": commands,
+            "coalesced": max(requests - commands, 0),
+            "failed": failed,
+            "latency": {
+                "count": len(latencies),
+                "average": round(sum(latencies) / len(latencies), 3) if latencies else None,
+                "p95": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+                "max": round(latencies[-1], 3) if latencies else None
+            },
+            "jobs": self.get_jobs()
+        }
+
+
+def _copy_result(source: Future, target: Future) -> None:
+    """Resolve target with the outcome of a finished source future."""
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
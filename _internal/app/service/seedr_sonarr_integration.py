@@ -2,30 +2,48 @@
 Integration service for Seedr and Sonarr.
 """
 import os
-import json
 import re
-import time
+import base64
+import threading
+from concurrent.futures import Future
 from typing import Dict, Any, Optional, List
 from ..api.seedr_client import SeedrClient
 from ..api.sonarr_client import SonarrClient
+from ..api.bencode import TorrentInfo, BencodeError, parse_torrent
+from ..api.http_session import get_shared_session
+from ..api.resilience import UpstreamUnavailableError
 from ..config import Config
+from .mapping_store import MappingStore
+from .transfer_scheduler import TransferScheduler, TransferJob
+from .archive_tracker import ArchiveTracker
+from .scan_coordinator import ScanCoordinator
 
 class SeedrSonarrIntegration:
     def __init__(self, config: Optional[Config] = None, strict_validation: bool = True):
         self.config = config or Config.from_env()
         self.config.validate(strict=strict_validation)
-        self.seedr = SeedrClient(self.config.seedr)
-        self.sonarr = SonarrClient(self.config.sonarr)
-        # Set up download directory and mapping file
+        self.session = get_shared_session(self.config.http)
+        self.seedr = SeedrClient(self.config.seedr, self.session, self.config.download)
+        self.sonarr = SonarrClient(self.config.sonarr, self.session)
+        # Set up download directory and mapping store
         if self.config.download.download_dir:
-            self.mapping_file = os.path.join(self.config.download.download_dir, "download_mappings.json")
-            # Ensure download directory exists
-            os.makedirs(self.config.download.download_dir, exist_ok=True)
+            mapping_dir = self.config.download.download_dir
         else:
             # Use a default location if not configured
-            default_dir = os.path.join(os.getcwd(), "downloads")
-            self.mapping_file = os.path.join(default_dir, "download_mappings.json")
-            os.makedirs(default_dir, exist_ok=True)
+            mapping_dir = os.path.join(os.getcwd(), "downloads")
+        os.makedirs(mapping_dir, exist_ok=True)
+        # Legacy JSON mappings are imported into the store on first start
+        self.mapping_file = os.path.join(mapping_dir, "download_mappings.json")
+        self.store = MappingStore(
+            os.path.join(mapping_dir, "download_mappings.db"),
+            legacy_json_path=self.mapping_file
+        )
+        self.transfers = TransferScheduler(
+            max_workers=self.config.download.transfer_workers,
+            per_title_limit=self.config.download.per_title_transfers
+        )
+        self.archives = ArchiveTracker(self.seedr)
+        self.scans = ScanCoordinator(self.sonarr, window=self.config.sonarr.scan_window)
 
     def add_download(self, title: str, download_url: str, series_id: Optional[int] = None) -> Dict[str, Any]:
         """Add a download to Seedr and return the response."""
@@ -39,6 +57,8 @@ class SeedrSonarrIntegration:
                     # Format it exactly like the working example
                     download_url = f"https://yts.mx/torrent/download/{torrent_hash}"
 
+            infohash = self._infohash_from_url(download_url)
+
             # Add torrent to Seedr using the Tasks API
             result = self.seedr.add_torrent(download_url)
             
@@ -47,7 +67,7 @@ class SeedrSonarrIntegration:
                 wishlist_item = result.get("wt", {})
                 task_id = wishlist_item.get("id")
                 if task_id:
-                    self._store_download_mapping(title, task_id, series_id)
+                    self._store_download_mapping(title, task_id, series_id, infohash)
                     return {
                         "success": True,
                         "message": f"Added {title} to Seedr wishlist (not enough space)",
@@ -74,51 +94,119 @@ class SeedrSonarrIntegration:
                     }
             
             # Store mapping of Sonarr title to Seedr task ID
-            self._store_download_mapping(title, task_id, series_id)
+            self._store_download_mapping(title, task_id, series_id, infohash or result.get("torrent_hash"))
             
             return {
                 "success": True,
                 "message": f"Added {title} to Seedr",
                 "download_id": task_id
             }
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             return {
                 "success": False,
                 "message": f"Failed to add download: {str(e)}"
             }
 
-    def _store_download_mapping(self, title: str, torrent_id: str, series_id: Optional[int] = None) -> None:
+    def add_torrent(self, torrent: TorrentInfo, title: Optional[str] = None, series_id: Optional[int] = None,
+                    account_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Add a parsed .torrent to Seedr after checking its size.
+
+        Seedr takes torrents as magnet links, so the torrent is submitted as
+        a magnet built from its infohash and trackers.
+
+        Args:
+            torrent: Parsed torrent metadata
+            title: Title to store the download under (defaults to the torrent name)
+            series_id: Sonarr series ID
+            account_info: Seedr account info for the space check, if already known
+
+        Returns:
+            Dict[str, Any]: Result of add_download, the existing download if
+                the torrent was already added, or a failure with
+                permanent=True if the torrent is too large to ever be added
+        """
+        title = title or torrent.name
+        existing = self.store.get_by_infohash(torrent.infohash)
+        if existing:
+            # The same torrent saved again under another file name
+            return {
+                "success": True,
+                "message": f"{title} is already on Seedr as {existing['title']}",
+                "download_id": existing["torrent_id"]
+            }
+
+        max_size = self.config.download.max_torrent_size
+        if max_size and torrent.total_size > max_size:
+            return {
+                "success": False,
+                "permanent": True,
+                "message": f"{title} is {torrent.total_size} bytes, over the {max_size} byte limit"
+            }
+
+        space_max = self._account_space_max(account_info or {})
+        if space_max and torrent.total_size > space_max:
+            return {
+                "success": False,
+                "permanent": True,
+                "message": f"{title} is {torrent.total_size} bytes, larger than the Seedr account ({space_max} bytes)"
+            }
+
+        return self.add_download(title, torrent.magnet_link(), series_id)
+
+    def add_torrent_file(self, file_path: str, title: Optional[str] = None, series_id: Optional[int] = None,
+                         account_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Parse a .torrent file and add it to Seedr. See add_torrent."""
+        try:
+            with open(file_path, 'rb') as f:
+                torrent = parse_torrent(f.read())
+        except BencodeError as e:
+            return {"success": False, "permanent": True, "message": f"Invalid torrent file: {e}"}
+        return self.add_torrent(torrent, title or os.path.basename(file_path), series_id, account_info)
+
+    @staticmethod
+    def _account_space_max(account_info: Dict[str, Any]) -> int:
+        """Get the account's total storage in bytes from Seedr account info, or 0 if unknown."""
+        for section in (account_info, account_info.get("account"), account_info.get("user")):
+            if isinstance(section, dict) and isinstance(section.get("space_max"), (int, float)):
+                return int(section["space_max"])
+        return 0
+
+    @staticmethod
+    def _infohash_from_url(download_url: str) -> Optional[str]:
+        """Extract the hex infohash from a magnet link, if there is one."""
+        match = re.search(r'xt=urn:btih:([a-zA-Z0-9]+)', download_url)
+        if not match:
+            return None
+        btih = match.group(1)
+        if len(btih) == 40:
+            return btih.lower()
+        if len(btih) == 32:
+            # Base32-encoded infohash
+            try:
+                return base64.b32decode(btih.upper()).hex()
+            except Exception:
+                return None
+        return None
+
+    def _store_download_mapping(self, title: str, torrent_id: str, series_id: Optional[int] = None,
+                                infohash: Optional[str] = None) -> None:
         """Store mapping between Sonarr title and Seedr torrent ID."""
         try:
-            mappings = {}
-            if os.path.exists(self.mapping_file):
-                with open(self.mapping_file, 'r') as f:
-                    mappings = json.load(f)
-            
-            mappings[title] = {
-                "torrent_id": torrent_id,
-                "series_id": series_id,
-                "added_at": time.time()
-            }
-            
-            with open(self.mapping_file, 'w') as f:
-                json.dump(mappings, f)
+            self.store.upsert(title, torrent_id, series_id, infohash)
         except Exception as e:
             print(f"Error storing download mapping: {e}")
 
     def check_download_status(self, title: str) -> Dict[str, Any]:
         """Check the status of a download."""
         try:
-            if not os.path.exists(self.mapping_file):
-                return {"status": "unknown", "message": "No download mapping found"}
-
-            with open(self.mapping_file, 'r') as f:
-                mappings = json.load(f)
-
-            if title not in mappings:
+            mapping = self.store.get(title)
+            if not mapping:
                 return {"status": "unknown", "message": "Download not found"}
 
-            torrent_id = mappings[title]["torrent_id"]
+            torrent_id = mapping["torrent_id"]
 
             # Try to get status using the Tasks API
             try:
@@ -138,6 +226,8 @@ class SeedrSonarrIntegration:
                     "progress": status.get("progress", 0),
                     "message": status.get("message", "")
                 }
+            except UpstreamUnavailableError:
+                raise
             except Exception as e:
                 if self.seedr.verbose_logging:
                     print(f"Error getting task status with tasks API: {e}")
@@ -152,6 +242,8 @@ class SeedrSonarrIntegration:
                     "progress": status.get("progress", 0),
                     "message": status.get("message", "")
                 }
+            except UpstreamUnavailableError:
+                raise
             except Exception as e:
                 # If the ID is a hash, the torrent might be completed and moved to a folder
                 if len(torrent_id) == 40:  # SHA-1 hash length
@@ -172,22 +264,19 @@ class SeedrSonarrIntegration:
                 # If we can't find it, return error
                 return {"status": "error", "message": str(e)}
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
     def get_downloaded_files(self, title: str) -> Dict[str, Any]:
         """Get downloaded files for a title."""
         try:
-            if not os.path.exists(self.mapping_file):
-                return {"success": False, "message": "No download mapping found"}
-
-            with open(self.mapping_file, 'r') as f:
-                mappings = json.load(f)
-
-            if title not in mappings:
+            mapping = self.store.get(title)
+            if not mapping:
                 return {"success": False, "message": "Download not found"}
 
-            torrent_id = mappings[title]["torrent_id"]
+            torrent_id = mapping["torrent_id"]
             
             # First try to get contents using the Tasks API
             try:
@@ -201,6 +290,8 @@ class SeedrSonarrIntegration:
                             "success": True,
                             "files": contents
                         }
+            except UpstreamUnavailableError:
+                raise
             except Exception as e:
                 if self.seedr.verbose_logging:
                     print(f"Error getting task contents with tasks API: {e}")
@@ -219,17 +310,52 @@ class SeedrSonarrIntegration:
                             "success": True,
                             "files": contents
                         }
+            except UpstreamUnavailableError:
+                raise
             except Exception as e:
                 if self.seedr.verbose_logging:
                     print(f"Error getting folder contents: {e}")
             
             return {"success": False, "message": "No files found or download not completed"}
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             return {"success": False, "message": str(e)}
 
     def download_completed_files(self, title: str, save_path: Optional[str] = None) -> Dict[str, Any]:
-        """Download completed files for a title."""
+        """
+        Queue the completed files of a title for download and return without waiting.
+
+        Progress is visible in the transfer scheduler's stats. Use
+        schedule_completed_files for a future of the final result.
+
+        Returns:
+            Dict[str, Any]: queued=True once the files are queued, or the
+                failure if nothing could be queued
+        """
+        future = self.schedule_completed_files(title, save_path)
+        future.add_done_callback(lambda f: self._log_transfer_result(title, f))
+        if future.done():
+            # Failed before anything was queued
+            return future.result()
+        return {"success": True, "queued": True, "message": f"Queued files of {title} for download"}
+
+    @staticmethod
+    def _log_transfer_result(title: str, future: Future) -> None:
+        result = future.result()
+        if not result.get("success"):
+            print(f"Transfer of {title} failed: {result.get('message')}")
+
+    def schedule_completed_files(self, title: str, save_path: Optional[str] = None) -> Future:
+        """
+        Queue the completed files of a title on the transfer scheduler.
+
+        Returns a future that resolves once every file of the title has
+        finished, with the downloaded paths in "downloaded_files" and a
+        per-file entry in "results".
+        """
+        done: Future = Future()
         try:
             if not save_path:
                 save_path = self.config.download.download_dir
@@ -238,57 +364,140 @@ class SeedrSonarrIntegration:
             files_result = self.get_downloaded_files(title)
             
             if not files_result.get("success"):
-                return files_result
+                done.set_result(files_result)
+                return done
             
-            files = files_result.get("files", [])
+            files = [item for item in files_result.get("files", []) if item.get("type") in ("file", "folder")]
             
             if not files:
-                return {"success": False, "message": "No files to download"}
+                done.set_result({"success": False, "message": "No files to download"})
+                return done
             
             # Create the save directory if it doesn't exist
             os.makedirs(save_path, exist_ok=True)
             
-            # Track downloaded files
-            downloaded_files = []
+            results: List[Dict[str, Any]] = []
+            results_lock = threading.Lock()
             
-            # Process files and folders
-            for item in files:
-                if item.get("type") == "file":
-                    # Download file
-                    file_id = item.get("id")
-                    file_name = item.get("name")
-                    file_path = os.path.join(save_path, file_name)
-                    
-                    if self.seedr.download_file(file_id, file_path):
-                        downloaded_files.append(file_path)
-                elif item.get("type") == "folder":
-                    # Download folder as archive
-                    folder_id = item.get("id")
-                    folder_name = item.get("name")
-                    archive_path = os.path.join(save_path, f"{folder_name}.zip")
-                    
-                    if self.seedr.download_folder_as_archive(folder_id, archive_path):
-                        downloaded_files.append(archive_path)
+            def on_transfer_done(future: Future, item: Dict[str, Any]) -> None:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"name": item.get("name"), "type": item.get("type"), "success": False, "message": str(e)}
+                with results_lock:
+                    results.append(result)
+                    finished = len(results) == len(files)
+                if finished:
+                    done.set_result(self._summarize_transfers(results))
             
-            return {
-                "success": True,
-                "downloaded_files": downloaded_files,
-                "message": f"Downloaded {len(downloaded_files)} files"
-            }
+            # Start every folder archive up front so they generate in parallel
+            self.archives.track_many([item.get("id") for item in files if item.get("type") == "folder"])
+            
+            for item in files:
+                future = self._schedule_item(title, item, save_path)
+                future.add_done_callback(lambda f, item=item: on_transfer_done(f, item))
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
-            return {"success": False, "message": str(e)}
+            if not done.done():
+                done.set_result({"success": False, "message": str(e)})
+        return done
+
+    def _schedule_item(self, title: str, item: Dict[str, Any], save_path: str) -> Future:
+        """
+        Queue the transfer of one Seedr file or folder.
+
+        Folders first wait on the archive tracker; the transfer job is only
+        queued once Seedr has the zip ready, so no worker sits idle while an
+        archive generates.
+        """
+        size = int(item.get("size") or 0)
+        if item.get("type") != "folder":
+            return self.transfers.submit(TransferJob(
+                title, item.get("name", ""), lambda: self._transfer_item(item, save_path), size=size,
+                key=self._transfer_key(item, save_path)
+            ))
+
+        result: Future = Future()
+
+        def on_archive_ready(archive_future: Future) -> None:
+            try:
+                url = archive_future.result()
+            except Exception as e:
+                result.set_result({"name": item.get("name"), "type": "folder", "success": False, "message": str(e)})
+                return
+            transfer = self.transfers.submit(TransferJob(
+                title, item.get("name", ""), lambda: self._transfer_item(item, save_path, url), size=size,
+                key=self._transfer_key(item, save_path)
+            ))
+            transfer.add_done_callback(lambda f: _copy_result(f, result))
+
+        self.archives.track(item.get("id")).add_done_callback(on_archive_ready)
+        return result
+
+    @staticmethod
+    def _transfer_key(item: Dict[str, Any], save_path: str) -> str:
+        """Key a transfer by where it writes, so a title scheduled twice is transferred once."""
+        return os.path.join(os.path.abspath(save_path), item.get("name", ""))
+
+    def _transfer_item(self, item: Dict[str, Any], save_path: str, archive_url: Optional[str] = None) -> Dict[str, Any]:
+        """Transfer one Seedr file or ready folder archive to save_path and report the outcome."""
+        name = item.get("name")
+        if item.get("type") == "folder":
+            if self._stream_extract_enabled(save_path):
+                # Extract entries as they arrive, without writing the archive
+                target = os.path.join(save_path, name)
+                if self.seedr.extract_url(archive_url, target, strip_prefix=name):
+                    return {"name": name, "type": "folder", "path": target, "success": True,
+                            "extracted": True, "message": "Extracted"}
+                if self.seedr.verbose_logging:
+                    print(f"Streaming extraction of {name} failed, saving the archive instead")
+            # Download folder as archive
+            target = os.path.join(save_path, f"{name}.zip")
+            success = self.seedr.download_url(archive_url, target)
+        else:
+            target = os.path.join(save_path, name)
+            size = int(item.get("size") or 0)
+            if size and os.path.exists(target) and os.path.getsize(target) == size:
+                return {"name": name, "type": "file", "path": target, "success": True,
+                        "skipped": True, "message": "Already downloaded"}
+            success = self.seedr.download_file(item.get("id"), target)
+        
+        return {
+            "name": name,
+            "type": item.get("type"),
+            "path": target,
+            "success": success,
+            "message": "Downloaded" if success else "Transfer failed"
+        }
+
+    def _stream_extract_enabled(self, save_path: str) -> bool:
+        """Check whether folder archives saved under save_path should be extracted while streaming."""
+        path = os.path.abspath(save_path)
+        for directory in self.config.download.stream_extract_dirs:
+            directory = os.path.abspath(directory)
+            if path == directory or path.startswith(directory + os.sep):
+                return True
+        return False
+
+    @staticmethod
+    def _summarize_transfers(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-file transfer results into the title result."""
+        downloaded_files = [r["path"] for r in results if r.get("success") and r.get("path")]
+        failed = [r for r in results if not r.get("success")]
+        return {
+            "success": not failed,
+            "downloaded_files": downloaded_files,
+            "results": results,
+            "message": f"Downloaded {len(downloaded_files)} files" + (f", {len(failed)} failed" if failed else "")
+        }
 
     def notify_sonarr(self, title: str) -> Dict[str, Any]:
         """Notify Sonarr of downloaded files."""
         try:
-            if not os.path.exists(self.mapping_file):
-                return {"success": False, "message": "No download mapping found"}
-
-            with open(self.mapping_file, 'r') as f:
-                mappings = json.load(f)
-
-            if title not in mappings:
+            mapping = self.store.get(title)
+            if not mapping:
                 return {"success": False, "message": "Download not found"}
             
             # Download the files if needed
@@ -298,38 +507,58 @@ class SeedrSonarrIntegration:
             if not download_path:
                 return {"success": False, "message": "Download directory not set"}
             
-            # Download files
-            download_result = self.download_completed_files(title, download_path)
-            
-            if not download_result.get("success"):
-                return download_result
-            
-            # Trigger Sonarr scan
-            scan_result = self.sonarr.command_download_scan(download_path)
+            # Download files; Sonarr is notified once every file has arrived
+            future = self.schedule_completed_files(title, download_path)
+            future.add_done_callback(lambda f: self._scan_downloaded(title, download_path, f))
+            if future.done():
+                result = future.result()
+                if not result.get("success"):
+                    return result
             
             return {
                 "success": True,
-                "message": "Notified Sonarr of downloaded files",
-                "sonarr_response": scan_result,
-                "downloaded_files": download_result.get("downloaded_files", [])
+                "queued": True,
+                "message": f"Downloading files of {title}; Sonarr will be notified when they arrive"
             }
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             return {"success": False, "message": str(e)}
 
+    def _scan_downloaded(self, title: str, download_path: str, future: Future) -> None:
+        """Ask Sonarr to scan what a finished title transfer saved."""
+        result = future.result()
+        if not result.get("success"):
+            print(f"Not notifying Sonarr of {title}: {result.get('message')}")
+            return
+        # Scan only what this title saved; scans requested close together share one command per path
+        self.scans.request_scans(self._scan_paths(download_path, result.get("downloaded_files", [])))
+
+    @staticmethod
+    def _scan_paths(download_path: str, files: List[str]) -> List[str]:
+        """Get the top-level items under download_path that contain the given files."""
+        root = os.path.abspath(download_path)
+        paths = []
+        for file_path in files:
+            relative = os.path.relpath(os.path.abspath(file_path), root)
+            if relative.startswith(os.pardir):
+                # Saved outside the download directory; scan it where it is
+                path = os.path.abspath(file_path)
+            else:
+                path = os.path.join(root, relative.split(os.sep)[0])
+            if path not in paths:
+                paths.append(path)
+        return paths or [root]
+
     def pause_download(self, title: str) -> Dict[str, Any]:
         """Pause a download."""
         try:
-            if not os.path.exists(self.mapping_file):
-                return {"success": False, "message": "No download mapping found"}
-
-            with open(self.mapping_file, 'r') as f:
-                mappings = json.load(f)
-
-            if title not in mappings:
+            mapping = self.store.get(title)
+            if not mapping:
                 return {"success": False, "message": "Download not found"}
 
-            torrent_id = mappings[title]["torrent_id"]
+            torrent_id = mapping["torrent_id"]
             
             # Check if the download is active
             status = self.check_download_status(title)
@@ -352,22 +581,19 @@ class SeedrSonarrIntegration:
                     "message": f"Download not in progress (status: {status.get('status')})"
                 }
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             return {"success": False, "message": str(e)}
 
     def resume_download(self, title: str) -> Dict[str, Any]:
         """Resume a paused download."""
         try:
-            if not os.path.exists(self.mapping_file):
-                return {"success": False, "message": "No download mapping found"}
-
-            with open(self.mapping_file, 'r') as f:
-                mappings = json.load(f)
-
-            if title not in mappings:
+            mapping = self.store.get(title)
+            if not mapping:
                 return {"success": False, "message": "Download not found"}
 
-            torrent_id = mappings[title]["torrent_id"]
+            torrent_id = mapping["torrent_id"]
             
             # Check if the download is paused
             status = self.check_download_status(title)
@@ -390,31 +616,24 @@ class SeedrSonarrIntegration:
                     "message": f"Download not paused (status: {status.get('status')})"
                 }
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             return {"success": False, "message": str(e)}
 
     def delete_download(self, title: str) -> Dict[str, Any]:
         """Delete a download."""
         try:
-            if not os.path.exists(self.mapping_file):
-                return {"success": False, "message": "No download mapping found"}
-
-            with open(self.mapping_file, 'r') as f:
-                mappings = json.load(f)
-
-            if title not in mappings:
+            mapping = self.store.get(title)
+            if not mapping:
                 return {"success": False, "message": "Download not found"}
 
-            torrent_id = mappings[title]["torrent_id"]
+            torrent_id = mapping["torrent_id"]
             
             # Delete the torrent
             if self.seedr.delete_torrent(torrent_id):
                 # Remove from mappings
-                del mappings[title]
-                
-                # Save updated mappings
-                with open(self.mapping_file, 'w') as f:
-                    json.dump(mappings, f)
+                self.store.delete(title)
                 
                 return {
                     "success": True,
@@ -426,19 +645,96 @@ class SeedrSonarrIntegration:
                     "message": "Failed to delete download"
                 }
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             return {"success": False, "message": str(e)}
 
+    def _index_seedr_state(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Fetch every task and the root folder listing once and index them.
+
+        Returns lookup tables keyed by task id and by lower-cased torrent hash,
+        so any number of mappings can be resolved without further API calls.
+
+        Raises:
+            Exception: If either listing cannot be fetched; an empty index
+                would report every download as missing
+        """
+        tasks = self.seedr.fetch_tasks()
+        if isinstance(tasks, dict):
+            tasks = tasks.get("tasks", [])
+        folders = self.seedr.fetch_folder_contents("0")  # Root folder
+
+        tasks_by_id = {}
+        tasks_by_hash = {}
+        for task in tasks or []:
+            if task.get("id") is not None:
+                tasks_by_id[str(task["id"])] = task
+            task_hash = task.get("torrent_hash") or task.get("hash")
+            if task_hash:
+                tasks_by_hash[task_hash.lower()] = task
+
+        folders_by_hash = {}
+        for folder in folders:
+            if folder.get("type") == "folder" and folder.get("torrent_hash"):
+                folders_by_hash[folder["torrent_hash"].lower()] = folder
+
+        return {
+            "tasks_by_id": tasks_by_id,
+            "tasks_by_hash": tasks_by_hash,
+            "folders_by_hash": folders_by_hash
+        }
+
+    def _resolve_status(self, torrent_id: str, index: Dict[str, Dict[str, Dict[str, Any]]],
+                        infohash: Optional[str] = None) -> Dict[str, Any]:
+        """Resolve the status of one download against a prefetched Seedr index."""
+        key = str(torrent_id)
+        # Older mappings have no infohash; their torrent id may itself be the hash
+        task_hash = (infohash or key).lower()
+        task = index["tasks_by_id"].get(key) or index["tasks_by_hash"].get(task_hash)
+        if task:
+            return {
+                "status": task.get("status", "downloading"),
+                "progress": task.get("progress", 0),
+                "message": task.get("message", "")
+            }
+
+        folder = index["folders_by_hash"].get(task_hash)
+        if folder:
+            return {
+                "status": "completed",
+                "progress": 100,
+                "message": "Download completed and moved to folder",
+                "folder_id": folder.get("id")
+            }
+
+        return {"status": "unknown", "progress": 0, "message": "Torrent not found"}
+
     def poll_downloads(self) -> List[Dict[str, Any]]:
-        """Poll all downloads and return their status."""
+        """
+        Poll all downloads and return their status.
+
+        Raises:
+            UpstreamUnavailableError: If Seedr cannot be reached, so callers
+                keep their last known states instead of showing every
+                download as failed
+        """
         try:
-            if not os.path.exists(self.mapping_file):
-                return []
-
-            with open(self.mapping_file, 'r') as f:
-                mappings = json.load(f)
+            mappings = self.store.all()
 
             results = []
+            if not mappings:
+                return results
+            
+            # Resolve every mapping against a single tasks call and root listing
+            try:
+                index = self._index_seedr_state()
+                index_error = None
+            except UpstreamUnavailableError:
+                raise
+            except Exception as e:
+                index, index_error = None, f"Error: {e}"
             
             for title, mapping in mappings.items():
                 torrent_id = mapping["torrent_id"]
@@ -446,7 +742,10 @@ class SeedrSonarrIntegration:
                 added_at = mapping.get("added_at", 0)
                 
                 # Get status
-                status = self.check_download_status(title)
+                if index is None:
+                    status = {"status": "error", "progress": 0, "message": index_error}
+                else:
+                    status = self._resolve_status(torrent_id, index, mapping.get("infohash"))
                 
                 # Add to results
                 results.append({
@@ -456,11 +755,23 @@ class SeedrSonarrIntegration:
                     "added_at": added_at,
                     "status": status.get("status", "unknown"),
                     "progress": status.get("progress", 0),
-                    "message": status.get("message", "")
+                    "message": status.get("message", ""),
+                    "folder_id": status.get("folder_id")
                 })
             
             return results
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             print(f"Error polling downloads: {e}")
-            return [] 
\ No newline at end of file
+            return [] 
+
+
+def _copy_result(source: Future, target: Future) -> None:
+    """Resolve target with the outcome of a finished source future."""
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
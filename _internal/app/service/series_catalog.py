@@ -0,0 +1,205 @@
+"""
+In-memory catalogue of Sonarr series, indexed for lookups without a Sonarr call.
+"""
+import os
+import re
+import time
+import threading
+import unicodedata
+from typing import Dict, Any, List, Optional, Iterable
+from ..api.sonarr_client import SonarrClient
+
+# Fields returned when a caller does not ask for others
+COMPACT_FIELDS = ("id", "title", "year", "tvdbId", "path", "monitored", "seasonCount")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_TRAILING_YEAR = re.compile(r"\s*\(?\b(19|20)\d{2}\)?\s*$")
+
+def normalize_title(title: str) -> str:
+    """
+    Reduce a title to lowercase ASCII letters and digits.
+
+    "The Office (US)", "the.office.us" and "The Office US" all become
+    "theofficeus", so titles match however a release or a user writes them.
+
+    Args:
+        title: Series or release title
+
+    Returns:
+        str: Normalized title
+    """
+    ascii_title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM.sub("", ascii_title.lower().replace("&", "and"))
+
+
+def _normalize_path(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+class _Index:
+    """One immutable generation of the catalogue and its indexes."""
+
+    def __init__(self, series: List[Dict[str, Any]]):
+        self.series = series
+        self.by_id: Dict[int, Dict[str, Any]] = {}
+        self.by_tvdb_id: Dict[int, Dict[str, Any]] = {}
+        self.by_title: Dict[str, Dict[str, Any]] = {}
+        self.by_path: Dict[str, Dict[str, Any]] = {}
+        for item in series:
+            if item.get("id") is not None:
+                self.by_id[item["id"]] = item
+            if item.get("tvdbId"):
+                self.by_tvdb_id[item["tvdbId"]] = item
+            if item.get("path"):
+                self.by_path[_normalize_path(item["path"])] = item
+            for title in self._titles(item):
+                # First series wins; an exact title beats another series' alternate title
+                self.by_title.setdefault(title, item)
+
+    @staticmethod
+    def _titles(item: Dict[str, Any]) -> Iterable[str]:
+        title = item.get("title") or ""
+        names = [title, item.get("cleanTitle") or ""]
+        # "Doctor Who (2005)" is also found as "Doctor Who"
+        names.append(_TRAILING_YEAR.sub("", title))
+        if item.get("year"):
+            names.append(f"{_TRAILING_YEAR.sub('', title)} {item['year']}")
+        names.extend(alt.get("title") or "" for alt in item.get("alternateTitles") or [])
+        for name in names:
+            normalized = normalize_title(name)
+            if normalized:
+                yield normalized
+
+
+class SeriesCatalog:
+    """All Sonarr series, loaded once and refreshed in the background of reads.
+
+    The library is fetched on first use and again once `refresh_interval`
+    seconds have passed, or when `refresh()` is called. Lookups by id,
+    tvdbId, normalized title and path are dictionary reads. Each refresh
+    builds a new set of indexes and swaps it in, so readers never wait on a
+    refresh in progress. If Sonarr cannot be reached the previous library
+    is kept.
+    """
+
+    def __init__(self, sonarr: SonarrClient, refresh_interval: float = 900.0):
+        self.sonarr = sonarr
+        self.refresh_interval = refresh_interval
+        self._index = _Index([])
+        self._refresh_lock = threading.Lock()
+        self._refreshed_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    def _current(self) -> _Index:
+        """Get the indexes, loading or refreshing them if they are stale."""
+        refreshed_at = self._refreshed_at
+        if refreshed_at is None:
+            # Nothing to serve yet; wait for the first load
+            self.refresh(only_if_stale=True)
+        elif time.time() - refreshed_at >= self.refresh_interval and not self._refresh_lock.locked():
+            threading.Thread(target=self.refresh, kwargs={"only_if_stale": True},
+                             name="series-catalog", daemon=True).start()
+        return self._index
+
+    def refresh(self, only_if_stale: bool = False) -> bool:
+        """
+        Reload the library from Sonarr.
+
+        Args:
+            only_if_stale: Skip the reload if another caller refreshed it meanwhile
+
+        Returns:
+            bool: False if Sonarr could not be reached
+        """
+        with self._refresh_lock:
+            if only_if_stale and self._refreshed_at is not None \
+                    and time.time() - self._refreshed_at < self.refresh_interval:
+                return True
+            try:
+                series = self.sonarr.fetch_series()
+            except Exception as e:
+                print(f"Error refreshing series catalogue: {e}")
+                self._last_error = str(e)
+                if self._refreshed_at is None:
+                    # Let the next read try again rather than serve an empty library until the interval passes
+                    return False
+                self._refreshed_at = time.time()
+                return False
+            self._index = _Index(series)
+            self._refreshed_at = time.time()
+            self._last_error = None
+            return True
+
+    def all(self, fields: Optional[Iterable[str]] = COMPACT_FIELDS) -> List[Dict[str, Any]]:
+        """
+        Get every series.
+
+        Args:
+            fields: Fields to keep in each series, or None for full records
+
+        Returns:
+            List[Dict[str, Any]]: Series sorted by title
+        """
+        series = sorted(self._current().series, key=lambda s: s.get("sortTitle") or s.get("title") or "")
+        return [self.project(s, fields) for s in series]
+
+    def get(self, series_id: int) -> Optional[Dict[str, Any]]:
+        return self._current().by_id.get(series_id)
+
+    def get_by_tvdb_id(self, tvdb_id: int) -> Optional[Dict[str, Any]]:
+        return self._current().by_tvdb_id.get(tvdb_id)
+
+    def find_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+        """Find a series by its title or an alternate title, ignoring case, punctuation and accents."""
+        return self._current().by_title.get(normalize_title(title))
+
+    def find_by_path(self, path: str) -> Optional[Dict[str, Any]]:
+        """Find the series whose folder is the given path or contains it."""
+        by_path = self._current().by_path
+        current = _normalize_path(path)
+        while True:
+            if current in by_path:
+                return by_path[current]
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
+
+    def title_index(self) -> Dict[str, Dict[str, Any]]:
+        """Get the normalized title -> series index, for batch matching. Treat it as read-only."""
+        return self._current().by_title
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get series whose normalized title contains the normalized query."""
+        needle = normalize_title(query)
+        if not needle:
+            return []
+        seen = set()
+        matches = []
+        for title, item in self._current().by_title.items():
+            if needle in title and id(item) not in seen:
+                seen.add(id(item))
+                matches.append(item)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    @staticmethod
+    def project(series: Dict[str, Any], fields: Optional[Iterable[str]] = COMPACT_FIELDS) -> Dict[str, Any]:
+        """Keep only the given fields of a series record."""
+        if fields is None:
+            return series
+        projection = {field: series.get(field) for field in fields}
+        if "seasonCount" in projection and projection["seasonCount"] is None:
+            projection["seasonCount"] = (series.get("statistics") or {}).get("seasonCount")
+        return projection
+
+    def get_stats(self) -> Dict[str, Any]:
+        index = self._index
+        return {
+            "series": len(index.series),
+            "titles": len(index.by_title),
+            "refreshed_at": self._refreshed_at,
+            "refreshing": self._refresh_lock.locked(),
+            "last_error": self._last_error
+        }
@@ -0,0 +1,134 @@
+"""
+Background-refreshed snapshot of download states and Seedr account info.
+"""
+import time
+import threading
+from typing import Dict, Any, Optional, List
+from ..api.resilience import UpstreamUnavailableError
+from .seedr_sonarr_integration import SeedrSonarrIntegration
+from .event_bus import EventBus
+
+class StatusSnapshot:
+    """An immutable view of download states and account info at one point in time."""
+
+    def __init__(self, downloads: Optional[List[Dict[str, Any]]] = None,
+                 account_info: Optional[Dict[str, Any]] = None,
+                 updated_at: Optional[float] = None, error: Optional[str] = None,
+                 unavailable: bool = False):
+        self.downloads = downloads or []
+        self.account_info = account_info or {}
+        self.updated_at = updated_at
+        self.error = error
+        # Seedr could not be reached; downloads are the last known states
+        self.unavailable = unavailable
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the snapshot was taken, or None if it never was."""
+        if self.updated_at is None:
+            return None
+        return max(0.0, time.time() - self.updated_at)
+
+    def to_dict(self) -> Dict[str, Any]:
+        age = self.age
+        return {
+            "downloads": self.downloads,
+            "account_info": self.account_info,
+            "updated_at": self.updated_at,
+            "age": round(age, 3) if age is not None else None,
+            "error": self.error,
+            "unavailable": self.unavailable
+        }
+
+
+class StatusSnapshotService:
+    """Poll Seedr on a schedule and serve the latest result from memory.
+
+    One background thread refreshes download states and account info every
+    `interval` seconds, however many clients are reading. Readers get the
+    current snapshot without any upstream call. Operations that change a
+    download call `request_refresh()` so the next snapshot follows promptly.
+    With an event bus, only the downloads that changed between snapshots
+    and account info changes are published.
+    """
+
+    def __init__(self, integration: SeedrSonarrIntegration, interval: float = 10.0,
+                 event_bus: Optional[EventBus] = None):
+        self.integration = integration
+        self.interval = max(1.0, interval)
+        self.event_bus = event_bus
+        self._snapshot = StatusSnapshot()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the polling thread if it is not already running."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="status-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def get(self) -> StatusSnapshot:
+        """Get the latest snapshot. Never blocks on Seedr."""
+        return self._snapshot
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait until the first snapshot has been taken. Returns False on timeout."""
+        return self._ready.wait(timeout)
+
+    def request_refresh(self) -> None:
+        """Ask the polling thread to refresh now instead of at the next interval."""
+        self._wake.set()
+
+    def refresh(self) -> StatusSnapshot:
+        """Take a new snapshot on the calling thread and publish it."""
+        previous = self._snapshot
+        circuit = self.integration.seedr.upstream.breaker
+        try:
+            # While Seedr is down, skip the cycle instead of timing out on every call
+            circuit.check()
+            downloads = self.integration.poll_downloads()
+            account_info = self.integration.seedr.get_account_info()
+            # Results gathered while the circuit opened would show every download as missing
+            circuit.check()
+            # get_account_info() returns {} on failure; keep the last known values
+            snapshot = StatusSnapshot(downloads, account_info or previous.account_info, time.time())
+        except Exception as e:
+            print(f"Error refreshing status snapshot: {e}")
+            snapshot = StatusSnapshot(previous.downloads, previous.account_info, previous.updated_at, str(e),
+                                      unavailable=isinstance(e, UpstreamUnavailableError))
+        # Rebinding the reference publishes the new snapshot atomically
+        self._snapshot = snapshot
+        self._ready.set()
+        if self.event_bus and not snapshot.error:
+            self._publish_changes(previous, snapshot)
+        return snapshot
+
+    def _publish_changes(self, previous: StatusSnapshot, current: StatusSnapshot) -> None:
+        """Publish the differences between two snapshots."""
+        before = {d.get("title"): d for d in previous.downloads}
+        after = {d.get("title"): d for d in current.downloads}
+        for title, download in after.items():
+            if before.get(title) != download:
+                self.event_bus.publish("download", download)
+        for title in before.keys() - after.keys():
+            self.event_bus.publish("download_removed", {"title": title})
+        if current.account_info != previous.account_info:
+            self.event_bus.publish("account", current.account_info)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.clear()
+            self.refresh()
+            self._wake.wait(self.interval)
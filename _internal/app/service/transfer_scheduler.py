@@ -0,0 +1,150 @@
+"""
+Bounded, prioritised scheduler for local transfers of completed Seedr files.
+"""
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, List, Callable
+
+class TransferJob:
+    """A single file or folder transfer waiting in the scheduler."""
+
+    def __init__(self, title: str, name: str, func: Callable[[], Any], size: int = 0,
+                 priority: Optional[int] = None, key: Optional[str] = None):
+        self.title = title
+        self.name = name
+        self.func = func
+        self.size = size
+        # Identifies what the job writes, usually its target path
+        self.key = key
+        # Smaller transfers go first unless an explicit priority is given
+        self.priority = size if priority is None else priority
+        self.future: Future = Future()
+
+
+class TransferScheduler:
+    """Run transfers on a bounded worker pool with per-title limits.
+
+    Jobs are ordered by priority (by default their size, so single episodes
+    overtake season packs). A worker skips over jobs whose title already has
+    `per_title_limit` transfers running, so one large title can never hold
+    every worker while other titles wait behind it. A job submitted with
+    the key of a job still queued or running is not queued again; it gets
+    that job's future, so two writers never share one target.
+    """
+
+    def __init__(self, max_workers: int = 4, per_title_limit: int = 2):
+        self.max_workers = max(1, max_workers)
+        self.per_title_limit = max(1, per_title_limit)
+        self._queue: List[Any] = []
+        self._counter = itertools.count()
+        self._active_by_title: Dict[str, int] = {}
+        self._in_flight: Dict[str, TransferJob] = {}
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._running = False
+        self._completed = 0
+        self._failed = 0
+        self._deduplicated = 0
+
+    def start(self) -> None:
+        """Start the worker threads if they are not already running."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._workers = [
+                threading.Thread(target=self._worker, name=f"transfer-{i}", daemon=True)
+                for i in range(self.max_workers)
+            ]
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self) -> None:
+        """Stop the workers once their current transfer finishes."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers = []
+
+    def submit(self, job: TransferJob) -> Future:
+        """Queue a transfer job and return a future for its result; a job whose key is in flight gets the existing future."""
+        self.start()
+        with self._condition:
+            if job.key is not None:
+                existing = self._in_flight.get(job.key)
+                if existing:
+                    self._deduplicated += 1
+                    return existing.future
+                self._in_flight[job.key] = job
+            heapq.heappush(self._queue, (job.priority, next(self._counter), job))
+            self._condition.notify()
+        return job.future
+
+    def _next_job(self) -> Optional[TransferJob]:
+        """Pop the best job whose title is under its limit. Caller holds the lock."""
+        skipped = []
+        job = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            candidate = entry[2]
+            if self._active_by_title.get(candidate.title, 0) < self.per_title_limit:
+                job = candidate
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self._queue, entry)
+        return job
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                job = None
+                while self._running:
+                    job = self._next_job()
+                    if job:
+                        break
+                    self._condition.wait()
+                if not job:
+                    return
+                self._active_by_title[job.title] = self._active_by_title.get(job.title, 0) + 1
+
+            succeeded = False
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    try:
+                        result = job.func()
+                        succeeded = not (isinstance(result, dict) and result.get("success") is False)
+                        job.future.set_result(result)
+                    except Exception as e:
+                        job.future.set_exception(e)
+            finally:
+                with self._condition:
+                    self._active_by_title[job.title] -= 1
+                    if not self._active_by_title[job.title]:
+                        del self._active_by_title[job.title]
+                    if job.key is not None and self._in_flight.get(job.key) is job:
+                        del self._in_flight[job.key]
+                    if succeeded:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+                    # A slot for this title opened up; wake workers that skipped its jobs
+                    self._condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and worker activity."""
+        with self._condition:
+            return {
+                "workers": len(self._workers),
+                "per_title_limit": self.per_title_limit,
+                "queued": len(self._queue),
+                "active": sum(self._active_by_title.values()),
+                "active_by_title": dict(self._active_by_title),
+                "completed": self._completed,
+                "failed": self._failed,
+                "deduplicated": self._deduplicated
+            }
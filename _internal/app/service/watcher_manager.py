@@ -0,0 +1,147 @@
+"""
+Supervisor owning the folder watcher's observer and ingestion workers.
+"""
+import time
+import threading
+from typing import Dict, Any, Optional, Callable
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+from .event_bus import EventBus
+
+# Name prefixes of the threads the watcher runs, for the resource counts in status()
+WATCHER_THREAD_PREFIXES = ("watcher-", "watchdog-")
+
+class WatcherManager:
+    """Start, stop and restart the folder watcher from one place.
+
+    At most one observer and one event handler exist at a time. Stopping
+    stops the observer thread and the handler's ingestion queue, so start
+    and restart cycles leave no threads behind. `handler_factory` builds the
+    event handler for a download directory and must be set before `start()`.
+    `observer_factory` builds the observer, such as a polling observer for
+    network shares. Status changes are published as `watcher_status` events.
+    """
+
+    def __init__(self, event_bus: Optional[EventBus] = None,
+                 handler_factory: Optional[Callable[[str], FileSystemEventHandler]] = None,
+                 observer_factory: Callable[[], threading.Thread] = Observer):
+        self.event_bus = event_bus
+        self.handler_factory = handler_factory
+        self.observer_factory = observer_factory
+        self.torrent_dir: Optional[str] = None
+        self.download_dir: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self._observer: Optional[threading.Thread] = None
+        self._handler: Optional[FileSystemEventHandler] = None
+        self._lock = threading.RLock()
+
+    @property
+    def is_running(self) -> bool:
+        observer = self._observer
+        return observer is not None and observer.is_alive()
+
+    @property
+    def handler(self) -> Optional[FileSystemEventHandler]:
+        """The running event handler, if any."""
+        return self._handler
+
+    def start(self, torrent_dir: str, download_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Start watching a directory.
+
+        Args:
+            torrent_dir: Directory to watch for .torrent and .magnet files
+            download_dir: Directory for completed downloads
+
+        Returns:
+            Dict[str, Any]: Result with success and message
+        """
+        with self._lock:
+            if self.is_running:
+                return {"success": False, "message": "Watcher is already running"}
+            # Clean up an observer that died on its own
+            self._shutdown()
+
+            handler = self.handler_factory(download_dir)
+            observer = self.observer_factory()
+            if not observer.name.startswith(WATCHER_THREAD_PREFIXES):
+                observer.name = "watchdog-observer"
+            try:
+                observer.schedule(handler, torrent_dir, recursive=False)
+                observer.start()
+                for emitter in getattr(observer, "emitters", ()):
+                    emitter.name = "watchdog-emitter"
+            except Exception as e:
+                self._stop_handler(handler)
+                return {"success": False, "message": f"Failed to watch {torrent_dir}: {e}"}
+
+            self._observer = observer
+            self._handler = handler
+            self.torrent_dir = torrent_dir
+            self.download_dir = download_dir
+            self.started_at = time.time()
+        self._publish_status()
+        return {"success": True, "message": f"Started watching {torrent_dir}"}
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop the observer and the ingestion workers."""
+        with self._lock:
+            if not self.is_running and self._observer is None:
+                return {"success": False, "message": "Watcher is not running"}
+            self._shutdown()
+        self._publish_status()
+        return {"success": True, "message": "Watcher stopped"}
+
+    def restart(self, torrent_dir: str, download_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Stop the watcher if it is running and start it on the given directories."""
+        with self._lock:
+            self._shutdown()
+            return self.start(torrent_dir, download_dir)
+
+    def status(self) -> Dict[str, Any]:
+        """Get the watcher state and the number of observers and threads it is using."""
+        with self._lock:
+            handler = self._handler
+            status = {
+                "running": self.is_running,
+                "torrent_dir": self.torrent_dir,
+                "download_dir": self.download_dir,
+                "started_at": self.started_at,
+                "backend": type(self._observer).__name__ if self._observer else None,
+                "observers": 1 if self.is_running else 0,
+                "threads": sum(
+                    1 for t in threading.enumerate() if t.name.startswith(WATCHER_THREAD_PREFIXES)
+                ),
+                "process_threads": threading.active_count()
+            }
+        queue = getattr(handler, "queue", None)
+        if queue is not None:
+            status["queue"] = queue.stats()
+        debouncer = getattr(handler, "debouncer", None)
+        if debouncer is not None:
+            status["settling"] = debouncer.pending_count
+        return status
+
+    def _shutdown(self) -> None:
+        observer, handler = self._observer, self._handler
+        self._observer = None
+        self._handler = None
+        self.started_at = None
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=10)
+        if handler is not None:
+            self._stop_handler(handler)
+
+    @staticmethod
+    def _stop_handler(handler: FileSystemEventHandler) -> None:
+        queue = getattr(handler, "queue", None)
+        if queue is not None:
+            queue.stop()
+        debouncer = getattr(handler, "debouncer", None)
+        if debouncer is not None:
+            debouncer.stop()
+
+    def _publish_status(self) -> None:
+        if self.event_bus:
+            self.event_bus.publish("watcher_status", {"running": self.is_running})
@@ -2,5 +2,12 @@
 Utility modules for the Sonarr-Seedr integration.
 """
 from .torrent_watcher import TorrentWatcher, watch_folder
+from .log_files import tail_lines, CompressingRotatingFileHandler, LogRingBuffer
+from .ingestion import (
+    IngestionLedger, FileDebouncer, IngestionQueue, PermanentIngestionError, ingestion_key, magnet_btih
+)
+from .polling_observer import ScandirPollingObserver, create_observer
 
-__all__ = ['TorrentWatcher', 'watch_folder'] 
\ No newline at end of file
+__all__ = ['TorrentWatcher', 'watch_folder', 'tail_lines', 'CompressingRotatingFileHandler', 'LogRingBuffer',
+           'IngestionLedger', 'FileDebouncer', 'IngestionQueue', 'PermanentIngestionError',
+           'ingestion_key', 'magnet_btih', 'ScandirPollingObserver', 'create_observer'] 
\ No newline at end of file
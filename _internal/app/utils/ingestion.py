@@ -0,0 +1,412 @@
+"""
+Debounced, idempotent ingestion of .torrent and .magnet files.
+"""
+import os
+import json
+import time
+import heapq
+import queue
+import random
+import base64
+import hashlib
+import logging
+import threading
+from urllib.parse import urlparse, parse_qs
+from typing import Callable, Dict, Any, Optional, Tuple, List
+from ..api.bencode import TorrentInfo, BencodeError, parse_torrent
+
+logger = logging.getLogger("torrent_watcher")
+
+class PermanentIngestionError(Exception):
+    """A watched file that can never be submitted; retrying will not help."""
+    pass
+
+
+def magnet_btih(magnet_link: str) -> Optional[str]:
+    """
+    Get the BitTorrent info hash from a magnet link.
+
+    Args:
+        magnet_link: Magnet URI
+
+    Returns:
+        Optional[str]: Lowercase hex info hash, or None if the link has no btih
+    """
+    try:
+        params = parse_qs(urlparse(magnet_link.strip()).query)
+    except ValueError:
+        return None
+    for xt in params.get("xt", []):
+        if not xt.lower().startswith("urn:btih:"):
+            continue
+        value = xt[len("urn:btih:"):]
+        if len(value) == 40:
+            try:
+                return bytes.fromhex(value).hex()
+            except ValueError:
+                return None
+        if len(value) == 32:
+            # Older magnets carry the hash base32-encoded
+            try:
+                return base64.b32decode(value.upper()).hex()
+            except ValueError:
+                return None
+    return None
+
+
+def ingestion_key(file_name: str, data: bytes, torrent: Optional[TorrentInfo] = None) -> str:
+    """
+    Identify the torrent a watched file refers to.
+
+    Magnet and torrent files are both keyed by the torrent's btih, so the
+    same torrent is recognised however the link is written and whether it
+    arrives as a magnet or a .torrent. Files without a usable hash fall back
+    to a hash of their content.
+
+    Args:
+        file_name: Name of the watched file
+        data: Raw file content
+        torrent: Already parsed metadata of a .torrent file
+
+    Returns:
+        str: Ledger key
+    """
+    if file_name.lower().endswith(".magnet"):
+        link = data.decode("utf-8", errors="replace").strip()
+        btih = magnet_btih(link)
+        if btih:
+            return f"btih:{btih}"
+        return f"magnet:{hashlib.sha1(link.encode('utf-8')).hexdigest()}"
+    if torrent is None:
+        try:
+            torrent = parse_torrent(data)
+        except BencodeError:
+            return f"sha1:{hashlib.sha1(data).hexdigest()}"
+    return f"btih:{torrent.infohash}"
+
+
+class IngestionLedger:
+    """Persistent record of the torrents already submitted to Seedr.
+
+    A watcher calls `claim()` before submitting and then `complete()` or
+    `release()`. Only one caller can hold a claim on a key, and completed
+    keys are never claimed again, so each torrent is submitted once however
+    many filesystem events or watcher instances see it. Completed keys are
+    saved to disk and survive restarts.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._claimed = set()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading ingestion ledger: {e}")
+            return {}
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def is_submitted(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def claim(self, key: str) -> bool:
+        """
+        Reserve a key for submission.
+
+        Returns:
+            bool: False if the key was already submitted or is being submitted
+        """
+        with self._lock:
+            if key in self._entries or key in self._claimed:
+                return False
+            self._claimed.add(key)
+            return True
+
+    def complete(self, key: str, name: str) -> None:
+        """Record a claimed key as submitted."""
+        with self._lock:
+            self._claimed.discard(key)
+            self._entries[key] = {"name": name, "submitted_at": time.time()}
+            if len(self._entries) > self.max_entries:
+                # Entries are kept in insertion order; forget the oldest
+                for old_key in list(self._entries)[:len(self._entries) - self.max_entries]:
+                    del self._entries[old_key]
+            try:
+                self._save()
+            except Exception as e:
+                logger.error(f"Error saving ingestion ledger: {e}")
+
+    def release(self, key: str) -> None:
+        """Drop a claim after a failed submission so the file can be retried."""
+        with self._lock:
+            self._claimed.discard(key)
+
+
+class FileDebouncer:
+    """Run a callback once a file has stopped changing.
+
+    Every filesystem event for a path calls `touch()`. The callback runs
+    once, after the file's size and modification time have stayed the same
+    for `settle_time` seconds, so a burst of created/modified events yields
+    one call and a half-written file is never read. Empty files are waited
+    on up to `max_wait` seconds. The polling thread only runs while there
+    are pending paths.
+    """
+
+    def __init__(self, callback: Callable[[str], Any], settle_time: float = 2.0,
+                 poll_interval: float = 0.5, max_wait: float = 300.0):
+        self.callback = callback
+        self.settle_time = settle_time
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        # path -> (first seen, stable since, (size, mtime))
+        self._pending: Dict[str, Tuple[float, float, Optional[Tuple[int, float]]]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, float]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime
+
+    def touch(self, path: str) -> None:
+        """Note an event for a path, restarting its settle timer."""
+        now = time.time()
+        with self._lock:
+            if self._stopped:
+                return
+            first_seen = self._pending[path][0] if path in self._pending else now
+            self._pending[path] = (first_seen, now, self._stat(path))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="watcher-debounce", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Forget pending paths and ignore further events."""
+        with self._lock:
+            self._stopped = True
+            self._pending.clear()
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.poll_interval)
+            ready = []
+            with self._lock:
+                now = time.time()
+                for path, (first_seen, stable_since, last) in list(self._pending.items()):
+                    current = self._stat(path)
+                    if current is None:
+                        # Deleted or moved away before it settled
+                        del self._pending[path]
+                    elif current != last:
+                        self._pending[path] = (first_seen, now, current)
+                    elif current[0] == 0:
+                        if now - first_seen >= self.max_wait:
+                            logger.warning(f"Giving up on empty file: {path}")
+                            del self._pending[path]
+                    elif now - stable_since >= self.settle_time:
+                        del self._pending[path]
+                        ready.append(path)
+                if not self._pending and not ready:
+                    # Exit while holding the lock so touch() starts a new thread
+                    self._thread = None
+                    return
+            for path in ready:
+                try:
+                    self.callback(path)
+                except Exception as e:
+                    logger.exception(f"Error processing {path}: {e}")
+
+
+class IngestionQueue:
+    """Bounded queue of watched files drained by a pool of worker threads.
+
+    `process(path)` is called on a worker and returns True once the file is
+    submitted. A False result or an exception is retried up to
+    `max_attempts` times with jittered exponential backoff; after that, or
+    on a `PermanentIngestionError`, `on_failure(path, message)` is called.
+    `submit()` blocks while the queue is full, which holds back the caller
+    instead of buffering without limit. A path is only queued once until it
+    finishes. Workers start on demand and exit after `idle_timeout` seconds
+    without work.
+    """
+
+    def __init__(self, process: Callable[[str], bool], on_failure: Callable[[str, str], Any],
+                 workers: int = 4, max_size: int = 1000, max_attempts: int = 3,
+                 retry_delay: float = 5.0, idle_timeout: float = 30.0):
+        self.process = process
+        self.on_failure = on_failure
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.idle_timeout = idle_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_size))
+        self._lock = threading.Lock()
+        # (due time, sequence, path, attempt) of files waiting to be retried
+        self._retries: List[Tuple[float, int, str, int]] = []
+        self._sequence = 0
+        self._tracked = set()
+        self._worker_count = 0
+        self._active = 0
+        self._submitted = 0
+        self._failed = 0
+        self._stopped = False
+
+    def submit(self, path: str, block: bool = True) -> bool:
+        """
+        Queue a file for processing.
+
+        Args:
+            path: File to process
+            block: Wait for room if the queue is full
+
+        Returns:
+            bool: False if the file is already queued, the queue is stopped,
+                or it is full and block is False
+        """
+        with self._lock:
+            if self._stopped or path in self._tracked:
+                return False
+            self._tracked.add(path)
+        try:
+            self._queue.put((path, 1), block=block)
+        except queue.Full:
+            with self._lock:
+                self._tracked.discard(path)
+            return False
+        self._ensure_workers()
+        return True
+
+    def stop(self) -> None:
+        """Stop the workers. Queued files are dropped."""
+        with self._lock:
+            self._stopped = True
+            self._retries.clear()
+            self._tracked.clear()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, int]:
+        """Get queue depth, retry backlog, worker counts and totals."""
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "retrying": len(self._retries),
+                "active": self._active,
+                "workers": self._worker_count,
+                "submitted": self._submitted,
+                "failed": self._failed
+            }
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            while not self._stopped and self._worker_count < self.workers:
+                self._worker_count += 1
+                threading.Thread(target=self._work, name="watcher-ingest", daemon=True).start()
+
+    def _next_due_retry(self) -> Tuple[Optional[Tuple[str, int]], float]:
+        """Pop a retry that is due. Otherwise return how long until the next one."""
+        with self._lock:
+            if not self._retries:
+                return None, 1.0
+            wait = self._retries[0][0] - time.time()
+            if wait > 0:
+                return None, min(wait, 1.0)
+            _, _, path, attempt = heapq.heappop(self._retries)
+            return (path, attempt), 0.0
+
+    def _work(self) -> None:
+        idle_since = time.time()
+        while True:
+            item, wait = self._next_due_retry()
+            if item is None:
+                try:
+                    item = self._queue.get(timeout=wait)
+                except queue.Empty:
+                    with self._lock:
+                        if self._stopped or (
+                            self._queue.empty() and not self._retries
+                            and time.time() - idle_since >= self.idle_timeout
+                        ):
+                            self._worker_count -= 1
+                            return
+                    continue
+            with self._lock:
+                if self._stopped:
+                    self._worker_count -= 1
+                    return
+                self._active += 1
+            try:
+                self._attempt(*item)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                idle_since = time.time()
+
+    def _attempt(self, path: str, attempt: int) -> None:
+        try:
+            if self.process(path):
+                self._finish(path, submitted=True)
+                return
+            message = "Failed to add to Seedr"
+        except FileNotFoundError:
+            logger.warning(f"File disappeared before it was processed: {path}")
+            self._finish(path)
+            return
+        except PermanentIngestionError as e:
+            self._fail(path, str(e))
+            return
+        except Exception as e:
+            logger.exception(f"Error processing {path}: {e}")
+            message = str(e)
+        
+        if attempt >= self.max_attempts:
+            self._fail(path, f"{message} after {attempt} attempts")
+            return
+        # Exponential backoff with jitter so a burst of failures does not retry in lockstep
+        delay = self.retry_delay * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+        logger.warning(f"Retrying {os.path.basename(path)} in {delay:.1f}s (attempt {attempt} failed: {message})")
+        with self._lock:
+            if self._stopped:
+                return
+            self._sequence += 1
+            heapq.heappush(self._retries, (time.time() + delay, self._sequence, path, attempt + 1))
+
+    def _fail(self, path: str, message: str) -> None:
+        try:
+            self.on_failure(path, message)
+        except Exception as e:
+            logger.exception(f"Error handling failed file {path}: {e}")
+        self._finish(path, failed=True)
+
+    def _finish(self, path: str, submitted: bool = False, failed: bool = False) -> None:
+        with self._lock:
+            self._tracked.discard(path)
+            self._submitted += int(submitted)
+            self._failed += int(failed)
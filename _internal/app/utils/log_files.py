@@ -0,0 +1,133 @@
+"""
+Log file helpers: backward tail reading, compressed rotation and a recent-lines buffer.
+"""
+import os
+import gzip
+import time
+import shutil
+import logging
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import List, Optional
+
+def tail_lines(path: str, count: int, block_size: int = 64 * 1024) -> List[str]:
+    """
+    Read the last lines of a file by seeking backward from the end in blocks.
+
+    Only the blocks holding the requested lines are read, so the cost
+    depends on `count`, not on the size of the file.
+
+    Args:
+        path: File to read
+        count: Number of lines to return
+        block_size: Bytes read per backward step
+
+    Returns:
+        List[str]: Up to `count` lines, oldest first, with line endings kept
+    """
+    if count <= 0 or not os.path.exists(path):
+        return []
+
+    # Unbuffered: reads are already done in blocks and every seek would discard a buffer
+    with open(path, 'rb', buffering=0) as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        blocks = []
+        newlines = 0
+        # One more newline than lines wanted marks the start of the first line
+        while position > 0 and newlines <= count:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+
+    lines = b"".join(reversed(blocks)).splitlines(keepends=True)
+    if position > 0:
+        # The first line may have been cut by the block boundary
+        lines = lines[1:]
+    return [line.decode('utf-8', errors='replace') for line in lines[-count:]]
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """Rotate a log file by size or age and gzip the rotated files.
+
+    Rolls over when the file would exceed `max_bytes` or when `interval`
+    seconds have passed since the last rollover, keeping `backup_count`
+    compressed files named `<file>.1.gz`, `<file>.2.gz` and so on.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 interval: float = 24 * 3600, encoding: Optional[str] = 'utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self.interval = interval
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._compress
+        self.rollover_at = self._next_rollover()
+
+    def _next_rollover(self) -> float:
+        # Count the age of an existing log from when it was last modified
+        start = time.time()
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            start = os.path.getmtime(self.baseFilename)
+        return start + self.interval if self.interval > 0 else float("inf")
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.interval > 0 and time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval if self.interval > 0 else float("inf")
+
+    @staticmethod
+    def _compress(source: str, dest: str) -> None:
+        with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+
+class LogRingBuffer(logging.Handler):
+    """Keep the most recent formatted log lines in memory.
+
+    Log endpoints read from here first, so serving the latest lines touches
+    neither the disk nor more than the lines asked for.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        super().__init__()
+        self.capacity = capacity
+        self._lines = deque(maxlen=capacity)
+        self._buffer_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._buffer_lock:
+            for line in message.splitlines():
+                self._lines.append(line + "\n")
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def tail(self, count: int) -> List[str]:
+        """Get up to `count` of the most recent lines, oldest first."""
+        if count <= 0:
+            return []
+        with self._buffer_lock:
+            size = len(self._lines)
+            return [self._lines[i] for i in range(max(0, size - count), size)]
+
+    def find_last(self, *needles: str) -> Optional[str]:
+        """Get the most recent line containing any of the given strings."""
+        with self._buffer_lock:
+            for line in reversed(self._lines):
+                if any(needle in line for needle in needles):
+                    return line
+        return None
@@ -0,0 +1,107 @@
+"""
+Polling replacement for the watchdog observer, for folders on network shares.
+"""
+import os
+import logging
+import threading
+from typing import Dict, Tuple, Optional, Iterable, List
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifiedEvent, FileDeletedEvent
+
+logger = logging.getLogger("torrent_watcher")
+
+TORRENT_EXTENSIONS = ('.torrent', '.magnet')
+
+class ScandirPollingObserver(threading.Thread):
+    """Detect new and changed files by polling directories with os.scandir.
+
+    SMB and NFS mounts do not deliver native filesystem events. This
+    observer keeps an index of `name -> (size, mtime)` per watched directory
+    and diffs a fresh scandir listing against it every `interval` seconds.
+    It dispatches created, modified and deleted events for the entries that
+    differ. Only names with a watched extension are stat'ed, so a scan of a
+    directory with tens of thousands of other files costs one directory
+    listing. A directory that cannot be listed, such as an unreachable
+    share, keeps its previous index and emits nothing. Files already
+    present when a directory is scheduled are indexed without events, as
+    with the native observer.
+
+    Implements the parts of the watchdog Observer interface the watcher uses:
+    `schedule()`, `start()`, `stop()`, `join()` and `is_alive()`.
+    """
+
+    def __init__(self, interval: float = 5.0, extensions: Optional[Iterable[str]] = TORRENT_EXTENSIONS):
+        super().__init__(name="watchdog-polling", daemon=True)
+        self.interval = max(0.1, interval)
+        self.extensions = tuple(e.lower() for e in extensions) if extensions else None
+        # [handler, directory, index] per scheduled directory
+        self._watches: List[list] = []
+        self._stopped = threading.Event()
+
+    def schedule(self, event_handler: FileSystemEventHandler, path: str, recursive: bool = False) -> None:
+        """Watch a directory. Subdirectories are not watched."""
+        index = self._scan(path)
+        self._watches.append([event_handler, path, index if index is not None else {}])
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            for watch in self._watches:
+                try:
+                    self._poll(watch)
+                except Exception as e:
+                    logger.exception(f"Error polling {watch[1]}: {e}")
+
+    def _scan(self, path: str) -> Optional[Dict[str, Tuple[int, float]]]:
+        """List a directory's watched files with their size and mtime, or None if it cannot be read."""
+        index = {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if self.extensions and not entry.name.lower().endswith(self.extensions):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        # Removed between listing and stat
+                        continue
+                    index[entry.name] = (st.st_size, st.st_mtime)
+        except OSError as e:
+            logger.warning(f"Cannot list {path}: {e}")
+            return None
+        return index
+
+    def _poll(self, watch: list) -> None:
+        handler, path, previous = watch
+        current = self._scan(path)
+        if current is None:
+            return
+        for name, signature in current.items():
+            before = previous.get(name)
+            if before is None:
+                handler.dispatch(FileCreatedEvent(os.path.join(path, name)))
+            elif before != signature:
+                handler.dispatch(FileModifiedEvent(os.path.join(path, name)))
+        for name in previous.keys() - current.keys():
+            handler.dispatch(FileDeletedEvent(os.path.join(path, name)))
+        watch[2] = current
+
+
+def create_observer(backend: str = "native", poll_interval: float = 5.0):
+    """
+    Create the observer for a watcher backend.
+
+    Args:
+        backend: "native" for filesystem events, "polling" for network shares
+        poll_interval: Seconds between scans for the polling backend
+
+    Returns:
+        A watchdog Observer or a ScandirPollingObserver
+    """
+    if backend == "polling":
+        return ScandirPollingObserver(poll_interval)
+    return Observer()
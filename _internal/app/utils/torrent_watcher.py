@@ -6,11 +6,13 @@ import time
 import logging
 import shutil
 from pathlib import Path
-from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
 from ..service.seedr_sonarr_integration import SeedrSonarrIntegration
 from ..config import Config
+from ..api.bencode import BencodeError, parse_torrent
+from .polling_observer import create_observer
+from .ingestion import IngestionLedger, FileDebouncer, IngestionQueue, PermanentIngestionError, ingestion_key
 
 # Configure logging
 logger = logging.getLogger("torrent_watcher")
@@ -18,10 +20,22 @@ logger = logging.getLogger("torrent_watcher")
 class TorrentWatcher(FileSystemEventHandler):
     """File system event handler for watching and processing torrent files."""
     
-    def __init__(self, config, integration, download_dir=None):
-        """Initialize the torrent watcher."""
+    def __init__(self, config, integration, download_dir=None, ledger=None, event_bus=None, account_info=None):
+        """
+        Initialize the torrent watcher.
+        
+        Args:
+            config: Application config
+            integration: Integration service used to add torrents
+            download_dir: Where completed downloads are saved
+            ledger: Shared ingestion ledger (defaults to the one under config/)
+            event_bus: Event bus to publish submission results on, if any
+            account_info: Callable returning current Seedr account info, for the space check
+        """
         self.config = config
         self.integration = integration
+        self.event_bus = event_bus
+        self.account_info = account_info
         
         # Set up directories
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -34,6 +48,19 @@ class TorrentWatcher(FileSystemEventHandler):
         os.makedirs(self.processed_dir, exist_ok=True)
         os.makedirs(self.error_dir, exist_ok=True)
         
+        # Submitted torrents are recorded so each is sent to Seedr once
+        self.ledger = ledger or IngestionLedger(os.path.join(base_dir, 'config', 'ingestion_ledger.json'))
+        # Settled files are submitted by a pool of workers, with retries
+        self.queue = IngestionQueue(
+            self._submit_torrent_file,
+            self._move_to_error,
+            workers=config.watcher.workers,
+            max_size=config.watcher.queue_size,
+            max_attempts=config.watcher.max_attempts,
+            retry_delay=config.watcher.retry_delay
+        )
+        self.debouncer = FileDebouncer(self.queue.submit, config.watcher.settle_time)
+        
         # Configure logging
         self.logger = logger
         self.logger.info(f"TorrentWatcher initialized. Watching for .torrent and .magnet files")
@@ -43,79 +70,120 @@ class TorrentWatcher(FileSystemEventHandler):
         """Handle file creation events."""
         if not event.is_directory and self._is_torrent_or_magnet(event.src_path):
             self.logger.info(f"New file detected: {event.src_path}")
-            self._process_torrent_file(event.src_path)
+            self.debouncer.touch(event.src_path)
     
     def on_modified(self, event):
         """Handle file modification events."""
         if not event.is_directory and self._is_torrent_or_magnet(event.src_path):
-            self.logger.info(f"Modified file detected: {event.src_path}")
-            self._process_torrent_file(event.src_path)
+            self.debouncer.touch(event.src_path)
+    
+    def on_moved(self, event):
+        """Handle files renamed into place."""
+        if not event.is_directory and self._is_torrent_or_magnet(event.dest_path):
+            self.logger.info(f"New file detected: {event.dest_path}")
+            self.debouncer.touch(event.dest_path)
     
     def _is_torrent_or_magnet(self, file_path):
         """Check if the file is a torrent or magnet file."""
         _, ext = os.path.splitext(file_path)
         return ext.lower() in ['.torrent', '.magnet']
     
-    def _process_torrent_file(self, file_path):
-        """Process a torrent file by uploading it to Seedr."""
+    def _submit_torrent_file(self, file_path):
+        """
+        Add a torrent file to Seedr, at most once per torrent.
+        
+        Returns True once the torrent is submitted (now or earlier) and False
+        if Seedr did not accept it.
+        """
+        file_name = os.path.basename(file_path)
+        self.logger.info(f"Processing torrent file: {file_name}")
+        
+        # Read file content
+        with open(file_path, 'rb') as f:
+            file_data = f.read()
+        if not file_data.strip():
+            raise PermanentIngestionError("File is empty")
+        
+        # Parse .torrent files locally, before any network call
+        _, ext = os.path.splitext(file_path)
+        torrent = None
+        if ext.lower() != '.magnet':
+            try:
+                torrent = parse_torrent(file_data)
+            except BencodeError as e:
+                raise PermanentIngestionError(f"Invalid torrent file: {e}")
+        
+        key = ingestion_key(file_name, file_data, torrent)
+        if not self.ledger.claim(key):
+            # Already submitted; nothing more to do
+            self.logger.info(f"Skipping {file_name}: already submitted to Seedr")
+            return True
+        
         try:
-            self.logger.info(f"Processing torrent file: {os.path.basename(file_path)}")
-            
-            # Read file content
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
-            
-            # Determine if this is a magnet link or a torrent file
-            _, ext = os.path.splitext(file_path)
-            
-            if ext.lower() == '.magnet':
+            if torrent is None:
                 # It's a magnet link file, read the content as text
-                magnet_link = file_data.decode('utf-8').strip()
+                try:
+                    magnet_link = file_data.decode('utf-8').strip()
+                except UnicodeDecodeError:
+                    raise PermanentIngestionError("Magnet file is not valid UTF-8 text")
                 self.logger.info(f"Uploading magnet link: {magnet_link[:50]}...")
                 
-                # Add the magnet link to Seedr
-                result = self.integration.seedr.add_torrent(magnet_link)
-                
-                if not result:
-                    self.logger.error(f"Failed to add magnet link to Seedr")
-                    # Move to error directory
-                    error_path = os.path.join(self.error_dir, os.path.basename(file_path))
-                    shutil.copy2(file_path, error_path)
-                    return False
-                
-                self.logger.info(f"Successfully added magnet link to Seedr")
+                # Add the magnet link to Seedr and store its mapping
+                result = self.integration.add_download(file_name, magnet_link)
             else:
-                # It's a torrent file
-                self.logger.info(f"Uploading torrent file: {os.path.basename(file_path)}")
-                
-                # Add the torrent file to Seedr
-                result = self.integration.seedr.add_torrent(file_data)
-                
-                if not result:
-                    self.logger.error(f"Failed to add torrent file to Seedr")
-                    # Move to error directory
-                    error_path = os.path.join(self.error_dir, os.path.basename(file_path))
-                    shutil.copy2(file_path, error_path)
-                    return False
+                # It's a torrent file; Seedr takes it as a magnet built from its metadata
+                self.logger.info(f"Uploading torrent file: {file_name} "
+                                 f"({torrent.infohash}, {torrent.total_size} bytes)")
                 
-                self.logger.info(f"Successfully added torrent file to Seedr")
-            
-            # Move to processed directory
-            processed_path = os.path.join(self.processed_dir, os.path.basename(file_path))
-            shutil.copy2(file_path, processed_path)
-            
-            return True
+                result = self.integration.add_torrent(
+                    torrent, file_name, account_info=self.account_info() if self.account_info else None
+                )
+                if result.get("permanent"):
+                    raise PermanentIngestionError(result.get("message", "Torrent rejected"))
             
+            if not result.get("success", False):
+                self.logger.error(f"Failed to add {file_name} to Seedr: {result.get('message', 'Unknown error')}")
+                return False
+            self.ledger.complete(key, file_name)
+        finally:
+            # Release the claim if the torrent was not recorded, so a retry can submit it
+            if not self.ledger.is_submitted(key):
+                self.ledger.release(key)
+        
+        self._publish({"file": file_name, "success": True, "message": result.get("message", "")})
+        self.logger.info(f"Successfully added {file_name} to Seedr")
+        
+        # Move to processed directory
+        processed_path = os.path.join(self.processed_dir, file_name)
+        shutil.copy2(file_path, processed_path)
+        
+        return True
+    
+    def _move_to_error(self, file_path, message):
+        """Report a file that could not be submitted and move it to the error directory."""
+        file_name = os.path.basename(file_path)
+        self.logger.error(f"Giving up on {file_name}: {message}")
+        self._publish({"file": file_name, "success": False, "message": message})
+        try:
+            error_path = os.path.join(self.error_dir, file_name)
+            shutil.copy2(file_path, error_path)
+        except Exception as move_error:
+            self.logger.error(f"Error moving file to error directory: {str(move_error)}")
+    
+    def _publish(self, event):
+        if self.event_bus is not None:
+            self.event_bus.publish("watcher", event)
+    
+    def _process_torrent_file(self, file_path):
+        """Process a torrent file once, without retries. Returns True if it was submitted."""
+        try:
+            if self._submit_torrent_file(file_path):
+                return True
+            self._move_to_error(file_path, "Failed to add to Seedr")
+            return False
         except Exception as e:
             self.logger.exception(f"Error processing torrent file {os.path.basename(file_path)}: {str(e)}")
-            
-            # Move to error directory
-            try:
-                error_path = os.path.join(self.error_dir, os.path.basename(file_path))
-                shutil.copy2(file_path, error_path)
-            except Exception as move_error:
-                self.logger.error(f"Error moving file to error directory: {str(move_error)}")
-            
+            self._move_to_error(file_path, str(e))
             return False
 
 def watch_folder(torrent_dir, download_dir=None, interval=30):
@@ -133,7 +201,7 @@ def watch_folder(torrent_dir, download_dir=None, interval=30):
     
     # Start watching the folder
     event_handler = TorrentWatcher(config, integration, download_dir)
-    observer = Observer()
+    observer = create_observer(config.watcher.backend, config.watcher.poll_interval)
     observer.schedule(event_handler, torrent_dir, recursive=False)
     observer.start()
     
@@ -147,22 +215,42 @@ def watch_folder(torrent_dir, download_dir=None, interval=30):
         
         if existing_files:
             logger.info(f"Found {len(existing_files)} existing torrent files to process")
+            # Queue them for the worker pool; submit() waits while the queue is full
             for file_name in existing_files:
-                file_path = os.path.join(torrent_dir, file_name)
-                try:
-                    event_handler._process_torrent_file(file_path)
-                except Exception as e:
-                    logger.exception(f"Error processing existing file {file_name}: {str(e)}")
+                event_handler.queue.submit(os.path.join(torrent_dir, file_name))
+        
+        # Titles whose files are currently queued on the transfer scheduler
+        in_flight = set()
+        
+        def on_title_done(future, title, flag_file):
+            in_flight.discard(title)
+            try:
+                result = future.result()
+                if result.get("success"):
+                    # Create flag file to mark as downloaded
+                    with open(flag_file, 'w') as f:
+                        f.write("downloaded")
+                    
+                    logger.info(f"Downloaded files for {title}: {result.get('message')}")
+                else:
+                    logger.error(f"Error downloading files for {title}: {result.get('message')}")
+                for item in result.get("results", []):
+                    if not item.get("success"):
+                        logger.error(f"  {item.get('name')}: {item.get('message')}")
+            except Exception as e:
+                logger.exception(f"Exception downloading files for {title}: {str(e)}")
         
         # Monitor downloads and check for new files
         while True:
             # Check for completed downloads
             try:
                 downloads = integration.poll_downloads()
-                completed = [d for d in downloads if d.get("status", {}).get("status") == "completed"]
+                completed = [d for d in downloads if d.get("status") == "completed"]
                 
                 for download in completed:
                     title = download.get("title", "Unknown")
+                    if title in in_flight:
+                        continue
                     
                     # Check if we have already downloaded this
                     flag_file = os.path.join(event_handler.download_dir, f".{title}.downloaded")
@@ -171,20 +259,12 @@ def watch_folder(torrent_dir, download_dir=None, interval=30):
                     
                     logger.info(f"Download completed: {title}")
                     
-                    # Download files
-                    try:
-                        result = integration.download_completed_files(title, event_handler.download_dir)
-                        
-                        if result.get("success"):
-                            # Create flag file to mark as downloaded
-                            with open(flag_file, 'w') as f:
-                                f.write("downloaded")
-                            
-                            logger.info(f"Downloaded files for {title}: {result.get('message')}")
-                        else:
-                            logger.error(f"Error downloading files for {title}: {result.get('message')}")
-                    except Exception as e:
-                        logger.exception(f"Exception downloading files for {title}: {str(e)}")
+                    # Queue the files; titles transfer concurrently within the scheduler's limits
+                    in_flight.add(title)
+                    future = integration.schedule_completed_files(title, event_handler.download_dir)
+                    future.add_done_callback(
+                        lambda f, title=title, flag_file=flag_file: on_title_done(f, title, flag_file)
+                    )
             except Exception as e:
                 logger.exception(f"Error checking downloads: {str(e)}")
             
@@ -198,4 +278,5 @@ def watch_folder(torrent_dir, download_dir=None, interval=30):
     finally:
         observer.stop()
         observer.join()
+        event_handler.queue.stop()
         logger.info("Folder watcher stopped") 
\ No newline at end of file
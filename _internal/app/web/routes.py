@@ -2,62 +2,31 @@ from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
-import json
 import os
 
-# Import the auth module from parent package
-from ..auth.oauth_handler import OAuthHandler
-from ..config import Config
+# Import the service container from parent package
+from ..service.container import ServiceContainer, get_services
 
 router = APIRouter(tags=["Web Interface"])
 templates = Jinja2Templates(directory=Path(__file__).parent / "templates")
 
-# Helper function to get watcher settings
-def get_watcher_settings():
-    """Get the watcher settings from the config file"""
-    config_file = Path(__file__).parents[2] / "config" / "watcher_config.json"
-    watcher_settings = {}
-    
-    if config_file.exists():
-        try:
-            with open(config_file, "r") as f:
-                watcher_settings = json.loads(f.read())
-        except Exception as e:
-            print(f"Error reading watcher config: {e}")
-    
-    return watcher_settings
-
-# Helper function to check authentication
-def is_authenticated():
-    """Check if user is authenticated with Seedr"""
-    config = Config.from_env()
-    auth = OAuthHandler(config.seedr)
-    return auth.get_access_token() is not None
-
 @router.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
+async def dashboard(request: Request, services: ServiceContainer = Depends(get_services)):
     """Render the dashboard page"""
     # Check authentication
-    if not is_authenticated():
+    if not services.is_authenticated():
         return RedirectResponse(url="/reauth", status_code=303)
     
-    # Get downloads from the integration for display
-    from ..service.seedr_sonarr_integration import SeedrSonarrIntegration
-    from ..config import Config
-    
-    config = Config.from_env()
-    integration = SeedrSonarrIntegration(config, strict_validation=False)
-    
+    # Get downloads and account info from the background status snapshot
+    snapshot = services.status_snapshot.get()
     try:
-        # Get active downloads
-        torrents = integration.poll_downloads()
+        torrents = snapshot.downloads
         
         # Calculate stats
-        active_count = sum(1 for t in torrents if t.get("status", {}).get("status") == "downloading")
-        completed_count = sum(1 for t in torrents if t.get("status", {}).get("status") == "completed")
+        active_count = sum(1 for t in torrents if t.get("status") == "downloading")
+        completed_count = sum(1 for t in torrents if t.get("status") == "completed")
         
-        # Get seedr account info
-        account_info = integration.seedr.get_account_info()
+        account_info = snapshot.account_info
         space_used = account_info.get("space_used", "0 MB")
         space_available = account_info.get("space_available", "0 MB")
     except Exception as e:
@@ -69,31 +38,23 @@ async def dashboard(request: Request):
         space_available = "0 MB"
     
     # Get watcher settings
-    watcher_settings = get_watcher_settings()
+    watcher_settings = services.watcher_settings
     
     # Get watcher status
-    from ..main import watcher_thread
-    watcher_status = "Running" if watcher_thread is not None and watcher_thread.is_alive() else "Not Running"
+    watcher_status = "Running" if services.watcher.is_running else "Not Running"
     
     # Get last check time (if available)
     last_check = "Never"
     try:
-        log_file = Path(__file__).parents[2] / "folder_watcher.log"
-        if log_file.exists():
-            import re
-            from datetime import datetime
-            
-            with open(log_file, "r") as f:
-                # Look for the last check entry in the logs
-                lines = f.readlines()[-100:]  # Get last 100 lines
-                for line in reversed(lines):
-                    if "Started watching" in line or "TorrentWatcher initialized" in line:
-                        # Extract timestamp 
-                        match = re.search(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
-                        if match:
-                            timestamp = match.group(1)
-                            last_check = timestamp
-                            break
+        import re
+        
+        # Look for the last check entry in the recent logs
+        line = services.find_log_line("Started watching", "TorrentWatcher initialized")
+        if line:
+            # Extract timestamp 
+            match = re.search(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
+            if match:
+                last_check = match.group(1)
     except Exception as e:
         print(f"Error getting last check time: {e}")
     
@@ -109,34 +70,28 @@ async def dashboard(request: Request):
             "watcher_settings": watcher_settings,
             "watcher_status": watcher_status,
             "last_check": last_check,
+            "snapshot_age": snapshot.age,
             "messages": []
         }
     )
 
 @router.get("/torrents", response_class=HTMLResponse)
-async def torrents(request: Request):
+async def torrents(request: Request, services: ServiceContainer = Depends(get_services)):
     """Render the torrents page"""
     # Check authentication
-    if not is_authenticated():
+    if not services.is_authenticated():
         return RedirectResponse(url="/reauth", status_code=303)
     
-    # Get downloads for display
-    from ..service.seedr_sonarr_integration import SeedrSonarrIntegration
-    from ..config import Config
-    
-    config = Config.from_env()
-    integration = SeedrSonarrIntegration(config, strict_validation=False)
-    
-    try:
-        torrents = integration.poll_downloads()
-        messages = []
-        error_403 = False
-        error_413 = False
-    except Exception as e:
-        torrents = []
-        messages = [f"Error fetching downloads: {str(e)}"]
-        error_403 = "403" in str(e)
-        error_413 = "413" in str(e)
+    # Get downloads from the background status snapshot
+    snapshot = services.status_snapshot.get()
+    torrents = snapshot.downloads
+    messages = []
+    error_403 = False
+    error_413 = False
+    if snapshot.error:
+        messages = [f"Error fetching downloads: {snapshot.error}"]
+        error_403 = "403" in snapshot.error
+        error_413 = "413" in snapshot.error
     
     return templates.TemplateResponse(
         "torrents.html", 
@@ -145,19 +100,20 @@ async def torrents(request: Request):
             "torrents": torrents,
             "messages": messages,
             "error_403": error_403,
-            "error_413": error_413
+            "error_413": error_413,
+            "snapshot_age": snapshot.age
         }
     )
 
 @router.get("/config", response_class=HTMLResponse)
-async def config(request: Request, success: bool = False):
+async def config(request: Request, success: bool = False, services: ServiceContainer = Depends(get_services)):
     """Render the config page"""
     # Check authentication
-    if not is_authenticated():
+    if not services.is_authenticated():
         return RedirectResponse(url="/reauth", status_code=303)
     
     # Get watcher settings
-    watcher_settings = get_watcher_settings()
+    watcher_settings = services.watcher_settings
     
     # Pass success message if provided
     messages = []
@@ -174,31 +130,24 @@ async def config(request: Request, success: bool = False):
     )
 
 @router.get("/folder-watcher", response_class=HTMLResponse)
-async def folder_watcher(request: Request):
+async def folder_watcher(request: Request, services: ServiceContainer = Depends(get_services)):
     """Render the folder watcher page"""
     # Check authentication
-    if not is_authenticated():
+    if not services.is_authenticated():
         return RedirectResponse(url="/reauth", status_code=303)
     
     # Get watcher settings
-    watcher_settings = get_watcher_settings()
+    watcher_settings = services.watcher_settings
     
     # Get watcher status
-    from ..main import watcher_thread
-    is_running = watcher_thread is not None and watcher_thread.is_alive()
+    is_running = services.watcher.is_running
     
     # Get recent logs
-    log_file = Path(__file__).parents[2] / "folder_watcher.log"
     activity_log = ""
-    
-    if log_file.exists():
-        try:
-            with open(log_file, "r") as f:
-                # Get the last 50 lines
-                lines = f.readlines()[-50:]
-                activity_log = "".join(lines)
-        except Exception as e:
-            print(f"Error reading log file: {e}")
+    try:
+        activity_log = "".join(services.tail_log(50))
+    except Exception as e:
+        print(f"Error reading log file: {e}")
     
     return templates.TemplateResponse(
         "folder_watcher.html", 
@@ -55,16 +55,21 @@ document.addEventListener("DOMContentLoaded", function () {
 
   // Dashboard/Torrents page initialization
   if (autoRefreshCheckbox) {
-    let refreshInterval;
+    // Live updates arrive over the event stream; unchecking closes it
+    autoRefreshCheckbox.checked = true;
     autoRefreshCheckbox.addEventListener("change", function () {
       if (this.checked) {
-        refreshInterval = setInterval(fetchTorrentData, 10000); // Refresh every 10 seconds
+        subscribeToEvents();
       } else {
-        clearInterval(refreshInterval);
+        unsubscribeFromEvents();
       }
     });
   }
 
+  if (downloadsBody || torrentsTableBody) {
+    subscribeToEvents();
+  }
+
   if (refreshButton) {
     refreshButton.addEventListener("click", fetchTorrentData);
   }
@@ -135,17 +140,15 @@ document.addEventListener("DOMContentLoaded", function () {
           verificationUrl.href = data.verification_uri;
           verificationCode.textContent = data.user_code;
 
-          // Check auth status every 5 seconds
-          const interval = setInterval(() => {
-            fetch("/api/auth/status")
-              .then((response) => response.json())
-              .then((statusData) => {
-                if (statusData.authenticated) {
-                  clearInterval(interval);
-                  checkAuthStatus();
-                }
-              });
-          }, 5000);
+          // Wait for the server to push the completed login
+          const authEvents = openEventStream({
+            auth: (statusData) => {
+              if (statusData.authenticated) {
+                authEvents.close();
+                checkAuthStatus();
+              }
+            },
+          });
         } else {
           alert("Error initiating login");
         }
@@ -247,11 +250,10 @@ document.addEventListener("DOMContentLoaded", function () {
       return;
     }
 
-    // Start polling
-    let pollInterval = setInterval(pollAuthStatus, 5000);
-
-    // Also poll immediately
-    setTimeout(pollAuthStatus, 500);
+    // Completion is pushed as an "auth" event; the timer only drives the
+    // progress bar and the timeout, it makes no requests
+    const progressTimer = setInterval(tickProgress, 5000);
+    const authEvents = openEventStream({ auth: handleAuthEvent });
 
     function updateProgress(count) {
       const progress = Math.min(Math.floor((count / maxPolls) * 100), 99);
@@ -260,42 +262,37 @@ document.addEventListener("DOMContentLoaded", function () {
       progressBar.setAttribute("data-progress", progress);
     }
 
-    function pollAuthStatus() {
+    function tickProgress() {
       pollCount++;
       updateProgress(pollCount);
 
-      fetch("/api/auth/poll")
-        .then((response) => response.json())
-        .then((data) => {
-          if (data.success) {
-            // Authentication successful
-            clearInterval(pollInterval);
-            statusElement.textContent =
-              "Authentication successful! Redirecting...";
-            progressBar.style.width = "100%";
-            progressBar.textContent = "100%";
-            progressBar.setAttribute("data-progress", 100);
-
-            // Redirect to config or dashboard
-            setTimeout(() => {
-              window.location.href = data.redirect || "/config";
-            }, 1500);
-          } else if (pollCount < maxPolls) {
-            // Continue polling
-          } else {
-            // Timeout
-            clearInterval(pollInterval);
-            statusElement.textContent =
-              "Authentication timed out. Please try again.";
-            const authContainer = document.querySelector(".auth-container");
-            authContainer.innerHTML +=
-              '<div class="auth-actions"><a href="/reauth" class="button">Try Again</a></div>';
-          }
-        })
-        .catch((error) => {
-          console.error("Error polling auth status:", error);
-          statusElement.textContent = "Error checking authentication status.";
-        });
+      if (pollCount >= maxPolls) {
+        // Timeout
+        clearInterval(progressTimer);
+        authEvents.close();
+        statusElement.textContent =
+          "Authentication timed out. Please try again.";
+        const authContainer = document.querySelector(".auth-container");
+        authContainer.innerHTML +=
+          '<div class="auth-actions"><a href="/reauth" class="button">Try Again</a></div>';
+      }
+    }
+
+    function handleAuthEvent(data) {
+      if (!data.authenticated) return;
+
+      // Authentication successful
+      clearInterval(progressTimer);
+      authEvents.close();
+      statusElement.textContent = "Authentication successful! Redirecting...";
+      progressBar.style.width = "100%";
+      progressBar.textContent = "100%";
+      progressBar.setAttribute("data-progress", 100);
+
+      // Redirect to config or dashboard
+      setTimeout(() => {
+        window.location.href = "/config";
+      }, 1500);
     }
   }
 
@@ -345,42 +342,35 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   // Functions for reauth.html
+  let autoCheckEvents = null;
+
   function startAutoCheck() {
     const checkbox = document.getElementById("auto-check");
     if (!checkbox) return;
 
     if (checkbox.checked) {
-      // Check every 5 seconds
-      checkTimer = setInterval(checkAuthStatusReauth, 5000);
+      // Wait for the server to push an auth change
+      autoCheckEvents = openEventStream({
+        auth: (data) => {
+          if (data.authenticated) {
+            console.log("Authentication found, redirecting...");
+            window.location.href = "/";
+          }
+        },
+      });
       console.log("Auto-check enabled");
     } else {
-      if (checkTimer) {
-        clearInterval(checkTimer);
-        checkTimer = null;
+      if (autoCheckEvents) {
+        autoCheckEvents.close();
+        autoCheckEvents = null;
         console.log("Auto-check disabled");
       }
     }
   }
 
-  function checkAuthStatusReauth() {
-    fetch("/api/auth/status")
-      .then((response) => response.json())
-      .then((data) => {
-        if (data.authenticated) {
-          console.log("Authentication found, redirecting...");
-          window.location.href = data.redirect;
-        } else {
-          console.log("Not authenticated yet");
-        }
-      })
-      .catch((error) => {
-        console.error("Error checking auth status:", error);
-      });
-  }
-
   // =============== DOWNLOADS FUNCTIONS ===============
   function loadSeries() {
-    fetch("/api/sonarr/series")
+    fetch("/api/sonarr/series?fields=id,title")
       .then((response) => response.json())
       .then((data) => {
         // Clear options
@@ -403,78 +393,8 @@ document.addEventListener("DOMContentLoaded", function () {
     fetch("/api/downloads")
       .then((response) => response.json())
       .then((data) => {
-        // Clear table
-        downloadsBody.innerHTML = "";
-
-        if (data.length === 0) {
-          const row = document.createElement("tr");
-          row.innerHTML = '<td colspan="4">No downloads found</td>';
-          downloadsBody.appendChild(row);
-          return;
-        }
-
-        // Add rows
-        data.forEach((download) => {
-          const row = document.createElement("tr");
-
-          // Title
-          const titleCell = document.createElement("td");
-          titleCell.textContent = download.title;
-          titleCell.classList.add("title-col");
-          row.appendChild(titleCell);
-
-          // Status
-          const statusCell = document.createElement("td");
-          statusCell.textContent = download.status;
-          row.appendChild(statusCell);
-
-          // Progress
-          const progressCell = document.createElement("td");
-          const progress = download.progress || 0;
-          progressCell.innerHTML = `
-                <div class="progress">
-                    <div class="progress-bar" role="progressbar" style="width: ${progress}%;" aria-valuenow="${progress}" aria-valuemin="0" aria-valuemax="100">${progress}%</div>
-                </div>
-            `;
-          row.appendChild(progressCell);
-
-          // Actions
-          const actionsCell = document.createElement("td");
-          actionsCell.innerHTML = `
-                <div class="btn-group-sm">
-                    <button class="btn btn-sm btn-info action-btn" data-action="files" data-title="${
-                      download.title
-                    }">Files</button>
-                    <button class="btn btn-sm btn-success action-btn" data-action="download" data-title="${
-                      download.title
-                    }">Download</button>
-                    <button class="btn btn-sm btn-warning action-btn" data-action="notify" data-title="${
-                      download.title
-                    }">Notify Sonarr</button>
-                    ${
-                      download.status === "downloading"
-                        ? `<button class="btn btn-sm btn-secondary action-btn" data-action="pause" data-title="${download.title}">Pause</button>`
-                        : ""
-                    }
-                    ${
-                      download.status === "paused"
-                        ? `<button class="btn btn-sm btn-primary action-btn" data-action="resume" data-title="${download.title}">Resume</button>`
-                        : ""
-                    }
-                    <button class="btn btn-sm btn-danger action-btn" data-action="delete" data-title="${
-                      download.title
-                    }">Delete</button>
-                </div>
-            `;
-          row.appendChild(actionsCell);
-
-          downloadsBody.appendChild(row);
-        });
-
-        // Add event listeners to buttons
-        document.querySelectorAll(".action-btn").forEach((button) => {
-          button.addEventListener("click", handleAction);
-        });
+        setDownloadState(data);
+        renderDownloads(data);
       })
       .catch((error) => {
         console.error("Error getting downloads:", error);
@@ -483,6 +403,81 @@ document.addEventListener("DOMContentLoaded", function () {
       });
   }
 
+  function renderDownloads(data) {
+    // Clear table
+    downloadsBody.innerHTML = "";
+
+    if (data.length === 0) {
+      const row = document.createElement("tr");
+      row.innerHTML = '<td colspan="4">No downloads found</td>';
+      downloadsBody.appendChild(row);
+      return;
+    }
+
+    // Add rows
+    data.forEach((download) => {
+      const row = document.createElement("tr");
+
+      // Title
+      const titleCell = document.createElement("td");
+      titleCell.textContent = download.title;
+      titleCell.classList.add("title-col");
+      row.appendChild(titleCell);
+
+      // Status
+      const statusCell = document.createElement("td");
+      statusCell.textContent = download.status;
+      row.appendChild(statusCell);
+
+      // Progress
+      const progressCell = document.createElement("td");
+      const progress = download.progress || 0;
+      progressCell.innerHTML = `
+            <div class="progress">
+                <div class="progress-bar" role="progressbar" style="width: ${progress}%;" aria-valuenow="${progress}" aria-valuemin="0" aria-valuemax="100">${progress}%</div>
+            </div>
+        `;
+      row.appendChild(progressCell);
+
+      // Actions
+      const actionsCell = document.createElement("td");
+      actionsCell.innerHTML = `
+            <div class="btn-group-sm">
+                <button class="btn btn-sm btn-info action-btn" data-action="files" data-title="${
+                  download.title
+                }">Files</button>
+                <button class="btn btn-sm btn-success action-btn" data-action="download" data-title="${
+                  download.title
+                }">Download</button>
+                <button class="btn btn-sm btn-warning action-btn" data-action="notify" data-title="${
+                  download.title
+                }">Notify Sonarr</button>
+                ${
+                  download.status === "downloading"
+                    ? `<button class="btn btn-sm btn-secondary action-btn" data-action="pause" data-title="${download.title}">Pause</button>`
+                    : ""
+                }
+                ${
+                  download.status === "paused"
+                    ? `<button class="btn btn-sm btn-primary action-btn" data-action="resume" data-title="${download.title}">Resume</button>`
+                    : ""
+                }
+                <button class="btn btn-sm btn-danger action-btn" data-action="delete" data-title="${
+                  download.title
+                }">Delete</button>
+            </div>
+        `;
+      row.appendChild(actionsCell);
+
+      downloadsBody.appendChild(row);
+    });
+
+    // Add event listeners to buttons
+    document.querySelectorAll(".action-btn").forEach((button) => {
+      button.addEventListener("click", handleAction);
+    });
+  }
+
   function handleAction(e) {
     const action = e.target.dataset.action;
     const title = e.target.dataset.title;
@@ -551,6 +546,7 @@ document.addEventListener("DOMContentLoaded", function () {
     fetch("/api/downloads")
       .then((response) => response.json())
       .then((data) => {
+        setDownloadState(data);
         updateTorrentTable(data);
         updateProgressBars(); // Initialize progress bars after updating the table
       })
@@ -673,7 +669,7 @@ document.addEventListener("DOMContentLoaded", function () {
         return response.json();
       })
       .then((data) => {
-        alert("Sonarr notified successfully");
+        alert(data.message || "Sonarr will be notified when the files have downloaded");
         // Refresh the table
         if (document.getElementById("refresh-btn")) {
           document.getElementById("refresh-btn").click();
@@ -768,15 +764,7 @@ document.addEventListener("DOMContentLoaded", function () {
   function checkWatcherStatus() {
     fetch("/api/watcher/status")
       .then((response) => response.json())
-      .then((data) => {
-        if (data.running) {
-          watcherStatus.textContent = "Watcher is running";
-          watcherStatus.classList.add("text-success");
-        } else {
-          watcherStatus.textContent = "Watcher is not running";
-          watcherStatus.classList.add("text-danger");
-        }
-      })
+      .then(updateWatcherStatus)
       .catch((error) => {
         console.error("Error checking watcher status:", error);
         watcherStatus.textContent = "Error checking watcher status";
@@ -904,13 +892,13 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   function refreshLog() {
-    fetch("/api/watcher/log")
+    fetch("/api/watcher/logs?lines=50")
       .then((response) => response.json())
       .then((data) => {
         const logElement = document.getElementById("activity-log");
         if (logElement) {
-          if (data.log && data.log.length > 0) {
-            logElement.textContent = data.log.join("\n");
+          if (data.success && data.logs && data.logs.length > 0) {
+            logElement.textContent = data.logs.join("");
           } else {
             logElement.textContent = "No recent activity";
           }
@@ -932,11 +920,6 @@ document.addEventListener("DOMContentLoaded", function () {
   window.showTab = showTab;
   window.refreshLog = refreshLog;
 
-  // Refresh downloads every 30 seconds
-  if (downloadsBody || torrentsTableBody) {
-    setInterval(downloadsBody ? getDownloads : fetchTorrentData, 30000);
-  }
-
   // Initialize the dashboard's available torrents and logs sections
   if (document.getElementById("available-torrents-container")) {
     fetchAvailableTorrents();
@@ -949,6 +932,115 @@ document.addEventListener("DOMContentLoaded", function () {
     fetchWatcherLogs();
   }
 
+  // =============== EVENT STREAM FUNCTIONS ===============
+
+  // Downloads keyed by title, kept current by /api/events
+  const downloadState = new Map();
+  let eventSource = null;
+
+  // Open the server event stream and route named events to handlers
+  function openEventStream(handlers) {
+    const source = new EventSource("/api/events");
+    Object.entries(handlers).forEach(([event, handler]) => {
+      source.addEventListener(event, (e) => handler(JSON.parse(e.data)));
+    });
+    source.onerror = () => {
+      // EventSource reconnects by itself; the server resends full state
+      console.warn("Event stream interrupted, reconnecting...");
+    };
+    return source;
+  }
+
+  function subscribeToEvents() {
+    if (eventSource) return;
+    eventSource = openEventStream({
+      downloads: (data) => {
+        setDownloadState(data.downloads);
+        renderDownloadState();
+      },
+      download: (download) => {
+        downloadState.set(download.title, download);
+        renderDownloadState();
+      },
+      download_removed: (data) => {
+        downloadState.delete(data.title);
+        renderDownloadState();
+      },
+      account: updateAccountInfo,
+      watcher_status: updateWatcherStatus,
+      watcher: handleWatcherEvent,
+    });
+  }
+
+  function unsubscribeFromEvents() {
+    if (eventSource) {
+      eventSource.close();
+      eventSource = null;
+    }
+  }
+
+  function setDownloadState(downloads) {
+    downloadState.clear();
+    downloads.forEach((download) => downloadState.set(download.title, download));
+  }
+
+  function renderDownloadState() {
+    const downloads = Array.from(downloadState.values());
+    if (downloadsBody) renderDownloads(downloads);
+    if (torrentsTableBody) {
+      updateTorrentTable(downloads);
+      updateProgressBars();
+    }
+
+    const activeCount = document.getElementById("active-count");
+    const completedCount = document.getElementById("completed-count");
+    if (activeCount) {
+      activeCount.textContent = downloads.filter(
+        (d) => d.status === "downloading"
+      ).length;
+    }
+    if (completedCount) {
+      completedCount.textContent = downloads.filter(
+        (d) => d.status === "completed"
+      ).length;
+    }
+  }
+
+  function updateAccountInfo(account) {
+    const spaceUsed = document.getElementById("space-used");
+    const spaceAvailable = document.getElementById("space-available");
+    if (spaceUsed && account.space_used) spaceUsed.textContent = account.space_used;
+    if (spaceAvailable && account.space_available)
+      spaceAvailable.textContent = account.space_available;
+  }
+
+  function updateWatcherStatus(data) {
+    // Dashboard stat card
+    const watcherState = document.getElementById("watcher-state");
+    if (watcherState) {
+      watcherState.textContent = data.running ? "Running" : "Not Running";
+      watcherState.classList.toggle("status-completed", data.running);
+      watcherState.classList.toggle("status-error", !data.running);
+    }
+
+    // Index page status line
+    if (watcherStatus) {
+      watcherStatus.textContent = data.running
+        ? "Watcher is running"
+        : "Watcher is not running";
+      watcherStatus.classList.toggle("text-success", data.running);
+      watcherStatus.classList.toggle("text-danger", !data.running);
+    }
+  }
+
+  function handleWatcherEvent() {
+    // A torrent file was picked up or processed; refresh the watcher panels
+    if (document.getElementById("available-torrents-container")) {
+      fetchAvailableTorrents();
+      fetchWatcherLogs();
+    }
+  }
+
   // =============== COMMON FUNCTIONS ===============
 
   // Set width of progress bars based on data-progress attribute